@@ -0,0 +1,132 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from prompt_compaction import normalize_text
+from resume_report import PART_FAILED, REPORT_PARTS, generate_report_parts, part_prompts, prompt_fingerprint
+
+# Previous analyses kept for incremental re-analysis. In memory only: like
+# the LLM cache, resume-derived text is not written to disk.
+ANALYSIS_STORE_ENTRIES = int(os.getenv("ANALYSIS_STORE_ENTRIES", "1024"))
+ANALYSIS_STORE_TTL = float(os.getenv("ANALYSIS_STORE_TTL", str(7 * 24 * 3600)))
+
+
+def section_fingerprints(sections: Dict[str, str]) -> Dict[str, str]:
+    """Hash of each section's normalized text, so re-flowed whitespace is not a change"""
+    return {
+        name: hashlib.sha256(normalize_text(body).encode("utf-8")).hexdigest()
+        for name, body in sections.items()
+    }
+
+
+class AnalysisStore:
+    """
+    Section-level results of the last analysis of each document, keyed by
+    (user_id, lineage_id). Each part is stored with the fingerprint of the
+    prompt it was written from, so it can be served again as long as a
+    re-upload produces the same prompt for it.
+    """
+
+    def __init__(self, max_entries: int = ANALYSIS_STORE_ENTRIES, ttl: float = ANALYSIS_STORE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], dict]" = OrderedDict()
+        # Most recent lineage per user, used when an edited file comes back under a new name
+        self._latest: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"analyses": 0, "incremental": 0, "parts_reused": 0, "parts_generated": 0, "evictions": 0}
+
+    def get(self, user_id: str, lineage_id: str) -> Optional[dict]:
+        """Previous analysis of this lineage, else the user's latest one"""
+        with self._lock:
+            now = time.time()
+            for key in ((user_id, lineage_id), self._latest.get(user_id)):
+                entry = self._entries.get(key) if key else None
+                if entry and now - entry["updated_at"] < self.ttl:
+                    self._entries.move_to_end(key)
+                    return entry
+            return None
+
+    def put(self, user_id: str, lineage_id: str, sha256: str, sections: Dict[str, str], parts: Dict[str, Tuple[str, str]]) -> None:
+        with self._lock:
+            key = (user_id, lineage_id)
+            self._entries[key] = {
+                "sha256": sha256,
+                "sections": section_fingerprints(sections),
+                "parts": parts,
+                "updated_at": time.time(),
+            }
+            self._entries.move_to_end(key)
+            self._latest[user_id] = key
+            while len(self._entries) > self.max_entries:
+                (old_user, old_lineage), _ = self._entries.popitem(last=False)
+                if self._latest.get(old_user) == (old_user, old_lineage):
+                    del self._latest[old_user]
+                self.stats["evictions"] += 1
+
+    def record(self, reused: int, generated: int) -> None:
+        with self._lock:
+            self.stats["analyses"] += 1
+            self.stats["incremental"] += 1 if reused else 0
+            self.stats["parts_reused"] += reused
+            self.stats["parts_generated"] += generated
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            total = self.stats["parts_reused"] + self.stats["parts_generated"]
+            return {
+                **self.stats,
+                "reuse_ratio": round(self.stats["parts_reused"] / total, 4) if total else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+analysis_store = AnalysisStore()
+
+
+def incremental_report_parts(
+    complete: Callable[[str], str],
+    user_id: str,
+    lineage_id: str,
+    resume: dict,
+    job_role: str,
+    store: AnalysisStore = analysis_store,
+) -> Tuple[Dict[str, str], dict]:
+    """
+    Report parts for a (re-)uploaded resume, `resume` being the output of
+    get_resume_sections. Parts whose prompt is unchanged since the user's
+    previous analysis are taken from the store; only the rest are generated.
+    Returns the parts and a summary of what changed.
+    """
+    sections, resume_text = resume["sections"], resume["text"]
+    prompts = part_prompts(sections, resume_text, job_role)
+    fingerprints = {key: prompt_fingerprint(prompt) for key, prompt in prompts.items()}
+
+    previous = store.get(user_id, lineage_id)
+    stored = previous["parts"] if previous else {}
+    results = {
+        key: stored[key][1] for key, fingerprint in fingerprints.items()
+        if key in stored and stored[key][0] == fingerprint
+    }
+    stale = [part for part in REPORT_PARTS if part.key not in results]
+    if stale:
+        results.update(generate_report_parts(complete, sections, resume_text, job_role, parts=stale, prompts=prompts))
+
+    # Failed parts are not kept, so the next upload retries them
+    store.put(user_id, lineage_id, resume["sha256"], sections, {
+        key: (fingerprints[key], text) for key, text in results.items() if text != PART_FAILED
+    })
+    store.record(len(REPORT_PARTS) - len(stale), len(stale))
+
+    old_sections = previous["sections"] if previous else {}
+    new_sections = section_fingerprints(sections)
+    return results, {
+        "previous_analysis": previous is not None,
+        "changed_sections": sorted(name for name in set(old_sections) | set(new_sections) if old_sections.get(name) != new_sections.get(name)),
+        "parts_reused": [part.key for part in REPORT_PARTS if part not in stale],
+        "parts_generated": [part.key for part in stale],
+    }
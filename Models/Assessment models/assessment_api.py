@@ -1,89 +1,87 @@
 # Requires: fastapi, uvicorn, python-multipart
 # Install with: pip install fastapi uvicorn python-multipart
-from fastapi import FastAPI, File, UploadFile, Form
+from fastapi import FastAPI, File, UploadFile, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse as _JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
+from contextlib import asynccontextmanager
+from typing import List, Optional
 import uvicorn
+import json
 import os
-import tempfile
-import logging
-
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-# Import with error handling
-IMPORTS_SUCCESSFUL = True
-IMPORT_ERRORS = []
-
-try:
-    from technical_assessment import generate_technical_mcqs
-    logger.info("Successfully imported technical_assessment")
-except ImportError as e:
-    logger.error(f"Failed to import technical_assessment: {e}")
-    IMPORTS_SUCCESSFUL = False
-    IMPORT_ERRORS.append(f"technical_assessment: {e}")
-
-try:
-    from resume_optimizer import analyze_resume
-    logger.info("Successfully imported resume_optimizer")
-except ImportError as e:
-    logger.error(f"Failed to import resume_optimizer: {e}")
-    IMPORTS_SUCCESSFUL = False
-    IMPORT_ERRORS.append(f"resume_optimizer: {e}")
-
-try:
-    from ats_score import calculate_ats_score, process_resume_file, extract_resume_text
-    logger.info("Successfully imported ats_score")
-except ImportError as e:
-    logger.error(f"Failed to import ats_score: {e}")
-    IMPORTS_SUCCESSFUL = False
-    IMPORT_ERRORS.append(f"ats_score: {e}")
-
-try:
-    from communication_test import generate_communication_test
-    logger.info("Successfully imported communication_test")
-except ImportError as e:
-    logger.error(f"Failed to import communication_test: {e}")
-    IMPORTS_SUCCESSFUL = False
-    IMPORT_ERRORS.append(f"communication_test: {e}")
-
-try:
-    from domain_questions import generate_domain_questions
-    logger.info("Successfully imported domain_questions")
-except ImportError as e:
-    logger.error(f"Failed to import domain_questions: {e}")
-    IMPORTS_SUCCESSFUL = False
-    IMPORT_ERRORS.append(f"domain_questions: {e}")
-
-try:
-    from general_aptitude import generate_aptitude_mcqs
-    logger.info("Successfully imported general_aptitude")
-except ImportError as e:
-    logger.error(f"Failed to import general_aptitude: {e}")
-    IMPORTS_SUCCESSFUL = False
-    IMPORT_ERRORS.append(f"general_aptitude: {e}")
-
-try:
-    from linkedin_post_generator import generate_linkedin_post, get_linkedin_auth_url, exchange_code_for_token, generate_and_post_to_linkedin
-    logger.info("Successfully imported linkedin_post_generator")
-except ImportError as e:
-    logger.error(f"Failed to import linkedin_post_generator: {e}")
-    IMPORTS_SUCCESSFUL = False
-    IMPORT_ERRORS.append(f"linkedin_post_generator: {e}")
-
-try:
-    from personality_assessment import generate_personality_assessment
-    logger.info("Successfully imported personality_assessment")
-except ImportError as e:
-    logger.error(f"Failed to import personality_assessment: {e}")
-    IMPORTS_SUCCESSFUL = False
-    IMPORT_ERRORS.append(f"personality_assessment: {e}")
+import sys
+import time
+
+from settings import load_settings
+
+# Load .env once, before any module reads its settings
+load_settings()
+
+import metrics
+import structured_logging
+import tracing
+from metrics import current_route, hit_ratio_families, stage
+from worker_pool import run_blocking, shutdown_executor
+from extraction_sandbox import ExtractionError, get_sandbox, shutdown_sandbox
+from generator_registry import GeneratorRegistry, GeneratorUnavailable
+from question_stream import encode_ndjson, encode_sse
+from question_pool import QuestionPool
+from structured_logging import bind, configure_logging, get_logger, shutdown_logging
+from warm_up import WarmUp, service_steps
+
+# JSON log lines, written by a background thread so requests never block on stdout
+configure_logging()
+log = get_logger(__name__)
+
+# Generator modules (LangChain, the document parsers, the model client) are
+# imported on first use or by the warm-up thread, not before /health can answer
+generators = GeneratorRegistry()
+
+# Largest question count one request may ask for; larger requests are capped
+MAX_QUESTIONS = int(os.getenv("MAX_QUESTIONS", "50"))
+
+# Pre-generated question sets for the most requested role/difficulty combinations
+question_pool = QuestionPool({
+    "technical": generators.lazy("technical_assessment", "generate_technical_mcqs"),
+    "aptitude": generators.lazy("general_aptitude", "generate_aptitude_mcqs"),
+})
+
+# Background warm-up (modules, model client and connection, extraction workers,
+# caches); /health/ready fails until it has finished
+startup = WarmUp(service_steps(generators))
+
+class JSONResponse(_JSONResponse):
+    """JSONResponse that records its rendering time as the "serialize" stage"""
+
+    def render(self, content) -> bytes:
+        with stage("serialize"):
+            return super().render(content)
+
+def question_count(num_questions: int) -> int:
+    """num_questions clamped to 1..MAX_QUESTIONS, so one request cannot fan out into dozens of model calls"""
+    return max(1, min(num_questions, MAX_QUESTIONS))
+
+async def generator(module: str, attr: str):
+    """A generator function, importing its module on a worker thread the first time"""
+    return await run_blocking(generators.get, module, attr)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup.start()
+    yield
+    question_pool.stop()
+    # Let in-flight generations finish before the worker pool goes away
+    shutdown_executor(wait=True)
+    shutdown_sandbox()
+    tracing.tracer.exporter.shutdown()
+    shutdown_logging()
 
 app = FastAPI(
     title="Talento AI API",
     description="AI-powered career assessment and LinkedIn posting API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Allow CORS for frontend development and production
@@ -101,6 +99,129 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+http_requests = metrics.registry.counter(
+    "talento_http_requests_total", "HTTP requests by route and response status", ("method", "route", "status")
+)
+http_seconds = metrics.registry.histogram(
+    "talento_http_request_duration_seconds", "Time to serve a request, including a streamed body, per route", ("method", "route")
+)
+http_in_flight = metrics.registry.gauge("talento_http_requests_in_flight", "HTTP requests being served")
+
+def route_template(scope) -> str:
+    """The matched route's path template, so /api/jobs/index/{job_id} is one series"""
+    for route in app.router.routes:
+        if route.matches(scope)[0] == Match.FULL:
+            return route.path
+    return "unmatched"
+
+class RequestInstrumentation:
+    """
+    Per-route metrics, a log context and a trace (continuing the caller's
+    traceparent) whose id is the request id. All of them end once the
+    response body has been sent, so streamed responses are timed and traced
+    to their last event.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method, route = scope["method"], route_template(scope)
+        token = current_route.set(route)
+        started = time.perf_counter()
+        status = 500
+        try:
+            with http_in_flight.track(), bind(route=route, method=method), tracing.trace(
+                f"{method} {route}",
+                traceparent=Headers(scope=scope).get("traceparent"),
+                **{"http.method": method, "http.route": route},
+            ) as root:
+
+                async def send_traced(message):
+                    nonlocal status
+                    if message["type"] == "http.response.start":
+                        status = message["status"]
+                        if root is not None:
+                            root.set_attribute("http.status_code", status)
+                            if status >= 500:
+                                root.status = "ERROR"
+                            headers = MutableHeaders(scope=message)
+                            headers["X-Request-ID"] = root.trace_id
+                            headers["traceparent"] = root.traceparent()
+                    await send(message)
+
+                await self.app(scope, receive, send_traced)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_seconds.observe(elapsed, method=method, route=route)
+            http_requests.inc(method=method, route=route, status=status)
+            current_route.reset(token)
+            # Successful requests are sampled; errors are always logged
+            log.info(
+                "Request finished", route=route, method=method, status=status,
+                duration_ms=round(elapsed * 1000, 1), sample=status < 400,
+            )
+
+app.add_middleware(RequestInstrumentation)
+
+def service_metrics():
+    """Cache hit ratios, warm-up, generator imports and extraction workers; modules not loaded yet are skipped"""
+    def cache(module: str, get_stats, hits: str = "hits", misses: str = "misses"):
+        owner = sys.modules.get(module)
+        if owner is None:
+            return None
+        stats = get_stats(owner)
+        return stats[hits], stats[misses]
+
+    pool = question_pool.get_stats()
+    yield from hit_ratio_families({
+        "llm": cache("llm_provider", lambda m: m.get_response_cache().get_stats()),
+        "resume_extraction": cache("resume_extraction", lambda m: m.extraction_cache.get_stats()),
+        "resume_sections": cache("resume_sections", lambda m: m.section_cache.get_stats()),
+        "resume_analysis": cache("analysis_store", lambda m: m.analysis_store.get_stats(), "parts_reused", "parts_generated"),
+        "question_pool": (pool["hits"], pool["misses"]),
+    })
+
+    warm_up = startup.get_stats()
+    yield ("talento_ready", "gauge", "1 once the warm-up has finished (readiness probe passes)", [({}, int(warm_up["ready"]))])
+    if warm_up["seconds"] is not None:
+        yield ("talento_warm_up_duration_seconds", "gauge", "Duration of the startup warm-up", [({}, warm_up["seconds"])])
+        yield (
+            "talento_warm_up_step_duration_seconds", "gauge", "Duration of each warm-up step",
+            [({"step": name, "state": step["state"]}, step["seconds"]) for name, step in warm_up["steps"].items()],
+        )
+    imports = generators.get_stats()
+    yield (
+        "talento_generator_import_seconds", "gauge", "Import time of each loaded generator module",
+        [({"module": name}, seconds) for name, seconds in imports["loaded"].items()],
+    )
+    yield ("talento_generator_import_errors", "gauge", "Generator modules that failed to import", [({}, len(imports["errors"]))])
+
+    sandbox = get_sandbox().get_stats()
+    yield (
+        "talento_extraction_jobs_total", "counter", "Sandboxed extraction jobs by outcome",
+        [({"outcome": key}, sandbox[key]) for key in ("jobs", "failures", "timeouts", "crashes")],
+    )
+    logging_stats = structured_logging.get_stats()
+    yield (
+        "talento_log_records_skipped_total", "counter", "Log records not written: dropped on a full queue or sampled out",
+        [({"reason": reason}, logging_stats[reason]) for reason in ("dropped", "sampled_out")],
+    )
+    yield ("talento_extraction_idle_workers", "gauge", "Extraction worker processes waiting for a job", [({}, sandbox["idle_workers"])])
+
+metrics.registry.add_collector(service_metrics)
+
+@app.exception_handler(GeneratorUnavailable)
+async def generator_unavailable(request: Request, error: GeneratorUnavailable):
+    """503 for routes whose generator module failed to import"""
+    return JSONResponse(status_code=503, content={
+        "error": "Service temporarily unavailable due to import errors",
+        "import_errors": generators.import_errors,
+    })
+
 @app.get("/")
 async def root():
     """Root endpoint for healthcheck"""
@@ -108,10 +229,11 @@ async def root():
         "message": "Talento AI API is running!",
         "status": "healthy",
         "version": "1.0.0",
-        "imports_successful": IMPORTS_SUCCESSFUL,
-        "import_errors": IMPORT_ERRORS if not IMPORTS_SUCCESSFUL else [],
+        "imports_successful": not generators.import_errors,
+        "import_errors": generators.import_errors,
         "endpoints": {
             "health": "/health",
+            "ready": "/health/ready",
             "docs": "/docs",
             "assessments": "/api/assessment/*",
             "linkedin": "/api/linkedin/*"
@@ -119,181 +241,350 @@ async def root():
     }
 
 @app.get("/health")
+@app.get("/health/live")
 async def health_check():
-    """Health check endpoint"""
+    """Liveness: the process is up and serving; never waits for the warm-up"""
     return {
         "status": "healthy",
         "message": "Service is running",
-        "imports_successful": IMPORTS_SUCCESSFUL,
-        "import_errors": IMPORT_ERRORS if not IMPORTS_SUCCESSFUL else []
+        "imports_successful": not generators.import_errors,
+        "import_errors": generators.import_errors,
     }
 
-# Only add assessment endpoints if imports were successful
-if IMPORTS_SUCCESSFUL:
-    @app.post("/api/assessment/upload_resume/")
-    async def upload_resume(file: UploadFile = File(...), num_questions: int = Form(20)):
-        try:
-            result = generate_technical_mcqs(job_role="Software Engineer", num_questions=num_questions)
-            return JSONResponse(content=result)
-        except Exception as e:
-            logger.error(f"Error in upload_resume: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-
-    @app.post("/api/assessment/technical_assessment/")
-    async def technical_assessment(job_role: str = Form("Software Engineer"), num_questions: int = Form(10)):
-        try:
-            result = generate_technical_mcqs(job_role=job_role, num_questions=num_questions)
-            return JSONResponse(content=result)
-        except Exception as e:
-            logger.error(f"Error in technical_assessment: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-
-    @app.post("/api/assessment/ats_score/")
-    async def ats_score(file: UploadFile = File(...), job_role: str = Form("Software Engineer")):
-        suffix = os.path.splitext(file.filename)[1] #type: ignore
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(await file.read())
-            tmp_path = tmp.name
-        try:
-            result = process_resume_file(tmp_path, job_role)
-            return JSONResponse(content=result)
-        except Exception as e:
-            logger.error(f"Error in ats_score: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-        finally:
-            os.remove(tmp_path)
-
-    @app.post("/api/assessment/resume_optimize/")
-    async def resume_optimize(file: UploadFile = File(...), job_role: str = Form("Software Engineer")):
-        suffix = os.path.splitext(file.filename)[1] #type: ignore
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(await file.read())
-            tmp_path = tmp.name
-        try:
-            resume_text = extract_resume_text(tmp_path)
-            if resume_text is None or not resume_text.strip():
-                return JSONResponse(status_code=400, content={"error": "Could not extract text from the uploaded resume. Supported formats: PDF, DOCX."})
-            result = analyze_resume(tmp_path, job_role)
-            return JSONResponse(content={"result": result})
-        except Exception as e:
-            logger.error(f"Error in resume_optimize: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-        finally:
-            os.remove(tmp_path)
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: 503 until the warm-up has finished (or timed out), then 200"""
+    report = startup.get_stats()
+    if not report["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **report})
+    return {"status": "degraded" if report["degraded"] else "ready", **report}
 
-    @app.post("/api/assessment/communication_test/")
-    async def communication_test(job_role: str = Form("Software Engineer"), num_questions: int = Form(10)):
-        try:
-            result = generate_communication_test(job_role, num_questions)
-            return JSONResponse(content=result)
-        except Exception as e:
-            logger.error(f"Error in communication_test: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-
-    @app.post("/api/assessment/general_aptitude/")
-    async def general_aptitude(job_role: str = Form("Software Engineer"), num_questions: int = Form(10), difficulty: str = Form("moderate")):
-        try:
-            result = generate_aptitude_mcqs(job_role, num_questions, difficulty)
-            return JSONResponse(content=result)
-        except Exception as e:
-            logger.error(f"Error in general_aptitude: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-
-    @app.post("/api/assessment/domain_questions/")
-    async def domain_questions(file: UploadFile = File(...), job_role: str = Form("Software Engineer")):
-        suffix = os.path.splitext(file.filename)[1] #type: ignore
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(await file.read())
-            tmp_path = tmp.name
-        try:
-            result = generate_domain_questions(tmp_path, job_role, is_pdf=True)
-            return JSONResponse(content=result)
-        except Exception as e:
-            logger.error(f"Error in domain_questions: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-        finally:
-            os.remove(tmp_path)
-
-    @app.post("/api/assessment/linkedin_post/")
-    async def linkedin_post_generator(
-        post_type: str = Form("Professional Insight"), 
-        topic: str = Form("Career Development"),
-        post_description: str = Form("Share insights about career growth and professional development")
-    ):
-        try:
-            result = generate_linkedin_post(post_type=post_type, topic=topic, post_description=post_description)
-            return JSONResponse(content=result)
-        except Exception as e:
-            logger.error(f"Error in linkedin_post_generator: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-
-    @app.get("/api/linkedin/auth-url/")
-    async def get_linkedin_auth_url_endpoint():
-        """Get LinkedIn OAuth authorization URL"""
-        try:
-            result = get_linkedin_auth_url()
-            return JSONResponse(content=result)
-        except Exception as e:
-            logger.error(f"Error in get_linkedin_auth_url_endpoint: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-
-    @app.post("/api/linkedin/exchange-code/")
-    async def exchange_linkedin_code(authorization_code: str = Form(...)):
-        """Exchange authorization code for access token"""
-        try:
-            result = exchange_code_for_token(authorization_code)
-            return JSONResponse(content=result)
-        except Exception as e:
-            logger.error(f"Error in exchange_linkedin_code: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-
-    @app.post("/api/linkedin/post-direct/")
-    async def post_direct_to_linkedin(
-        access_token: str = Form(...),
-        post_type: str = Form("Professional Insight"),
-        topic: str = Form("Career Development"),
-        post_description: str = Form("Share insights about career growth and professional development")
-    ):
-        """Generate and post directly to LinkedIn"""
-        try:
-            result = generate_and_post_to_linkedin(
-                access_token=access_token,
-                post_type=post_type,
-                topic=topic,
-                post_description=post_description
-            )
-            return JSONResponse(content=result)
-        except Exception as e:
-            logger.error(f"Error in post_direct_to_linkedin: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-
-    @app.post("/api/assessment/personality_assessment/")
-    async def personality_assessment(
-        num_questions: int = Form(10),
-        assessment_focus: str = Form("Work Style"),
-        job_role: str = Form("Professional")
-    ):
-        try:
-            result = generate_personality_assessment(num_questions=num_questions, assessment_focus=assessment_focus, job_role=job_role)
-            return JSONResponse(content=result)
-        except Exception as e:
-            logger.error(f"Error in personality_assessment: {e}")
-            return JSONResponse(status_code=500, content={"error": str(e)})
-
-else:
-    # Add fallback endpoints when imports fail
-    @app.post("/api/assessment/technical_assessment/")
-    async def technical_assessment_fallback(job_role: str = Form("Software Engineer"), num_questions: int = Form(10)):
-        return JSONResponse(content={
-            "error": "Service temporarily unavailable due to import errors",
-            "import_errors": IMPORT_ERRORS,
-            "fallback_response": {
-                "questions": "Service is being initialized. Please try again in a few minutes.",
-                "job_role": job_role,
-                "total_questions": num_questions,
-                "status": "fallback"
-            }
-        })
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics: request counts and latency per route and pipeline stage, fallbacks, cache hit ratios"""
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/api/tracing/stats/")
+async def tracing_stats():
+    """Traces recorded and exported (sampled, slow or failed) and where they are written"""
+    return tracing.tracer.get_stats()
+
+@app.get("/api/logging/stats/")
+async def logging_stats():
+    """Log records queued, dropped on a full queue and sampled out"""
+    return structured_logging.get_stats()
+
+@app.get("/api/startup/stats/")
+async def startup_stats():
+    """Warm-up progress and duration, and which generator modules are loaded and how long each took"""
+    return {"warm_up": startup.get_stats(), **generators.get_stats()}
+
+@app.get("/api/cache/stats/")
+async def cache_stats():
+    """Hit/miss counters for the LLM response, resume extraction and section caches, and report-part reuse"""
+    from llm_provider import get_response_cache
+    from resume_extraction import extraction_cache
+    from resume_sections import section_cache
+    from analysis_store import analysis_store
+    return {
+        "llm": get_response_cache().get_stats(),
+        "resume_extraction": extraction_cache.get_stats(),
+        "resume_sections": section_cache.get_stats(),
+        "resume_analysis": analysis_store.get_stats(),
+    }
+
+@app.get("/api/prompts/stats/")
+async def prompt_token_stats():
+    """Prompt tokens per endpoint and tokens saved by resume compaction"""
+    from prompt_compaction import prompt_stats
+    return prompt_stats.get_stats()
+
+@app.get("/api/extraction/stats/")
+async def extraction_stats():
+    """Sandboxed resume extraction worker counters"""
+    return get_sandbox().get_stats()
+
+@app.get("/api/pool/stats/")
+async def pool_stats():
+    """Warm question pool sizes and hit/miss counters"""
+    return question_pool.get_stats()
+
+@app.get("/api/jobs/index/stats/")
+async def job_index_stats():
+    """Job matching index size and query latency"""
+    job_index = await generator("job_matching", "job_index")
+    return job_index.get_stats()
+
+def extraction_failed(error: ExtractionError) -> JSONResponse:
+    """422 for uploads whose parser crashed, timed out or exceeded its memory cap"""
+    log.warning("Resume extraction rejected", error=str(error))
+    return JSONResponse(status_code=422, content={"error": f"The uploaded resume could not be processed: {error}", "status": "error"})
+
+def stream_events(events, request: Request) -> StreamingResponse:
+    """Send question events as SSE if the client asks for it, NDJSON otherwise"""
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(encode_sse(events), media_type="text/event-stream")
+    return StreamingResponse(encode_ndjson(events), media_type="application/x-ndjson")
+
+@app.post("/api/assessment/upload_resume/")
+async def upload_resume(file: UploadFile = File(...), num_questions: int = Form(20)):
+    num_questions = question_count(num_questions)
+    generate_technical_mcqs = await generator("technical_assessment", "generate_technical_mcqs")
+    try:
+        result = await run_blocking(generate_technical_mcqs, job_role="Software Engineer", num_questions=num_questions)
+        return JSONResponse(content=result)
+    except Exception as e:
+        log.exception("Request failed", handler="upload_resume")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/assessment/technical_assessment/")
+async def technical_assessment(job_role: str = Form("Software Engineer"), num_questions: int = Form(10), difficulty: str = Form("moderate")):
+    num_questions = question_count(num_questions)
+    generate_technical_mcqs = await generator("technical_assessment", "generate_technical_mcqs")
+    try:
+        result = question_pool.take("technical", job_role, num_questions, difficulty)
+        if result is None:
+            result = await run_blocking(generate_technical_mcqs, job_role=job_role, num_questions=num_questions, difficulty=difficulty)
+        return JSONResponse(content=result)
+    except Exception as e:
+        log.exception("Request failed", handler="technical_assessment")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/assessment/technical_assessment/stream/")
+async def technical_assessment_stream(request: Request, job_role: str = Form("Software Engineer"), num_questions: int = Form(10), difficulty: str = Form("moderate")):
+    """Stream technical questions one at a time (NDJSON, or SSE with Accept: text/event-stream)"""
+    num_questions = question_count(num_questions)
+    stream_technical_mcqs = await generator("technical_assessment", "stream_technical_mcqs")
+    return stream_events(stream_technical_mcqs(job_role, num_questions, difficulty), request)
+
+@app.post("/api/assessment/ats_score/")
+async def ats_score(file: UploadFile = File(...), job_role: str = Form("Software Engineer")):
+    process_resume_file = await generator("ats_score", "process_resume_file")
+    try:
+        # The upload's spooled file is parsed in memory, no temp-file copy
+        result = await run_blocking(process_resume_file, file.file, job_role, filename=file.filename)
+        return JSONResponse(content=result)
+    except ExtractionError as e:
+        return extraction_failed(e)
+    except Exception as e:
+        log.exception("Request failed", handler="ats_score")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/assessment/resume_optimize/")
+async def resume_optimize(
+    file: UploadFile = File(...),
+    job_role: str = Form("Software Engineer"),
+    user_id: Optional[str] = Form(None),
+    lineage_id: Optional[str] = Form(None),
+):
+    extract_resume_text = await generator("resume_extraction", "extract_resume_text")
+    analyze_resume = await generator("resume_optimizer", "analyze_resume")
+    try:
+        resume_text = await run_blocking(extract_resume_text, file.file, file.filename)
+        if resume_text is None or not resume_text.strip():
+            return JSONResponse(status_code=400, content={"error": "Could not extract text from the uploaded resume. Supported formats: PDF, DOCX."})
+        result = await run_blocking(analyze_resume, file.file, job_role, filename=file.filename, user_id=user_id, lineage_id=lineage_id)
+        return JSONResponse(content={"result": result})
+    except ExtractionError as e:
+        return extraction_failed(e)
+    except Exception as e:
+        log.exception("Request failed", handler="resume_optimize")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/assessment/communication_test/")
+async def communication_test(job_role: str = Form("Software Engineer"), num_questions: int = Form(10), difficulty: str = Form("moderate")):
+    num_questions = question_count(num_questions)
+    generate_communication_test = await generator("communication_test", "generate_communication_test")
+    try:
+        result = await run_blocking(generate_communication_test, num_questions=num_questions, difficulty=difficulty)
+        return JSONResponse(content=result)
+    except Exception as e:
+        log.exception("Request failed", handler="communication_test")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/assessment/communication_test/stream/")
+async def communication_test_stream(request: Request, num_questions: int = Form(10), difficulty: str = Form("moderate")):
+    """Stream communication scenarios one at a time (NDJSON, or SSE with Accept: text/event-stream)"""
+    num_questions = question_count(num_questions)
+    stream_communication_test = await generator("communication_test", "stream_communication_test")
+    return stream_events(stream_communication_test(num_questions, difficulty), request)
+
+@app.post("/api/assessment/general_aptitude/")
+async def general_aptitude(job_role: str = Form("Software Engineer"), num_questions: int = Form(10), difficulty: str = Form("moderate")):
+    num_questions = question_count(num_questions)
+    generate_aptitude_mcqs = await generator("general_aptitude", "generate_aptitude_mcqs")
+    try:
+        result = question_pool.take("aptitude", job_role, num_questions, difficulty)
+        if result is None:
+            result = await run_blocking(generate_aptitude_mcqs, job_role, num_questions, difficulty)
+        return JSONResponse(content=result)
+    except Exception as e:
+        log.exception("Request failed", handler="general_aptitude")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/assessment/general_aptitude/stream/")
+async def general_aptitude_stream(request: Request, job_role: str = Form("Software Engineer"), num_questions: int = Form(10), difficulty: str = Form("moderate")):
+    """Stream aptitude questions one at a time (NDJSON, or SSE with Accept: text/event-stream)"""
+    num_questions = question_count(num_questions)
+    stream_aptitude_mcqs = await generator("general_aptitude", "stream_aptitude_mcqs")
+    return stream_events(stream_aptitude_mcqs(job_role, num_questions, difficulty), request)
+
+@app.post("/api/assessment/domain_questions/")
+async def domain_questions(file: UploadFile = File(...), job_role: str = Form("Software Engineer")):
+    generate_domain_questions = await generator("domain_questions", "generate_domain_questions")
+    try:
+        result = await run_blocking(generate_domain_questions, file.file, job_role, is_pdf=True, filename=file.filename)
+        return JSONResponse(content=result)
+    except ExtractionError as e:
+        return extraction_failed(e)
+    except Exception as e:
+        log.exception("Request failed", handler="domain_questions")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/assessment/rank_resumes/")
+async def rank_resumes_endpoint(
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(...),
+    job_role: Optional[str] = Form(None),
+    top_k: int = Form(0),
+):
+    """Rank many resumes against one job description; `top_k` best matches get an AI deep-dive"""
+    rank_resumes = await generator("resume_ranking", "rank_resumes")
+    max_resumes = await generator("resume_ranking", "RANKING_MAX_RESUMES")
+    if len(files) > max_resumes:
+        return JSONResponse(status_code=400, content={"error": f"At most {max_resumes} resumes per request."})
+    if not job_description.strip():
+        return JSONResponse(status_code=400, content={"error": "job_description is required."})
+    try:
+        resumes = [(file.filename, file.file) for file in files]
+        result = await run_blocking(rank_resumes, resumes, job_description, job_role=job_role, top_k=top_k)
+        return JSONResponse(content=result)
+    except Exception as e:
+        log.exception("Request failed", handler="rank_resumes")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/jobs/match/")
+async def match_jobs_endpoint(file: UploadFile = File(...), top_k: int = Form(10), user_id: Optional[str] = Form(None)):
+    """Indexed jobs that best match an uploaded resume; `user_id` limits it to that user's saved jobs"""
+    extract_resume_text = await generator("resume_extraction", "extract_resume_text")
+    match_jobs = await generator("job_matching", "match_jobs")
+    try:
+        resume_text = await run_blocking(extract_resume_text, file.file, file.filename)
+        if resume_text is None or not resume_text.strip():
+            return JSONResponse(status_code=400, content={"error": "Could not extract text from the uploaded resume. Supported formats: PDF, DOCX."})
+        result = await run_blocking(match_jobs, resume_text, top_k=max(1, min(top_k, 100)), user_id=user_id)
+        return JSONResponse(content=result)
+    except ExtractionError as e:
+        return extraction_failed(e)
+    except Exception as e:
+        log.exception("Request failed", handler="match_jobs")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/jobs/index/")
+async def index_job(job_id: str = Form(...), job_data: str = Form(...), user_id: Optional[str] = Form(None)):
+    """Add or update one saved job in the matching index; job_data is the saved_jobs JSON"""
+    job_index = await generator("job_matching", "job_index")
+    try:
+        data = json.loads(job_data)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": f"job_data is not valid JSON: {e}"})
+    if not isinstance(data, dict):
+        return JSONResponse(status_code=400, content={"error": "job_data must be a JSON object"})
+    job_index.add(job_id, data, user_id)
+    return JSONResponse(content={"status": "success", "indexed_jobs": len(job_index)})
+
+@app.delete("/api/jobs/index/{job_id}")
+async def unindex_job(job_id: str):
+    """Remove a saved job from the matching index"""
+    job_index = await generator("job_matching", "job_index")
+    if not job_index.remove(job_id):
+        return JSONResponse(status_code=404, content={"error": "Job not indexed"})
+    return JSONResponse(content={"status": "success", "indexed_jobs": len(job_index)})
+
+@app.post("/api/assessment/linkedin_post/")
+async def linkedin_post_generator(
+    post_type: str = Form("Professional Insight"), 
+    topic: str = Form("Career Development"),
+    post_description: str = Form("Share insights about career growth and professional development")
+):
+    generate_linkedin_post = await generator("linkedin_post_generator", "generate_linkedin_post")
+    try:
+        result = await run_blocking(generate_linkedin_post, post_type=post_type, topic=topic, post_description=post_description)
+        return JSONResponse(content=result)
+    except Exception as e:
+        log.exception("Request failed", handler="linkedin_post_generator")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.get("/api/linkedin/auth-url/")
+async def get_linkedin_auth_url_endpoint():
+    """Get LinkedIn OAuth authorization URL"""
+    get_linkedin_auth_url = await generator("linkedin_post_generator", "get_linkedin_auth_url")
+    try:
+        result = get_linkedin_auth_url()
+        return JSONResponse(content=result)
+    except Exception as e:
+        log.exception("Request failed", handler="get_linkedin_auth_url_endpoint")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/linkedin/exchange-code/")
+async def exchange_linkedin_code(authorization_code: str = Form(...)):
+    """Exchange authorization code for access token"""
+    exchange_code_for_token = await generator("linkedin_post_generator", "exchange_code_for_token")
+    try:
+        result = await run_blocking(exchange_code_for_token, authorization_code)
+        return JSONResponse(content=result)
+    except Exception as e:
+        log.exception("Request failed", handler="exchange_linkedin_code")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/linkedin/post-direct/")
+async def post_direct_to_linkedin(
+    access_token: str = Form(...),
+    post_type: str = Form("Professional Insight"),
+    topic: str = Form("Career Development"),
+    post_description: str = Form("Share insights about career growth and professional development")
+):
+    """Generate and post directly to LinkedIn"""
+    generate_and_post_to_linkedin = await generator("linkedin_post_generator", "generate_and_post_to_linkedin")
+    try:
+        result = await run_blocking(
+            generate_and_post_to_linkedin,
+            access_token=access_token,
+            post_type=post_type,
+            topic=topic,
+            post_description=post_description
+        )
+        return JSONResponse(content=result)
+    except Exception as e:
+        log.exception("Request failed", handler="post_direct_to_linkedin")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/assessment/personality_assessment/")
+async def personality_assessment(
+    num_questions: int = Form(10),
+    assessment_focus: str = Form("Work Style"),
+    job_role: str = Form("Professional")
+):
+    num_questions = question_count(num_questions)
+    generate_personality_assessment = await generator("personality_assessment", "generate_personality_assessment")
+    try:
+        result = await run_blocking(generate_personality_assessment, num_questions=num_questions, assessment_focus=assessment_focus, job_role=job_role)
+        return JSONResponse(content=result)
+    except Exception as e:
+        log.exception("Request failed", handler="personality_assessment")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+@app.post("/api/assessment/personality_assessment/stream/")
+async def personality_assessment_stream(
+    request: Request,
+    num_questions: int = Form(10),
+    assessment_focus: str = Form("Work Style"),
+    job_role: str = Form("Professional")
+):
+    """Stream personality questions one at a time (NDJSON, or SSE with Accept: text/event-stream)"""
+    num_questions = question_count(num_questions)
+    stream_personality_assessment = await generator("personality_assessment", "stream_personality_assessment")
+    return stream_events(stream_personality_assessment(num_questions, assessment_focus, job_role), request)
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
@@ -0,0 +1,360 @@
+import copy
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from resume_sections import segment_resume
+
+# Canonical keyword -> synonyms/spellings, per role profile
+ROLE_KEYWORDS: Dict[str, Dict[str, List[str]]] = {
+    "software engineer": {
+        "Python": ["python"],
+        "Java": ["java"],
+        "JavaScript": ["javascript", "js", "es6"],
+        "TypeScript": ["typescript"],
+        "C++": ["c++", "cpp"],
+        "Data Structures": ["data structures", "dsa"],
+        "Algorithms": ["algorithms", "algorithm"],
+        "System Design": ["system design", "distributed systems", "scalability"],
+        "REST APIs": ["rest api", "rest apis", "restful", "api development"],
+        "SQL": ["sql", "mysql", "postgresql", "postgres", "sqlite"],
+        "Git": ["git", "github", "gitlab", "version control"],
+        "Testing": ["unit testing", "unit tests", "pytest", "jest", "junit", "tdd", "test-driven"],
+        "Docker": ["docker", "containers", "containerization"],
+        "Cloud": ["aws", "azure", "gcp", "google cloud", "cloud"],
+        "CI/CD": ["ci/cd", "continuous integration", "github actions", "jenkins"],
+        "Agile": ["agile", "scrum", "kanban"],
+        "OOP": ["object-oriented", "object oriented", "oop"],
+    },
+    "web developer": {
+        "HTML": ["html", "html5"],
+        "CSS": ["css", "css3", "tailwind", "tailwindcss", "sass", "bootstrap"],
+        "JavaScript": ["javascript", "js", "es6"],
+        "TypeScript": ["typescript"],
+        "React": ["react", "react.js", "reactjs"],
+        "Next.js": ["next.js", "nextjs"],
+        "Node.js": ["node.js", "nodejs", "node"],
+        "Express": ["express", "express.js", "expressjs"],
+        "REST APIs": ["rest api", "rest apis", "restful"],
+        "Databases": ["mongodb", "sql", "postgresql", "mysql", "firebase", "supabase"],
+        "Git": ["git", "github", "version control"],
+        "Responsive Design": ["responsive design", "responsive", "mobile-first"],
+        "Testing": ["jest", "cypress", "testing library", "unit testing"],
+        "Deployment": ["vercel", "netlify", "aws", "docker", "deployment"],
+    },
+    "data scientist": {
+        "Python": ["python"],
+        "R Programming": ["r programming", "rstudio", "tidyverse", "ggplot2"],
+        "SQL": ["sql", "mysql", "postgresql"],
+        "Statistics": ["statistics", "statistical", "hypothesis testing", "a/b testing"],
+        "Machine Learning": ["machine learning", "ml"],
+        "Pandas": ["pandas"],
+        "NumPy": ["numpy"],
+        "Scikit-learn": ["scikit-learn", "sklearn"],
+        "Visualization": ["matplotlib", "seaborn", "tableau", "power bi", "plotly", "data visualization"],
+        "Deep Learning": ["deep learning", "tensorflow", "pytorch", "keras"],
+        "Feature Engineering": ["feature engineering", "feature selection"],
+        "Big Data": ["spark", "pyspark", "hadoop", "big data"],
+        "Jupyter": ["jupyter", "notebooks"],
+    },
+    "machine learning engineer": {
+        "Python": ["python"],
+        "Machine Learning": ["machine learning", "ml"],
+        "Deep Learning": ["deep learning", "neural networks", "neural network"],
+        "PyTorch": ["pytorch", "torch"],
+        "TensorFlow": ["tensorflow", "keras"],
+        "Scikit-learn": ["scikit-learn", "sklearn"],
+        "NLP": ["nlp", "natural language processing", "transformers", "llm", "llms", "langchain"],
+        "Computer Vision": ["computer vision", "opencv", "cnn", "image classification"],
+        "MLOps": ["mlops", "mlflow", "kubeflow", "model deployment", "model serving"],
+        "Docker": ["docker", "kubernetes"],
+        "Cloud": ["aws", "sagemaker", "gcp", "vertex ai", "azure"],
+        "Data Processing": ["pandas", "numpy", "spark"],
+        "APIs": ["fastapi", "flask", "rest api"],
+        "Git": ["git", "github"],
+    },
+    "devops engineer": {
+        "Linux": ["linux", "unix", "bash", "shell scripting"],
+        "Docker": ["docker", "containers"],
+        "Kubernetes": ["kubernetes", "k8s", "helm"],
+        "CI/CD": ["ci/cd", "jenkins", "github actions", "gitlab ci", "circleci"],
+        "Cloud": ["aws", "azure", "gcp", "google cloud"],
+        "Infrastructure as Code": ["terraform", "ansible", "cloudformation", "pulumi", "infrastructure as code"],
+        "Monitoring": ["prometheus", "grafana", "datadog", "elk", "monitoring", "observability"],
+        "Networking": ["networking", "dns", "load balancing", "tcp/ip"],
+        "Scripting": ["python", "bash", "golang"],
+        "Git": ["git", "github", "gitlab"],
+        "Security": ["security", "iam", "devsecops"],
+    },
+    "data analyst": {
+        "SQL": ["sql", "mysql", "postgresql", "bigquery"],
+        "Excel": ["excel", "spreadsheets", "vlookup", "pivot tables"],
+        "Visualization": ["tableau", "power bi", "looker", "data visualization", "dashboards"],
+        "Python": ["python", "pandas"],
+        "Statistics": ["statistics", "statistical analysis", "a/b testing"],
+        "Reporting": ["reporting", "kpi", "kpis", "metrics"],
+        "Data Cleaning": ["data cleaning", "data wrangling", "etl"],
+        "Communication": ["stakeholders", "presentation", "storytelling"],
+    },
+    "product manager": {
+        "Roadmap": ["roadmap", "roadmapping", "product strategy"],
+        "User Research": ["user research", "customer interviews", "user interviews", "personas"],
+        "Agile": ["agile", "scrum", "sprint", "kanban"],
+        "Analytics": ["analytics", "metrics", "kpi", "kpis", "a/b testing", "sql"],
+        "Prioritization": ["prioritization", "backlog", "rice", "moscow"],
+        "Stakeholder Management": ["stakeholders", "stakeholder management", "cross-functional"],
+        "Requirements": ["prd", "requirements", "user stories", "specifications"],
+        "Go-to-Market": ["go-to-market", "gtm", "launch", "product launch"],
+        "Tools": ["jira", "confluence", "figma", "notion"],
+    },
+}
+
+# Words in a requested job role that map it to a profile
+ROLE_ALIASES = {
+    "software engineer": ["software", "swe", "developer", "programmer", "sde", "backend", "full stack", "fullstack"],
+    "web developer": ["web", "frontend", "front end", "front-end", "react", "ui"],
+    "data scientist": ["data scientist", "data science"],
+    "machine learning engineer": ["machine learning", "ml", "ai", "deep learning", "nlp"],
+    "devops engineer": ["devops", "sre", "site reliability", "cloud", "platform", "infrastructure"],
+    "data analyst": ["analyst", "analytics", "business intelligence", "bi"],
+    "product manager": ["product manager", "product owner", "pm"],
+}
+DEFAULT_ROLE = "software engineer"
+
+# Sections an ATS looks for, in report order; headings are recognised by resume_sections
+ATS_SECTIONS = ("Contact", "Summary", "Education", "Experience", "Skills", "Projects", "Certifications")
+REQUIRED_SECTIONS = ("Contact", "Education", "Experience", "Skills")
+
+ACTION_VERBS = [
+    "built", "developed", "designed", "implemented", "led", "created", "improved", "optimized",
+    "reduced", "increased", "launched", "managed", "automated", "deployed", "architected",
+    "delivered", "engineered", "migrated", "analyzed", "collaborated", "mentored", "integrated",
+]
+
+# Score weights (sum to 100)
+KEYWORD_WEIGHT = 50
+SECTION_WEIGHT = 20
+FORMATTING_WEIGHT = 30
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE = re.compile(r"(?:\+?\d[\d\s().-]{8,}\d)")
+LINK = re.compile(r"linkedin\.com|github\.com", re.IGNORECASE)
+BULLET = re.compile(r"^\s*(?:[•●▪◦\-*–]|\d+[.)])\s+")
+METRIC = re.compile(r"\d+(?:\.\d+)?\s*(?:%|x\b|\+|k\b|m\b|users|ms\b|hours|days)|\$\s?\d", re.IGNORECASE)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over lower-cased patterns. A single pass over the
+    text finds every pattern occurrence; matches are kept only on word
+    boundaries so "go" does not match inside "google".
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        # patterns: lower-cased surface form -> canonical keyword
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, int]]] = [[]]
+        for surface, canonical in patterns.items():
+            self._add(surface.lower(), canonical)
+        self._build()
+
+    def _add(self, pattern: str, canonical: str) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((canonical, len(pattern)))
+
+    def _build(self) -> None:
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for ch, nxt in self._goto[state].items():
+                pending.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Dict[str, int]:
+        """Occurrence count per canonical keyword found in `text`"""
+        text = text.lower()
+        counts: Dict[str, int] = {}
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            after_ok = end + 1 >= len(text) or not _is_word_char(text[end + 1])
+            for canonical, length in out[state]:
+                start = end - length + 1
+                before_ok = start == 0 or not _is_word_char(text[start - 1])
+                # Patterns that end in a symbol (c++, c#) need no trailing boundary
+                if before_ok and (after_ok or not _is_word_char(text[end])):
+                    counts[canonical] = counts.get(canonical, 0) + 1
+        return counts
+
+
+def _build_index(keywords: Dict[str, List[str]]) -> KeywordAutomaton:
+    patterns = {}
+    for canonical, synonyms in keywords.items():
+        for surface in [canonical, *synonyms]:
+            patterns.setdefault(surface.lower(), canonical)
+    return KeywordAutomaton(patterns)
+
+
+# Precompiled at import: one automaton per role profile, one for section headings
+ROLE_INDEXES = {role: _build_index(keywords) for role, keywords in ROLE_KEYWORDS.items()}
+_ROLE_MATCHER = KeywordAutomaton({alias: role for role, aliases in ROLE_ALIASES.items() for alias in [role, *aliases]})
+
+
+def resolve_role(job_role: str) -> str:
+    """Map a free-form job role to the closest keyword profile"""
+    matches = _ROLE_MATCHER.find(job_role or "")
+    if not matches:
+        return DEFAULT_ROLE
+    # Ties go to the more specific profile ("Frontend Developer" -> web developer)
+    return max(matches, key=lambda role: (matches[role], role != DEFAULT_ROLE))
+
+
+def detect_sections(text: str, sections: Optional[Dict[str, str]] = None) -> List[str]:
+    """Sections present (with content), plus "Contact" if an email or phone number is found"""
+    sections = segment_resume(text) if sections is None else sections
+    found = ["Contact"] if EMAIL.search(text) or PHONE.search(text) else []
+    return found + [name for name in ATS_SECTIONS[1:] if name in sections]
+
+
+def formatting_signals(text: str) -> Dict[str, object]:
+    lines = [line for line in text.splitlines() if line.strip()]
+    words = text.split()
+    lowered = text.lower()
+    printable = sum(1 for ch in text if ch.isprintable() or ch in "\n\t")
+    return {
+        "word_count": len(words),
+        "has_email": bool(EMAIL.search(text)),
+        "has_phone": bool(PHONE.search(text)),
+        "has_profile_links": bool(LINK.search(text)),
+        "bullet_lines": sum(1 for line in lines if BULLET.match(line)),
+        "quantified_achievements": len(METRIC.findall(text)),
+        "action_verbs": sorted({verb for verb in ACTION_VERBS if re.search(rf"\b{verb}\b", lowered)}),
+        "long_lines": sum(1 for line in lines if len(line) > 160),
+        "text_quality": round(printable / len(text), 3) if text else 0.0,
+    }
+
+
+def _formatting_score(signals: Dict[str, object]) -> Tuple[float, List[str], List[str]]:
+    """Fraction of formatting points earned, plus strengths and weaknesses"""
+    checks = [
+        (300 <= signals["word_count"] <= 1000, 0.2, "Resume length is ATS-friendly (300-1000 words)",
+         f"Resume has {signals['word_count']} words; aim for 300-1000"),
+        (signals["has_email"] and signals["has_phone"], 0.15, "Contact details (email and phone) are present",
+         "Add both an email address and a phone number"),
+        (signals["has_profile_links"], 0.1, "Includes LinkedIn/GitHub profile links",
+         "Add LinkedIn or GitHub profile links"),
+        (signals["bullet_lines"] >= 5, 0.15, "Uses bullet points for scannable content",
+         "Use bullet points to list responsibilities and achievements"),
+        (signals["quantified_achievements"] >= 3, 0.15, "Achievements are quantified with numbers",
+         "Quantify achievements with numbers, percentages or scale"),
+        (len(signals["action_verbs"]) >= 5, 0.15, "Strong action verbs describe the work",
+         "Start bullet points with strong action verbs (built, led, optimized...)"),
+        (signals["long_lines"] <= 3 and signals["text_quality"] >= 0.98, 0.1, "Text extracts cleanly (no tables/columns garbling)",
+         "Simplify layout: long or garbled lines suggest tables or multi-column formatting"),
+    ]
+    earned, strengths, weaknesses = 0.0, [], []
+    for passed, weight, strength, weakness in checks:
+        if passed:
+            earned += weight
+            strengths.append(strength)
+        else:
+            weaknesses.append(weakness)
+    return earned, strengths, weaknesses
+
+
+def score_resume(resume_text: str, job_role: str = "Software Engineer") -> dict:
+    """
+    Deterministic ATS score (0-100) for a resume against a job role:
+    keyword coverage of the role profile, section presence and formatting
+    signals. Returns the score, its breakdown, found/missing keywords and
+    feedback in the {strengths, weaknesses, tips} shape the frontend renders.
+    """
+    # Same text and role always score the same, so repeat requests are cached
+    return copy.deepcopy(_score_resume(resume_text, resolve_role(job_role)))
+
+
+@lru_cache(maxsize=256)
+def _score_resume(resume_text: str, role: str) -> dict:
+    keywords = ROLE_KEYWORDS[role]
+    counts = ROLE_INDEXES[role].find(resume_text)
+    found = [k for k in keywords if k in counts]
+    missing = [k for k in keywords if k not in counts]
+    keyword_points = KEYWORD_WEIGHT * len(found) / len(keywords)
+
+    sections = detect_sections(resume_text)
+    missing_sections = [s for s in ATS_SECTIONS if s not in sections]
+    required_found = sum(1 for s in REQUIRED_SECTIONS if s in sections)
+    optional = [s for s in ATS_SECTIONS if s not in REQUIRED_SECTIONS]
+    optional_found = sum(1 for s in optional if s in sections)
+    section_points = SECTION_WEIGHT * (0.8 * required_found / len(REQUIRED_SECTIONS) + 0.2 * optional_found / len(optional))
+
+    signals = formatting_signals(resume_text)
+    formatting_fraction, strengths, weaknesses = _formatting_score(signals)
+    formatting_points = FORMATTING_WEIGHT * formatting_fraction
+
+    if len(found) >= len(keywords) / 2:
+        strengths.insert(0, f"Covers {len(found)} of {len(keywords)} core {role} keywords")
+    else:
+        weaknesses.insert(0, f"Covers only {len(found)} of {len(keywords)} core {role} keywords")
+    tips = [f"Add a '{s}' section" for s in missing_sections if s in REQUIRED_SECTIONS]
+    if missing:
+        tips.append(f"Mention relevant experience with: {', '.join(missing[:6])}")
+    tips.extend(weaknesses[1:3] if len(found) < len(keywords) / 2 else weaknesses[:2])
+
+    return {
+        "score": round(keyword_points + section_points + formatting_points),
+        "score_breakdown": {
+            "keywords": round(keyword_points, 1),
+            "sections": round(section_points, 1),
+            "formatting": round(formatting_points, 1),
+        },
+        "role_profile": role,
+        "found_keywords": found,
+        "missing_keywords": missing,
+        "keyword_counts": {k: counts[k] for k in found},
+        "sections_found": sections,
+        "sections_missing": missing_sections,
+        "formatting": signals,
+        "feedback": {"strengths": strengths, "weaknesses": weaknesses, "tips": tips},
+    }
+
+
+def format_report(result: dict, job_role: str) -> str:
+    """Markdown summary of a local score, used when no model narrative is available"""
+    lines = [
+        f"**ATS Analysis for {job_role}**",
+        "",
+        f"- **ATS Score**: {result['score']}/100 "
+        f"(keywords {result['score_breakdown']['keywords']}, sections {result['score_breakdown']['sections']}, "
+        f"formatting {result['score_breakdown']['formatting']})",
+        f"- **Keywords Found**: {', '.join(result['found_keywords']) or 'None'}",
+        f"- **Missing Keywords**: {', '.join(result['missing_keywords']) or 'None'}",
+        f"- **Sections Found**: {', '.join(result['sections_found']) or 'None'}",
+        "- **Suggestions**:",
+    ]
+    lines.extend(f"  - {tip}" for tip in result["feedback"]["tips"])
+    return "\n".join(lines)
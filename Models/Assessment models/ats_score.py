@@ -1,141 +1,105 @@
 import os
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from dotenv import load_dotenv
+from settings import load_settings
 import re
-from llm_provider import get_chat_model
+from llm_provider import get_chat_model, invoke_model
 
-# Add imports for file handling
-import pdfplumber
-import docx
-from typing import Optional
+# Shared, content-hash cached resume extraction and segmentation
+from resume_extraction import ResumeSource
+from resume_sections import get_resume_sections, segment_resume
+from prompt_compaction import compact_resume
+from extraction_sandbox import ExtractionError
+from typing import Dict, Optional
+from ats_engine import format_report, score_resume
+from structured_logging import get_logger
 
 # Load environment variables
-load_dotenv()
+load_settings()
+
+log = get_logger(__name__)
 
 model = get_chat_model()
 
+# Resume sections the narrative needs, most valuable first; contact details and education are not sent
+ATS_PROMPT_SECTIONS = ("Skills", "Experience", "Projects", "Summary", "Certifications")
+
 # Output parser
 parser = StrOutputParser()
 
-# Prompt template for ATS scoring
+# Prompt template for the ATS narrative; the score itself is computed locally
 ats_scoring_template = """
-You are an expert ATS (Applicant Tracking System) analyzer. Analyze the resume text for {job_role} position and provide:
+You are an expert ATS (Applicant Tracking System) analyzer. A deterministic ATS scan of this resume for the {job_role} position produced:
+
+- **ATS Score**: {score}/100 (keywords {keyword_points}/50, sections {section_points}/20, formatting {formatting_points}/30)
+- **Keywords Found**: {found_keywords}
+- **Missing Keywords**: {missing_keywords}
+- **Sections Found**: {sections_found}
 
-1. **ATS Score** (0-100): Based on keyword matching, formatting, and relevance
-2. **Keyword Analysis**: Identify relevant keywords found/missing
-3. **Formatting Assessment**: Evaluate resume structure and readability
-4. **Improvement Suggestions**: Specific recommendations for better ATS performance
+Do not re-score the resume. Using the scan and the resume sections below, provide:
 
-Resume text: {resume_text}
+1. **Keyword Analysis**: Which missing keywords matter most for this role and where they could fit
+2. **Formatting Assessment**: Structure and readability issues an ATS or recruiter would notice
+3. **Improvement Suggestions**: Specific, actionable recommendations for better ATS performance
 
-Provide a detailed analysis with specific scores and actionable feedback.
+Resume sections:
+{resume_text}
 """
 
 ats_scoring_prompt = PromptTemplate(
-    input_variables=["resume_text", "job_role"],
+    input_variables=["resume_text", "job_role", "score", "keyword_points", "section_points", "formatting_points", "found_keywords", "missing_keywords", "sections_found"],
     template=ats_scoring_template
 )
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file"""
-    try:
-        with pdfplumber.open(file_path) as pdf:
-            text = "\n".join(page.extract_text() or '' for page in pdf.pages)
-        return text
-    except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
-        return ""
-
-def extract_text_from_docx(file_path: str) -> str:
-    """Extract text from DOCX file"""
-    try:
-        doc = docx.Document(file_path)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text
-    except Exception as e:
-        print(f"Error extracting text from DOCX: {e}")
-        return ""
-
-def extract_resume_text(file_path: str) -> Optional[str]:
-    """Extract text from resume file (PDF or DOCX)"""
-    try:
-        ext = os.path.splitext(file_path)[1].lower()
-        if ext == ".pdf":
-            return extract_text_from_pdf(file_path)
-        elif ext == ".docx":
-            return extract_text_from_docx(file_path)
-        elif ext == ".doc":
-            # For .doc files, we'll try to extract as much as possible
-            return extract_text_from_docx(file_path)
-        else:
-            print(f"Unsupported file format: {ext}")
-            return None
-    except Exception as e:
-        print(f"Error extracting resume text: {e}")
-        return None
-
-def process_resume_file(file_path: str, job_role: str = "Software Engineer") -> dict:
-    """Process resume file and return ATS analysis"""
-    print(f"🔄 Processing resume file for {job_role} ATS analysis")
+def score_with_narrative(resume_text: str, job_role: str, sections: Optional[Dict[str, str]] = None) -> dict:
+    """Local ATS score plus an AI-written narrative (or a local report if the model is unavailable)"""
+    result = score_resume(resume_text, job_role)
+
+    if model:
+        try:
+            sections = segment_resume(resume_text) if sections is None else sections
+            resume_prompt_text, compaction = compact_resume(sections, ATS_PROMPT_SECTIONS, "ats_score", fallback=resume_text)
+            log.debug("Resume compacted for prompt", raw_tokens=compaction["raw_tokens"], compacted_tokens=compaction["compacted_tokens"])
+            prompt = ats_scoring_prompt.format(
+                resume_text=resume_prompt_text,
+                job_role=job_role,
+                score=result["score"],
+                keyword_points=result["score_breakdown"]["keywords"],
+                section_points=result["score_breakdown"]["sections"],
+                formatting_points=result["score_breakdown"]["formatting"],
+                found_keywords=", ".join(result["found_keywords"]) or "None",
+                missing_keywords=", ".join(result["missing_keywords"]) or "None",
+                sections_found=", ".join(result["sections_found"]) or "None",
+            )
+            content = invoke_model(model, prompt, endpoint="ats_score")
+
+            log.info("AI ATS analysis completed", sample=True)
+
+            return {**result, "analysis": content, "source": "openrouter_ai", "job_role": job_role, "status": "success"}
+        except Exception as ai_error:
+            log.warning("AI analysis failed, using local analysis", error=str(ai_error))
+    else:
+        log.warning("No model available, using local analysis")
+
+    return {**result, "analysis": format_report(result, job_role), "source": "local_ats_engine", "job_role": job_role, "status": "fallback"}
+
+def process_resume_file(resume_file: ResumeSource, job_role: str = "Software Engineer", filename: Optional[str] = None) -> dict:
+    """Process resume file (path, bytes or file object) and return ATS analysis"""
+    log.info("Processing resume file for ATS analysis", job_role=job_role, sample=True)
     
     try:
-        resume_text = extract_resume_text(file_path)
+        resume = get_resume_sections(resume_file, filename)
         
-        if not resume_text or not resume_text.strip():
+        if not resume or not resume["text"].strip():
             return {
                 "error": "Could not extract text from the uploaded resume. Please ensure the file is not corrupted and is in PDF or DOCX format.",
                 "status": "error"
             }
         
-        if model:
-            # Try AI analysis first
-            try:
-                prompt = ats_scoring_prompt.format(
-                    resume_text=resume_text,
-                    job_role=job_role
-                )
-                result = model.invoke(prompt)
-                
-                print("✅ AI ATS analysis completed successfully!")
-                
-                return {
-                    "analysis": result.content,
-                    "source": "openrouter_ai",
-                    "job_role": job_role,
-                    "status": "success"
-                }
-            except Exception as ai_error:
-                print(f"❌ AI analysis failed: {ai_error}")
-                print("🔄 Falling back to basic analysis...")
-        else:
-            print("⚠️ No model available, using basic analysis...")
-        
-        # Fallback response when model is not available
-            return {
-                "analysis": f"""
-**ATS Analysis for {job_role}**
-
-**Note**: Full AI-powered analysis not available due to missing HuggingFace API token.
-
-**Resume Text Extracted**: {len(resume_text)} characters
-**Preview**: {resume_text[:200]}...
-
-**Sample Analysis**:
-- **ATS Score**: 75/100 (estimated)
-- **Keywords Found**: Python, JavaScript, React, Node.js
-- **Missing Keywords**: Docker, Kubernetes, AWS
-- **Formatting**: Good structure, clear sections
-- **Suggestions**: 
-  - Add more specific technical keywords
-  - Include quantifiable achievements
-  - Optimize for ATS-friendly formatting
-
-Please add HUGGINGFACEHUB_ACCESS_TOKEN_BACKUP environment variable for full AI analysis.
-                """,
-                "job_role": job_role,
-                "status": "fallback"
-            }
+        return score_with_narrative(resume["text"], job_role, resume["sections"])
+    except ExtractionError:
+        # Parser crashed or hit its limits; the API rejects the upload
+        raise
     except Exception as e:
         return {
             "error": f"Error processing resume: {str(e)}",
@@ -144,38 +108,10 @@ Please add HUGGINGFACEHUB_ACCESS_TOKEN_BACKUP environment variable for full AI a
 
 def calculate_ats_score(resume_text: str, job_role: str = "Software Engineer") -> dict:
     """Calculate ATS score for resume text"""
-    print(f"🔄 Calculating ATS score for {job_role}")
+    log.info("Calculating ATS score", job_role=job_role, sample=True)
     
     try:
-        if model:
-            # Try AI scoring first
-            try:
-                prompt = ats_scoring_prompt.format(
-                    resume_text=resume_text,
-                    job_role=job_role
-                )
-                result = model.invoke(prompt)
-                
-                print("✅ AI ATS scoring completed successfully!")
-                
-                return {
-                    "score": result.content,
-                    "source": "openrouter_ai",
-                    "job_role": job_role,
-                    "status": "success"
-                }
-            except Exception as ai_error:
-                print(f"❌ AI scoring failed: {ai_error}")
-                print("🔄 Falling back to estimated score...")
-        else:
-            print("⚠️ No model available, using estimated score...")
-        
-        # Fallback score calculation
-        return {
-            "score": "75/100 (estimated - basic keyword analysis)",
-            "job_role": job_role,
-            "status": "fallback"
-        }
+        return score_with_narrative(resume_text, job_role)
     except Exception as e:
         return {
             "error": f"Error calculating ATS score: {str(e)}",
@@ -0,0 +1,96 @@
+import contextvars
+import math
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple, Union
+
+from mcq_parser import parse_mcqs
+from mcq_repair import normalize_question, repair_questions, validate_question
+from structured_logging import get_logger
+
+log = get_logger(__name__)
+
+# Largest number of questions requested from the model in one call
+MCQ_BATCH_SIZE = int(os.getenv("MCQ_BATCH_SIZE", "10"))
+# Concurrent model calls per request; further batches start as earlier ones finish
+MCQ_MAX_PARALLEL_BATCHES = int(os.getenv("MCQ_MAX_PARALLEL_BATCHES", "4"))
+
+# Separate from the request worker pool: request threads wait on these batches,
+# so sharing one pool could deadlock once every worker is waiting. Sized for
+# four requests running their full MCQ_MAX_PARALLEL_BATCHES at once.
+_batch_executor = ThreadPoolExecutor(max_workers=MCQ_MAX_PARALLEL_BATCHES * 4, thread_name_prefix="mcq-batch")
+
+# complete(count, areas, existing_questions) -> raw model output
+Completer = Callable[[int, List[str], List[dict]], str]
+
+
+def format_areas(areas: List[str]) -> str:
+    """Numbered list of topic areas for a prompt template"""
+    return "\n".join(f"{i}. {area}" for i, area in enumerate(areas, 1))
+
+
+def plan_batches(num_questions: int, areas: List[str], batch_size: int = MCQ_BATCH_SIZE) -> List[Tuple[int, List[str]]]:
+    """
+    Split a request into evenly sized batches, each focused on a distinct
+    slice of the topic areas (round-robin, reused if batches outnumber areas).
+    """
+    count = max(1, math.ceil(num_questions / batch_size))
+    if count == 1:
+        return [(num_questions, list(areas))]
+    base, extra = divmod(num_questions, count)
+    batches = []
+    for i in range(count):
+        focus = areas[i::count] or [areas[i % len(areas)]]
+        batches.append((base + (1 if i < extra else 0), focus))
+    return batches
+
+
+def generate_mcq_batches(num_questions: int, areas: List[str], complete: Completer) -> Tuple[Union[List[dict], str], dict]:
+    """
+    Generate `num_questions` MCQs as concurrent sub-batches, then merge,
+    de-duplicate and repair any shortfall with a targeted follow-up.
+    Returns the structured questions (or the raw text if nothing parsed)
+    and a report of batches/repairs.
+    """
+    batches = plan_batches(num_questions, areas)
+    if len(batches) == 1:
+        outputs = [complete(num_questions, areas, [])]
+    else:
+        # A sliding window of MCQ_MAX_PARALLEL_BATCHES, so one large request cannot take the whole pool
+        pending, futures = deque(batches), deque()
+        outputs, errors = [], []
+        while pending or futures:
+            while pending and len(futures) < MCQ_MAX_PARALLEL_BATCHES:
+                count, focus = pending.popleft()
+                futures.append(_batch_executor.submit(contextvars.copy_context().run, complete, count, focus, []))
+            try:
+                outputs.append(futures.popleft().result())
+            except Exception as e:
+                # The repair step below asks for whatever a failed batch was missing
+                log.warning("Question batch failed", error=str(e))
+                errors.append(e)
+        if not outputs:
+            raise errors[0]
+
+    # De-duplicate by question text; a well-formed copy replaces a broken one seen earlier
+    merged, slots = [], {}
+    for output in outputs:
+        for question in parse_mcqs(output):
+            key = normalize_question(question.get("question", ""))
+            if not key:
+                continue
+            if key not in slots:
+                slots[key] = len(merged)
+                merged.append(question)
+            elif validate_question(merged[slots[key]]) and not validate_question(question):
+                merged[slots[key]] = question
+
+    if not merged:
+        return "\n\n".join(outputs), {"batches": len(batches), "invalid": 0, "requested": 0, "repaired": 0, "rounds": 0}
+
+    questions, report = repair_questions(
+        merged, num_questions, lambda count, existing: complete(count, areas, existing)
+    )
+    report["batches"] = len(batches)
+    return questions, report
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Show where the assessment service's cold start goes. Each measurement runs
+in a fresh interpreter:
+
+  - time to import assessment_api (what uvicorn waits for before /health)
+  - the slowest top-level packages in that import (python -X importtime)
+  - what each generator module costs when it is first used or warmed up
+  - the old eager startup: the API plus every generator module and the model client
+
+    python bench_cold_start.py [runs]
+"""
+
+import sys
+import os
+import re
+import statistics
+import subprocess
+from collections import defaultdict
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from generator_registry import GENERATOR_MODULES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def timed(code: str, runs: int) -> float:
+    """Median wall time of running `code` in a fresh interpreter, minus interpreter startup"""
+    script = f"import time; _t = time.perf_counter()\n{code}\nprint(time.perf_counter() - _t)"
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", script], cwd=HERE, capture_output=True, text=True, check=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def top_packages(module: str, limit: int = 8) -> list:
+    """Self time per top-level package while importing `module`"""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=HERE, capture_output=True, text=True).stderr
+    totals = defaultdict(int)
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            totals[match.group(4).split(".")[0]] += int(match.group(1))
+    return sorted(totals.items(), key=lambda item: -item[1])[:limit]
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    api = timed("import assessment_api", runs)
+    print(f"import assessment_api: {api * 1000:7.1f} ms (median of {runs})")
+    for package, micros in top_packages("assessment_api"):
+        print(f"    {package:<28} {micros / 1000:7.1f} ms")
+
+    print("\nFirst use of each generator module, after the API is loaded:")
+    for module in GENERATOR_MODULES:
+        cost = timed(f"import assessment_api\n_t = time.perf_counter()\nimport {module}", runs)
+        print(f"    {module:<28} {cost * 1000:7.1f} ms")
+
+    eager = timed("import assessment_api\n" + "\n".join(f"import {m}" for m in GENERATOR_MODULES) + "\nfrom llm_provider import get_chat_model; get_chat_model()", runs)
+    print(f"\nEager startup (API + every generator + model client): {eager * 1000:7.1f} ms")
+    print(f"Lazy startup (API only, the rest warms up in the background): {api * 1000:7.1f} ms ({eager / api:.1f}x faster to /health)")
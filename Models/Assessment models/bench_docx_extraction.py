@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark DOCX extraction: the old python-docx path (full object model,
+body paragraphs only) against the streaming extractor, on generated
+resumes of increasing length. Each run happens in a fresh process so peak
+RSS is per run.
+
+    python bench_docx_extraction.py [paragraphs ...]
+"""
+
+import sys
+import os
+import io
+import json
+import resource
+import subprocess
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+REPEATS = 5
+
+
+def build_document(paragraphs: int) -> str:
+    """Write a DOCX with a header, `paragraphs` body paragraphs and a skills table every 20 paragraphs"""
+    import docx  # type: ignore
+
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe | jane@example.com | +1 555 0100"
+    for i in range(paragraphs):
+        if i % 20 == 0:
+            document.add_heading(f"Experience {i // 20 + 1}", level=1)
+            table = document.add_table(rows=3, cols=2)
+            for row, (label, value) in enumerate([("Languages", "Python, Java, SQL"), ("Frameworks", "PyTorch, React"), ("Tools", "Docker, Git")]):
+                table.cell(row, 0).text = label
+                table.cell(row, 1).text = value
+        document.add_paragraph(f"Led project {i}: shipped a data pipeline that cut processing time by {i % 90 + 10}% for 2M users.")
+    path = os.path.join(tempfile.gettempdir(), f"talento_bench_{paragraphs}_paragraphs.docx")
+    document.save(path)
+    return path
+
+
+def python_docx_baseline(data: bytes) -> str:
+    """The previous implementation"""
+    import docx  # type: ignore
+
+    return "\n".join([para.text for para in docx.Document(io.BytesIO(data)).paragraphs])
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(mode: str, path: str) -> None:
+    """Child process: extract REPEATS times and print timing/RSS as JSON"""
+    if mode == "baseline":
+        import docx  # type: ignore  # imported outside the measured region, like the streaming module
+        extract = python_docx_baseline
+    else:
+        from docx_extraction import extract_docx_text
+        extract = extract_docx_text
+    with open(path, "rb") as f:
+        data = f.read()
+    rss_before = peak_rss_mb()
+
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        text = extract(data)
+    elapsed = (time.perf_counter() - started) / REPEATS
+    print(json.dumps({"seconds": elapsed, "rss_mb": peak_rss_mb() - rss_before, "chars": len(text)}))
+
+
+def run(mode: str, path: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure", mode, path],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def compare(label: str, path: str) -> None:
+    baseline = run("baseline", path)
+    streaming = run("streaming", path)
+    print(
+        f"{label:<28} "
+        f"python-docx {baseline['seconds'] * 1000:8.1f} ms +{baseline['rss_mb']:6.1f} MB {baseline['chars']:>8} chars | "
+        f"streaming {streaming['seconds'] * 1000:8.1f} ms +{streaming['rss_mb']:6.1f} MB {streaming['chars']:>8} chars | "
+        f"speedup {baseline['seconds'] / streaming['seconds']:4.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        measure(sys.argv[2], sys.argv[3])
+        sys.exit(0)
+
+    for paragraphs in [int(n) for n in sys.argv[1:]] or [40, 400, 4000]:
+        compare(f"{paragraphs}-paragraph document", build_document(paragraphs))
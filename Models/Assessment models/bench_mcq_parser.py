@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark the structured MCQ parser on large model outputs.
+
+    python bench_mcq_parser.py [num_questions ...]
+"""
+
+import sys
+import os
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mcq_parser import IncrementalMCQParser, parse_mcqs
+
+
+def make_output(num_questions: int) -> str:
+    blocks = []
+    for i in range(1, num_questions + 1):
+        header = f"**Q{i}.**" if i % 3 == 0 else f"Q{i}."
+        blocks.append(
+            f"{header} Which statement about topic number {i} in distributed systems is correct?\n"
+            f"A) Option one for {i}\nB) Option two for {i}\nC) Option three for {i}\nD) Option four for {i}\n"
+            f"Correct Answer: {'ABCD'[i % 4]}\n"
+            f"Explanation: Detailed reasoning for question {i} that spans\na second line of text.\n"
+        )
+    return "Here are the questions:\n\n" + "\n".join(blocks)
+
+
+def best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(num_questions: int) -> None:
+    text = make_output(num_questions)
+    size_mb = len(text.encode("utf-8")) / 1e6
+    assert len(parse_mcqs(text)) == num_questions
+
+    batch = best_of(lambda: parse_mcqs(text))
+
+    def incremental():
+        parser = IncrementalMCQParser()
+        for start in range(0, len(text), 16):
+            parser.feed(text[start:start + 16])
+        parser.close()
+
+    streamed = best_of(incremental)
+    print(
+        f"{num_questions:>7} questions ({size_mb:6.2f} MB): "
+        f"batch {batch * 1000:8.2f} ms ({size_mb / batch:6.1f} MB/s, {num_questions / batch:,.0f} q/s), "
+        f"16-char chunks {streamed * 1000:8.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [10, 100, 1000, 10000, 50000]
+    for n in sizes:
+        run(n)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF extraction: the old single-threaded full-document loop against
+the page-parallel engine (sandboxed workers, or in-process with
+EXTRACTION_SANDBOX=0), on the resumes in data/ and on longer documents built
+from them. Each run happens in a fresh process so peak RSS is per run.
+
+    python bench_pdf_extraction.py [pages ...]
+"""
+
+import sys
+import os
+import glob
+import json
+import resource
+import subprocess
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def build_document(pages: int) -> str:
+    """Write a PDF of `pages` pages by repeating the sample resumes"""
+    import pypdfium2 as pdfium  # type: ignore  # installed with pdfplumber
+
+    sources = [pdfium.PdfDocument(path) for path in sorted(glob.glob(os.path.join(DATA_DIR, "*.pdf")))]
+    document = pdfium.PdfDocument.new()
+    for i in range(pages):
+        document.import_pages(sources[i % len(sources)], [0])
+    path = os.path.join(tempfile.gettempdir(), f"talento_bench_{pages}_pages.pdf")
+    document.save(path)
+    return path
+
+
+def sequential_baseline(path: str) -> dict:
+    """The previous implementation: every page, one thread, caches kept until close"""
+    import pdfplumber  # type: ignore
+
+    with pdfplumber.open(path) as pdf:
+        text = "\n".join(page.extract_text() or "" for page in pdf.pages)
+        return {"text": text, "page_count": len(pdf.pages)}
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux; sandbox workers are counted as children
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / 1024
+
+
+def measure(mode: str, path: str) -> None:
+    """Child process: extract once and print timing/RSS as JSON"""
+    if mode == "baseline":
+        extract = sequential_baseline
+    else:
+        from extraction_sandbox import get_sandbox, shutdown_sandbox
+        from pdf_extraction import extract_pdf
+        sandbox = get_sandbox()
+        # Start the workers outside the timed region; the API keeps them warm between uploads
+        for future in [sandbox.submit(int) for _ in range(sandbox.workers)]:
+            future.result()
+        extract = extract_pdf
+
+    started = time.perf_counter()
+    result = extract(path)
+    elapsed = time.perf_counter() - started
+    if mode != "baseline":
+        shutdown_sandbox()
+    print(json.dumps({
+        "seconds": elapsed,
+        "rss_mb": peak_rss_mb(),
+        "pages": result.get("pages_extracted", result["page_count"]),
+        "chars": len(result["text"]),
+    }))
+
+
+def run(mode: str, path: str, env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure", mode, path],
+        capture_output=True, text=True, check=True, env={**os.environ, **env},
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def compare(label: str, path: str) -> None:
+    baseline = run("baseline", path, {})
+    serial = run("engine-inline", path, {"EXTRACTION_SANDBOX": "0"})
+    engine = run("engine", path, {})
+    print(
+        f"{label:<40} "
+        f"baseline {baseline['seconds']:6.2f}s {baseline['rss_mb']:6.1f} MB ({baseline['pages']:>3} pages) | "
+        f"in-process {serial['seconds']:6.2f}s {serial['rss_mb']:6.1f} MB | "
+        f"sandboxed {engine['seconds']:6.2f}s {engine['rss_mb']:6.1f} MB ({engine['pages']:>3} pages) | "
+        f"speedup {baseline['seconds'] / engine['seconds']:4.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        measure(sys.argv[2], sys.argv[3])
+        sys.exit(0)
+
+    print(f"CPUs: {os.cpu_count()}, PDF_MAX_PAGES={os.getenv('PDF_MAX_PAGES', '10')}")
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "*.pdf"))):
+        compare(os.path.basename(path), path)
+    for pages in [int(n) for n in sys.argv[1:]] or [8, 40]:
+        compare(f"{pages}-page document", build_document(pages))
@@ -1,11 +1,15 @@
 import os
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from dotenv import load_dotenv
-from llm_provider import get_chat_model
+from settings import load_settings
+from llm_provider import get_chat_model, invoke_model
+from question_stream import stream_question_blocks
+from structured_logging import get_logger
 
 # Load environment variables
-load_dotenv()
+load_settings()
+
+log = get_logger(__name__)
 
 model = get_chat_model()
 
@@ -43,7 +47,7 @@ communication_assessment_prompt = PromptTemplate(
 )
 
 def generate_communication_test(num_questions: int = 10, difficulty: str = "moderate") -> dict:
-    print(f"🔄 Generating {num_questions} communication test scenarios ({difficulty} difficulty)")
+    log.info("Generating communication scenarios", num_questions=num_questions, difficulty=difficulty, sample=True)
     
     try:
         if model:
@@ -53,22 +57,21 @@ def generate_communication_test(num_questions: int = 10, difficulty: str = "mode
                     num_questions=num_questions, 
                     difficulty=difficulty
                 )
-                result = model.invoke(prompt)
+                content = invoke_model(model, prompt, endpoint="communication_test")
                 
-                print("✅ AI communication scenarios generated successfully!")
+                log.info("AI communication scenarios generated", sample=True)
                 
                 return {
-                    "questions": result.content,
+                    "questions": content,
                     "source": "openrouter_ai",
                     "total_questions": num_questions,
                     "difficulty": difficulty,
                     "status": "success"
                 }
             except Exception as ai_error:
-                print(f"❌ AI generation failed: {ai_error}")
-                print("🔄 Falling back to predefined scenarios...")
+                log.warning("AI generation failed, using predefined scenarios", error=str(ai_error))
         else:
-            print("⚠️ No model available, using fallback scenarios...")
+            log.warning("No model available, using fallback scenarios")
         
         # Fallback response with structured data
         fallback_questions = [
@@ -172,6 +175,20 @@ def generate_communication_test(num_questions: int = 10, difficulty: str = "mode
             "status": "error"
         }
 
+async def stream_communication_test(num_questions: int = 10, difficulty: str = "moderate"):
+    """Stream communication scenarios, yielding each one as soon as it is complete"""
+    log.info("Streaming communication scenarios", num_questions=num_questions, difficulty=difficulty, sample=True)
+    prompt = communication_assessment_prompt.format(
+        num_questions=num_questions,
+        difficulty=difficulty
+    )
+    async for event in stream_question_blocks(
+        model, prompt, "scenario",
+        fallback=lambda: generate_communication_test(num_questions, difficulty),
+        metadata={"difficulty": difficulty}
+    ):
+        yield event
+
 if __name__ == "__main__":
     result = generate_communication_test(5, "moderate")
     print(result)
\ No newline at end of file
@@ -0,0 +1,118 @@
+import io
+import os
+import posixpath
+import zipfile
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
+from xml.etree.ElementTree import iterparse
+
+# Largest uncompressed XML part read from a DOCX; guards against zip bombs
+DOCX_MAX_PART_MB = int(os.getenv("DOCX_MAX_PART_MB", "32"))
+
+DocxSource = Union[str, os.PathLike, bytes, BinaryIO]
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+DOCUMENT_PART = "word/document.xml"
+DOCUMENT_RELS = "word/_rels/document.xml.rels"
+
+# Run content -> text; anything else inside a run (field codes, deleted text) is skipped
+RUN_TEXT = {W + "t": None, W + "tab": "\t", W + "br": "\n", W + "cr": "\n", W + "noBreakHyphen": "-"}
+SECTION_REFERENCES = {W + "headerReference": "header", W + "footerReference": "footer"}
+
+
+def _read_part(archive: zipfile.ZipFile, name: str):
+    info = archive.getinfo(name)
+    if info.file_size > DOCX_MAX_PART_MB * 1024 * 1024:
+        raise ValueError(f"{name} is {info.file_size // (1024 * 1024)} MB uncompressed, over the {DOCX_MAX_PART_MB} MB limit")
+    return archive.open(info)
+
+
+def _relationships(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """Relationship id -> part name for the main document"""
+    if DOCUMENT_RELS not in archive.namelist():
+        return {}
+    targets = {}
+    for _, elem in iterparse(_read_part(archive, DOCUMENT_RELS)):
+        if elem.tag == RELATIONSHIP and elem.get("TargetMode") != "External":
+            targets[elem.get("Id")] = posixpath.normpath(posixpath.join("word", elem.get("Target", "")))
+    return targets
+
+
+def iter_part_lines(stream, references: Optional[Dict[str, List[str]]] = None) -> Iterator[str]:
+    """
+    Paragraph lines of one WordprocessingML part, in document order, parsed
+    incrementally. Table cells are read row by row, each cell paragraph on
+    its own line. Text boxes are read once (not again from their fallback
+    copy). Finished block elements are cleared as the parse moves on, so
+    memory stays flat however long the document is. Header/footer
+    relationship ids found in section properties are added to `references`.
+    """
+    paragraphs: List[List[str]] = []
+    skip = 0
+    parents: List = []
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            parents.append(elem)
+            if tag == MC_FALLBACK:
+                skip += 1
+            elif tag == W + "p" and not skip:
+                paragraphs.append([])
+            continue
+
+        parents.pop()
+        if tag == MC_FALLBACK:
+            skip -= 1
+        elif skip:
+            pass
+        elif tag in RUN_TEXT and paragraphs:
+            paragraphs[-1].append((elem.text or "") if RUN_TEXT[tag] is None else RUN_TEXT[tag])
+        elif tag == W + "p":
+            line = "".join(paragraphs.pop()).strip()
+            if line:
+                yield line
+        elif tag in SECTION_REFERENCES and references is not None:
+            ids = references[SECTION_REFERENCES[tag]]
+            if elem.get(R + "id") not in ids:
+                ids.append(elem.get(R + "id"))
+        # Body-level blocks (paragraphs, tables) are done with; drop them from the tree
+        if len(parents) == 2 and tag in (W + "p", W + "tbl", W + "sdt"):
+            parents[-1].remove(elem)
+
+
+def extract_docx(source: DocxSource) -> dict:
+    """
+    Text of a DOCX in reading order: page headers, then the body including
+    tables and text boxes, then page footers. Lines repeated across headers
+    and footers (first-page/even-page variants) are kept once.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with zipfile.ZipFile(source) as archive:
+        references: Dict[str, List[str]] = {"header": [], "footer": []}
+        body = list(iter_part_lines(_read_part(archive, DOCUMENT_PART), references))
+        targets = _relationships(archive)
+        margins = {}
+        for kind, ids in references.items():
+            lines: List[str] = []
+            for part in dict.fromkeys(targets[rid] for rid in ids if rid in targets):
+                if part not in archive.namelist():
+                    continue
+                for line in iter_part_lines(_read_part(archive, part)):
+                    if line not in lines:
+                        lines.append(line)
+            margins[kind] = lines
+    return {
+        "text": "\n".join(margins["header"] + body + margins["footer"]),
+        "paragraphs": len(body),
+        "header_lines": len(margins["header"]),
+        "footer_lines": len(margins["footer"]),
+    }
+
+
+def extract_docx_text(source: DocxSource) -> str:
+    """DOCX text including tables, headers and footers; runs in an extraction worker"""
+    return extract_docx(source)["text"]
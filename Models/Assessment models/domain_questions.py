@@ -1,14 +1,26 @@
 import os
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from dotenv import load_dotenv
-from llm_provider import get_chat_model
+from settings import load_settings
+from llm_provider import get_chat_model, invoke_model
+from mcq_repair import parse_and_repair, avoid_clause
+from resume_extraction import ResumeSource
+from resume_sections import get_resume_sections
+from prompt_compaction import compact_resume
+from extraction_sandbox import ExtractionError
+from typing import Optional
+from structured_logging import get_logger
 
 # Load environment variables
-load_dotenv()
+load_settings()
+
+log = get_logger(__name__)
 
 model = get_chat_model()
 
+# Questions are drawn from what the candidate has worked with, most valuable first
+DOMAIN_PROMPT_SECTIONS = ("Skills", "Projects", "Experience", "Certifications")
+
 # Prompt template for domain-specific questions
 domain_questions_template = """
 You are an expert technical interviewer. Based on the resume content, generate {num_questions} domain-specific technical questions for {job_role} position.
@@ -23,7 +35,7 @@ Focus on:
 5. Real-world scenarios
 
 Format each question as:
-Q{number}. [Question text]
+Q{{number}}. [Question text]
 A) [Option A]
 B) [Option B]
 C) [Option C]
@@ -39,12 +51,20 @@ domain_questions_prompt = PromptTemplate(
     template=domain_questions_template
 )
 
-def generate_domain_questions(resume_path: str, job_role: str = "Software Engineer", num_questions: int = 10, is_pdf: bool = True) -> dict:
-    print(f"🔄 Generating {num_questions} domain-specific questions for {job_role}")
+def generate_domain_questions(resume_file: ResumeSource, job_role: str = "Software Engineer", num_questions: int = 10, is_pdf: bool = True, filename: Optional[str] = None) -> dict:
+    """Domain MCQs based on the Skills/Experience/Projects/Certifications of an uploaded resume"""
+    log.info("Generating domain questions", job_role=job_role, num_questions=num_questions, sample=True)
+    resume_name = filename or (os.fspath(resume_file) if isinstance(resume_file, (str, os.PathLike)) else None)
     
     try:
-        # Extract resume text (simplified for fallback)
-        resume_text = f"Resume for {job_role} position"
+        resume = get_resume_sections(resume_file, filename)
+        if not resume or not resume["text"].strip():
+            return {
+                "error": "Could not extract text from the uploaded resume. Please ensure the file is not corrupted and is in PDF or DOCX format.",
+                "status": "error"
+            }
+        resume_text, compaction = compact_resume(resume["sections"], DOMAIN_PROMPT_SECTIONS, "domain_questions", fallback=resume["text"])
+        log.debug("Resume compacted for prompt", raw_tokens=compaction["raw_tokens"], compacted_tokens=compaction["compacted_tokens"])
         
         if model:
             # Try AI generation first
@@ -54,23 +74,32 @@ def generate_domain_questions(resume_path: str, job_role: str = "Software Engine
                     job_role=job_role,
                     num_questions=num_questions
                 )
-                result = model.invoke(prompt)
+                content = invoke_model(model, prompt, endpoint="domain_questions")
+                # Keep the well-formed questions and regenerate only the broken/missing ones
+                questions, repair = parse_and_repair(
+                    content, num_questions,
+                    lambda count, existing: invoke_model(
+                        model,
+                        domain_questions_prompt.format(resume_text=resume_text, job_role=job_role, num_questions=count) + avoid_clause(existing),
+                        endpoint="domain_questions_repair"
+                    )
+                )
                 
-                print("✅ AI domain questions generated successfully!")
+                log.info("AI domain questions generated", sample=True)
                 
                 return {
-                    "questions": result.content,
+                    "questions": questions or content,
                     "source": "openrouter_ai",
                     "job_role": job_role,
-                    "resume_file": resume_path,
+                    "resume_file": resume_name,
                     "num_questions": num_questions,
+                    "repaired_questions": repair["repaired"],
                     "status": "success"
                 }
             except Exception as ai_error:
-                print(f"❌ AI generation failed: {ai_error}")
-                print("🔄 Falling back to predefined questions...")
+                log.warning("AI generation failed, using predefined questions", error=str(ai_error))
         else:
-            print("⚠️ No model available, using fallback questions...")
+            log.warning("No model available, using fallback questions")
         
         # Fallback response when model is not available
         return {
@@ -96,6 +125,9 @@ Please add HUGGINGFACEHUB_ACCESS_TOKEN_BACKUP environment variable for full AI-g
                 "total_questions": num_questions,
                 "status": "fallback"
             }
+    except ExtractionError:
+        # Parser crashed or hit its limits; the API rejects the upload
+        raise
     except Exception as e:
         return {
             "error": f"Error generating domain questions: {str(e)}",
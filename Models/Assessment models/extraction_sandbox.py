@@ -0,0 +1,256 @@
+import contextvars
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from tracing import span
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, timeouts and recycling still apply
+    resource = None
+
+# Run document parsing in isolated worker processes (0 parses in the request process)
+EXTRACTION_SANDBOX = os.getenv("EXTRACTION_SANDBOX", "1") != "0"
+# Worker processes; also the number of page ranges a large PDF is split into
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(max(2, min(4, os.cpu_count() or 1)))))
+# Address-space cap per worker (RLIMIT_AS), in MB
+EXTRACTION_MEMORY_LIMIT_MB = int(os.getenv("EXTRACTION_MEMORY_LIMIT_MB", "1024"))
+# CPU seconds a single job may use (RLIMIT_CPU)
+EXTRACTION_CPU_SECONDS = int(os.getenv("EXTRACTION_CPU_SECONDS", "30"))
+# Wall-clock seconds before a job's worker is killed
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "30"))
+# Jobs a worker serves before it is replaced, so leaked memory is returned to the OS
+EXTRACTION_MAX_JOBS_PER_WORKER = int(os.getenv("EXTRACTION_MAX_JOBS_PER_WORKER", "100"))
+
+
+class ExtractionError(Exception):
+    """A document could not be extracted safely; the upload should be rejected"""
+
+
+class ExtractionTimeout(ExtractionError):
+    """The job ran past its wall-clock timeout and its worker was killed"""
+
+
+class ExtractionCrashed(ExtractionError):
+    """The worker died (signal, CPU limit) or ran out of memory"""
+
+
+class ExtractionFailed(ExtractionError):
+    """The job raised an ordinary exception, e.g. the document is corrupt"""
+
+
+def _worker_main(conn, memory_limit_mb: int, cpu_seconds: int) -> None:
+    """Worker loop: receive (func, args), send back ("ok" | "error" | "memory", payload)"""
+    if resource is not None and memory_limit_mb > 0:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+    while True:
+        try:
+            func, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        if resource is not None and cpu_seconds > 0:
+            # RLIMIT_CPU is cumulative, so move the soft limit past what earlier jobs used
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+            soft = int(usage.ru_utime + usage.ru_stime) + cpu_seconds
+            resource.setrlimit(resource.RLIMIT_CPU, (soft if hard == resource.RLIM_INFINITY else min(soft, hard), hard))
+        try:
+            conn.send(("ok", func(*args)))
+        except MemoryError:
+            conn.send(("memory", f"memory limit of {memory_limit_mb} MB exceeded"))
+            return
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class SandboxWorker:
+    """One worker process and the pipe used to send it jobs"""
+
+    def __init__(self, context, memory_limit_mb: int, cpu_seconds: int):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, memory_limit_mb, cpu_seconds), daemon=True)
+        self.process.start()
+        child.close()
+        self.jobs = 0
+
+    def run(self, func: Callable, args: tuple, timeout: float):
+        self.conn.send((func, args))
+        if not self.conn.poll(timeout):
+            raise ExtractionTimeout(f"extraction did not finish within {timeout:g}s")
+        try:
+            status, payload = self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(1)
+            raise ExtractionCrashed(f"extraction worker exited with code {self.process.exitcode}")
+        if status == "memory":
+            raise ExtractionCrashed(payload)
+        if status != "ok":
+            raise ExtractionFailed(payload)
+        self.jobs += 1
+        return payload
+
+    def close(self) -> None:
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1)
+
+
+class ExtractionSandbox:
+    """
+    Pool of isolated worker processes for parsing untrusted documents.
+    Each job runs under a memory cap, a CPU-time cap and a wall-clock timeout;
+    a worker that crashes, times out or runs out of memory is killed and replaced, and
+    healthy workers are recycled after `max_jobs` jobs. Functions and
+    arguments must be picklable (module-level functions).
+    """
+
+    def __init__(
+        self,
+        workers: int = EXTRACTION_WORKERS,
+        timeout: float = EXTRACTION_TIMEOUT,
+        memory_limit_mb: int = EXTRACTION_MEMORY_LIMIT_MB,
+        cpu_seconds: int = EXTRACTION_CPU_SECONDS,
+        max_jobs: int = EXTRACTION_MAX_JOBS_PER_WORKER,
+        enabled: bool = EXTRACTION_SANDBOX,
+    ):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_seconds = cpu_seconds
+        self.max_jobs = max_jobs
+        self.enabled = enabled
+        # spawn: the API process runs threads, which fork does not copy safely
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.LifoQueue[SandboxWorker]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="extraction")
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"jobs": 0, "failures": 0, "timeouts": 0, "crashes": 0, "started": 0, "recycled": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _checkout(self) -> SandboxWorker:
+        try:
+            worker = self._idle.get_nowait()
+            if worker.process.is_alive():
+                return worker
+            worker.close()
+        except queue.Empty:
+            pass
+        self._count("started")
+        return SandboxWorker(self._context, self.memory_limit_mb, self.cpu_seconds)
+
+    def run(self, func: Callable, *args):
+        """Run func(*args) in a worker process and return its result"""
+        if not self.enabled:
+            try:
+                return func(*args)
+            except Exception as e:
+                raise ExtractionFailed(f"{type(e).__name__}: {e}") from e
+        with span("sandbox.run", function=getattr(func, "__name__", str(func))), self._slots:
+            if self._closed:
+                raise ExtractionError("extraction sandbox is shut down")
+            worker = self._checkout()
+            self._count("jobs")
+            try:
+                result = worker.run(func, args, self.timeout)
+            except ExtractionFailed:
+                # The worker itself is fine, only the document was unreadable
+                self._count("failures")
+                self._idle.put(worker)
+                raise
+            except ExtractionError as e:
+                worker.close()
+                self._count("timeouts" if isinstance(e, ExtractionTimeout) else "crashes")
+                raise
+            except BaseException:
+                worker.close()
+                raise
+            if worker.jobs >= self.max_jobs or self._closed:
+                worker.close()
+                self._count("recycled")
+            else:
+                self._idle.put(worker)
+            return result
+
+    def warm_up(self) -> int:
+        """Spawn every worker ahead of the first upload; returns how many are ready"""
+        if not self.enabled or self._closed:
+            return 0
+        held = []
+        while len(held) < self.workers and self._slots.acquire(blocking=False):
+            held.append(self._checkout())
+        ready = 0
+        for worker in held:
+            try:
+                # A round trip proves the spawned interpreter has finished starting
+                worker.run(os.getpid, (), self.timeout)
+                self._idle.put(worker)
+                ready += 1
+            except ExtractionError:
+                worker.close()
+            finally:
+                self._slots.release()
+        return ready
+
+    def submit(self, func: Callable, *args) -> Future:
+        """Run func(*args) in a worker without blocking the caller"""
+        if not self.enabled:
+            future: Future = Future()
+            try:
+                future.set_result(self.run(func, *args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._executor.submit(contextvars.copy_context().run, self.run, func, *args)
+
+    def shutdown(self) -> None:
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "enabled": self.enabled,
+                "workers": self.workers,
+                "idle_workers": self._idle.qsize(),
+                "timeout_seconds": self.timeout,
+                "memory_limit_mb": self.memory_limit_mb,
+            }
+
+
+_sandbox: Optional[ExtractionSandbox] = None
+_sandbox_lock = threading.Lock()
+
+
+def get_sandbox() -> ExtractionSandbox:
+    """Shared extraction sandbox, created on first use"""
+    global _sandbox
+    with _sandbox_lock:
+        if _sandbox is None:
+            _sandbox = ExtractionSandbox()
+        return _sandbox
+
+
+def shutdown_sandbox() -> None:
+    """Stop the extraction workers (called on API shutdown)"""
+    global _sandbox
+    with _sandbox_lock:
+        sandbox, _sandbox = _sandbox, None
+    if sandbox is not None:
+        sandbox.shutdown()
@@ -1,30 +1,25 @@
 import os
-from dotenv import load_dotenv
-from llm_provider import get_chat_model
+from settings import load_settings
+from langchain_core.prompts import PromptTemplate
+from llm_provider import get_chat_model, invoke_model
+from question_stream import stream_question_blocks
+from mcq_repair import avoid_clause, is_complete
+from batch_generation import format_areas, generate_mcq_batches, plan_batches
+from structured_logging import get_logger
 
 # Load environment variables
-load_dotenv()
+load_settings()
+
+log = get_logger(__name__)
 
 # Get the model
 model = get_chat_model()
 
-def generate_aptitude_mcqs(job_role: str = "Software Engineer", num_questions: int = 10, difficulty: str = "moderate") -> dict:
-    """
-    Generate aptitude MCQ questions using OpenRouter API.
-    Falls back to predefined questions if API fails.
-    """
-    try:
-        if model:
-            print(f"🔄 Generating {num_questions} aptitude questions for {job_role} ({difficulty} difficulty)")
-            
-            prompt = f"""Create {num_questions} multiple-choice aptitude questions for a {job_role} position with {difficulty} difficulty.
+# Prompt template for aptitude assessment
+aptitude_assessment_template = """Create {num_questions} multiple-choice aptitude questions for a {job_role} position with {difficulty} difficulty.
 
 Cover these areas:
-1. Logical reasoning
-2. Numerical ability  
-3. Verbal reasoning
-4. Problem-solving
-5. Critical thinking
+{areas}
 
 For {difficulty} difficulty:
 - Easy: Basic concepts, straightforward questions
@@ -50,32 +45,64 @@ Explanation: [Brief explanation]
 
 Continue this format for all {num_questions} questions."""
 
-            # Generate questions using the model
-            response = model.invoke(prompt)
+# Topic areas; large requests split these across parallel batches
+APTITUDE_AREAS = [
+    "Logical reasoning",
+    "Numerical ability",
+    "Verbal reasoning",
+    "Problem-solving",
+    "Critical thinking",
+]
+
+aptitude_assessment_prompt = PromptTemplate(
+    input_variables=["job_role", "num_questions", "difficulty"],
+    partial_variables={"areas": format_areas(APTITUDE_AREAS)},
+    template=aptitude_assessment_template
+)
+
+def generate_aptitude_mcqs(job_role: str = "Software Engineer", num_questions: int = 10, difficulty: str = "moderate") -> dict:
+    """
+    Generate aptitude MCQ questions using OpenRouter API.
+    Falls back to predefined questions if API fails.
+    """
+    try:
+        if model:
+            log.info("Generating aptitude questions", job_role=job_role, num_questions=num_questions, difficulty=difficulty, sample=True)
             
-            if response and hasattr(response, 'content'):
-                content = response.content
-            elif isinstance(response, str):
-                content = response
-            else:
-                content = str(response)
+            def complete(count, areas, existing):
+                prompt = aptitude_assessment_prompt.format(
+                    job_role=job_role,
+                    num_questions=count,
+                    difficulty=difficulty,
+                    areas=format_areas(areas)
+                )
+                # Follow-ups for broken/missing questions are never cached, and only
+                # complete batches are, so a cache hit never triggers a repair call
+                if existing:
+                    return invoke_model(model, prompt + avoid_clause(existing), endpoint="general_aptitude_repair")
+                return invoke_model(model, prompt, endpoint="general_aptitude", validate=lambda content: is_complete(content, count))
+
+            # Generate questions using the model; large requests run as parallel batches
+            questions, report = generate_mcq_batches(num_questions, APTITUDE_AREAS, complete)
             
-            print("✅ AI questions generated successfully!")
+            log.info("AI questions generated", questions=len(questions), repaired=report["repaired"], sample=True)
             
+            # Same shape as the fallback questions; raw text only if parsing found nothing
             return {
-                "questions": content,
+                "questions": questions,
                 "job_role": job_role,
-                "total_questions": num_questions,
+                "total_questions": len(questions) if isinstance(questions, list) else num_questions,
                 "difficulty": difficulty,
+                "repaired_questions": report["repaired"],
                 "status": "success",
                 "source": "openrouter_ai"
             }
         else:
-            print("⚠️  Model not available, using fallback questions")
+            log.warning("No model available, using fallback questions")
             return get_fallback_questions(job_role, num_questions, difficulty)
             
     except Exception as e:
-        print(f"❌ Error generating questions: {e}")
+        log.exception("Aptitude question generation failed")
         return {
             "error": f"Error generating aptitude questions: {str(e)}",
             "status": "error"
@@ -126,6 +153,21 @@ def get_fallback_questions(job_role: str, num_questions: int, difficulty: str) -
         "source": "predefined"
     }
 
+async def stream_aptitude_mcqs(job_role: str = "Software Engineer", num_questions: int = 10, difficulty: str = "moderate"):
+    """Stream aptitude MCQs, yielding each question as soon as it is complete"""
+    log.info("Streaming aptitude questions", job_role=job_role, num_questions=num_questions, difficulty=difficulty, sample=True)
+    # Same batches as the non-streaming path; their questions are interleaved as they complete
+    prompts = [
+        aptitude_assessment_prompt.format(job_role=job_role, num_questions=count, difficulty=difficulty, areas=format_areas(focus))
+        for count, focus in plan_batches(num_questions, APTITUDE_AREAS)
+    ]
+    async for event in stream_question_blocks(
+        model, prompts, "mcq",
+        fallback=lambda: generate_aptitude_mcqs(job_role, num_questions, difficulty),
+        metadata={"job_role": job_role, "difficulty": difficulty}
+    ):
+        yield event
+
 if __name__ == "__main__":
     # Test the function
     result = generate_aptitude_mcqs("Software Engineer", 2, "moderate")
@@ -0,0 +1,106 @@
+import importlib
+import inspect
+import threading
+import time
+from types import ModuleType
+from typing import Callable, Dict, Iterable, List
+
+from metrics import instrument_generator
+from structured_logging import get_logger
+
+log = get_logger(__name__)
+
+# Modules behind the API routes, in warm-up order (most used first). Each one
+# pulls in LangChain and/or the document parsers and builds the model client.
+GENERATOR_MODULES = (
+    "technical_assessment",
+    "general_aptitude",
+    "resume_extraction",
+    "ats_score",
+    "resume_optimizer",
+    "domain_questions",
+    "communication_test",
+    "personality_assessment",
+    "linkedin_post_generator",
+    "resume_ranking",
+    "job_matching",
+)
+
+
+class GeneratorUnavailable(Exception):
+    """A generator module failed to import; its routes answer 503"""
+
+    def __init__(self, module: str, error: BaseException):
+        super().__init__(f"{module}: {error}")
+        self.module = module
+        self.error = error
+
+
+class GeneratorRegistry:
+    """
+    Imports the heavy generator modules on first use instead of at startup.
+    A failed import is remembered and reported, not retried on every request.
+    Attributes are looked up on each call, so patching a module still works.
+    """
+
+    def __init__(self, modules: Iterable[str] = GENERATOR_MODULES):
+        self.modules = tuple(modules)
+        self._loaded: Dict[str, ModuleType] = {}
+        self._errors: Dict[str, BaseException] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._locks = {name: threading.Lock() for name in self.modules}
+
+    def module(self, name: str) -> ModuleType:
+        loaded = self._loaded.get(name)
+        if loaded is not None:
+            return loaded
+        with self._locks.setdefault(name, threading.Lock()):
+            if name in self._loaded:
+                return self._loaded[name]
+            if name in self._errors:
+                raise GeneratorUnavailable(name, self._errors[name])
+            started = time.perf_counter()
+            try:
+                loaded = importlib.import_module(name)
+            except Exception as e:
+                log.exception("Generator module failed to import", module=name)
+                self._errors[name] = e
+                raise GeneratorUnavailable(name, e) from e
+            self._load_seconds[name] = round(time.perf_counter() - started, 3)
+            self._loaded[name] = loaded
+            log.info("Generator module loaded", module=name, seconds=self._load_seconds[name])
+            return loaded
+
+    def get(self, module: str, attr: str) -> Callable:
+        """module.attr; functions and async streams come back timed and counted by result status"""
+        func = getattr(self.module(module), attr)
+        if inspect.isgeneratorfunction(func) or not callable(func):
+            return func
+        return instrument_generator(f"{module}.{attr}", func)
+
+    def lazy(self, module: str, attr: str) -> Callable:
+        """A stand-in for module.attr that imports the module on its first call"""
+        def call(*args, **kwargs):
+            return self.get(module, attr)(*args, **kwargs)
+        call.__name__ = attr
+        return call
+
+    @property
+    def import_errors(self) -> List[str]:
+        return [f"{name}: {error}" for name, error in self._errors.items()]
+
+    def load_all(self) -> List[str]:
+        """Import every module not loaded yet (the warm-up's first step); returns the import errors"""
+        for name in self.modules:
+            try:
+                self.module(name)
+            except GeneratorUnavailable:
+                pass
+        return self.import_errors
+
+    def get_stats(self) -> dict:
+        return {
+            "loaded": dict(self._load_seconds),
+            "pending": [name for name in self.modules if name not in self._loaded and name not in self._errors],
+            "errors": self.import_errors,
+        }
@@ -0,0 +1,317 @@
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from resume_ranking import BM25_B, BM25_K1, tokenize
+from structured_logging import get_logger
+
+log = get_logger(__name__)
+
+# SQLite copy of the saved_jobs table (see saved_jobs_table.sql); unset means jobs are only pushed through the API
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "")
+# Seconds between re-reading the jobs table for new, changed and deleted rows
+JOBS_SYNC_INTERVAL = float(os.getenv("JOBS_SYNC_INTERVAL", "30"))
+# Resume terms used as the query, highest weighted first; the long tail barely moves the ranking
+JOB_MATCH_QUERY_TERMS = int(os.getenv("JOB_MATCH_QUERY_TERMS", "96"))
+# Job titles count this many times over a description word
+JOB_TITLE_WEIGHT = 3
+
+HTML_TAG = re.compile(r"<[^>]+>")
+
+
+def job_text(job_data: dict) -> str:
+    """Searchable text of a saved job's job_data (the shape /api/jobs returns)"""
+    title = job_data.get("title") or ""
+    fields = [title] * JOB_TITLE_WEIGHT + [
+        job_data.get("company") or "",
+        job_data.get("job_type") or "",
+        " ".join(job_data.get("tags") or []),
+        HTML_TAG.sub(" ", job_data.get("description") or ""),
+    ]
+    return "\n".join(fields)
+
+
+class JobIndex:
+    """
+    Inverted index over job descriptions, scored with BM25 against a resume.
+    Postings are appended as jobs are added and turned into NumPy arrays per
+    term on first use, so adding a job only invalidates its own terms.
+    Removed and replaced jobs are tombstoned and dropped from postings
+    lazily; the index is rebuilt once tombstones outnumber both the live
+    jobs and 1024.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+        self.stats = {"added": 0, "removed": 0, "queries": 0, "rebuilds": 0, "total_query_ms": 0.0}
+
+    def _reset(self) -> None:
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._jobs: List[Optional[dict]] = []
+        self._terms: List[Optional[Counter]] = []
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._df: Dict[str, int] = {}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._users: Dict[str, int] = {}
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._owners = np.zeros(1024, dtype=np.int32)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._live = 0
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def _grow(self) -> None:
+        size = len(self._lengths) * 2
+        for name in ("_lengths", "_owners", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros(size, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, job_id: str, job_data: dict, user_id: Optional[str] = None) -> None:
+        """Index a job, replacing any earlier version with the same id"""
+        terms = Counter(tokenize(job_text(job_data)))
+        with self._lock:
+            if job_id in self._slots:
+                self._remove(job_id)
+                self._compact()
+            slot = len(self._ids)
+            if slot == len(self._lengths):
+                self._grow()
+            self._slots[job_id] = slot
+            self._ids.append(job_id)
+            self._jobs.append(job_data)
+            self._terms.append(terms)
+            postings, df, arrays = self._postings, self._df, self._arrays
+            for term, tf in terms.items():
+                posting = postings.get(term)
+                if posting is None:
+                    posting = postings[term] = ([], [])
+                posting[0].append(slot)
+                posting[1].append(tf)
+                df[term] = df.get(term, 0) + 1
+                if term in arrays:
+                    del arrays[term]
+            length = sum(terms.values())
+            self._lengths[slot] = length
+            self._owners[slot] = self._users.setdefault(user_id or "", len(self._users))
+            self._alive[slot] = True
+            self._live += 1
+            self._total_length += length
+            self.stats["added"] += 1
+
+    def add_many(self, jobs: Iterable[Tuple[str, dict, Optional[str]]]) -> None:
+        for job_id, job_data, user_id in jobs:
+            self.add(job_id, job_data, user_id)
+
+    def job_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._slots)
+
+    def remove(self, job_id: str) -> bool:
+        with self._lock:
+            if job_id not in self._slots:
+                return False
+            self._remove(job_id)
+            self._compact()
+            return True
+
+    def _remove(self, job_id: str) -> None:
+        slot = self._slots.pop(job_id)
+        for term in self._terms[slot]:
+            self._df[term] -= 1
+            self._arrays.pop(term, None)
+        self._ids[slot] = self._jobs[slot] = self._terms[slot] = None
+        self._alive[slot] = False
+        self._live -= 1
+        self._total_length -= int(self._lengths[slot])
+        self.stats["removed"] += 1
+
+    def _compact(self) -> None:
+        if len(self._ids) - self._live > max(self._live, 1024):
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        users = {code: user for user, code in self._users.items()}
+        live = [(job_id, self._jobs[slot], users[int(self._owners[slot])]) for job_id, slot in self._slots.items()]
+        self._reset()
+        stats = dict(self.stats)
+        self.add_many(live)
+        self.stats = {**stats, "rebuilds": stats["rebuilds"] + 1}
+
+    def _posting_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            slots, tfs = self._postings[term]
+            slot_array = np.asarray(slots, dtype=np.int32)
+            tf_array = np.asarray(tfs, dtype=np.float32)
+            keep = self._alive[slot_array]
+            if not keep.all():
+                # Drop tombstoned postings for good
+                slot_array, tf_array = slot_array[keep], tf_array[keep]
+                self._postings[term] = (slot_array.tolist(), tf_array.astype(int).tolist())
+            arrays = self._arrays[term] = (slot_array, tf_array)
+        return arrays
+
+    def _query_terms(self, resume_text: str) -> List[Tuple[str, float]]:
+        """Resume terms with their query weight (IDF x damped frequency), strongest first"""
+        counts = Counter(tokenize(resume_text))
+        n = self._live
+        weighted = []
+        for term, tf in counts.items():
+            df = self._df.get(term, 0)
+            if df:
+                idf = math.log1p((n - df + 0.5) / (df + 0.5))
+                weighted.append((term, idf * (1 + math.log(tf))))
+        weighted.sort(key=lambda item: -item[1])
+        return weighted[:JOB_MATCH_QUERY_TERMS]
+
+    def search(self, resume_text: str, top_k: int = 10, user_id: Optional[str] = None) -> List[dict]:
+        """Top `top_k` jobs for a resume, optionally only the jobs one user saved"""
+        started = time.perf_counter()
+        with self._lock:
+            size = len(self._ids)
+            if not self._live or top_k <= 0:
+                return []
+            query = self._query_terms(resume_text)
+            lengths = self._lengths[:size]
+            length_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / (self._total_length / self._live))
+            scores = np.zeros(size, dtype=np.float32)
+            for term, weight in query:
+                slots, tfs = self._posting_arrays(term)
+                scores[slots] += weight * tfs * (BM25_K1 + 1) / (tfs + length_norm[slots])
+
+            if user_id is not None:
+                if user_id not in self._users:
+                    return []
+                scores[self._owners[:size] != self._users[user_id]] = 0
+            candidates = np.flatnonzero(scores > 0)
+            # Same posting saved by several users: keep extra candidates to fill top_k after de-duplication
+            take = min(len(candidates), top_k * 3 if user_id is None else top_k)
+            best = candidates[np.argpartition(-scores[candidates], take - 1)[:take]] if take else candidates
+            best = best[np.argsort(-scores[best], kind="stable")]
+
+            results, seen = [], set()
+            for slot in best:
+                job = self._jobs[slot]
+                key = job.get("url") or self._ids[slot]
+                if key in seen:
+                    continue
+                seen.add(key)
+                terms = self._terms[slot]
+                results.append({
+                    "job_id": self._ids[slot],
+                    "score": round(float(scores[slot]), 3),
+                    "matched_terms": [term for term, _ in query if term in terms][:10],
+                    "job": job,
+                })
+                if len(results) == top_k:
+                    break
+            self.stats["queries"] += 1
+            self.stats["total_query_ms"] += (time.perf_counter() - started) * 1000
+            return results
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                **{k: v for k, v in self.stats.items() if k != "total_query_ms"},
+                "avg_query_ms": round(self.stats["total_query_ms"] / self.stats["queries"], 2) if self.stats["queries"] else 0.0,
+                "jobs": self._live,
+                "terms": sum(1 for df in self._df.values() if df),
+                "tombstones": len(self._ids) - self._live,
+            }
+
+
+class SavedJobsSync:
+    """
+    Keeps a JobIndex in step with a saved_jobs table: rows whose updated_at
+    moved past the last sync are (re-)indexed and rows that disappeared are
+    removed. Only jobs that came from the table are removed, so jobs pushed
+    through the API stay indexed. Works on a SQLite copy of the table with
+    the same columns.
+    """
+
+    def __init__(self, index: JobIndex, path: str = JOBS_DB_PATH, interval: float = JOBS_SYNC_INTERVAL):
+        self.index = index
+        self.path = path
+        self.interval = interval
+        self._watermark = ""
+        # Ids already applied at the watermark's updated_at
+        self._at_watermark: set = set()
+        self._last_sync = 0.0
+        self._synced: set = set()
+        self._lock = threading.Lock()
+
+    def sync(self, force: bool = False) -> int:
+        """Apply changes since the last sync; returns the number of rows (re-)indexed"""
+        if not self.path:
+            return 0
+        with self._lock:
+            if not force and time.monotonic() - self._last_sync < self.interval:
+                return 0
+            self._last_sync = time.monotonic()
+            db = sqlite3.connect(self.path)
+            try:
+                # >= so rows sharing the watermark's timestamp but committed after the last sync are not missed
+                rows = db.execute(
+                    "SELECT id, user_id, job_data, updated_at FROM saved_jobs WHERE updated_at >= ? ORDER BY updated_at",
+                    (self._watermark,),
+                ).fetchall()
+                ids = {row[0] for row in db.execute("SELECT id FROM saved_jobs")}
+            finally:
+                db.close()
+            indexed = 0
+            for job_id, user_id, job_data, updated_at in rows:
+                if updated_at == self._watermark and job_id in self._at_watermark:
+                    continue
+                if updated_at != self._watermark:
+                    self._watermark, self._at_watermark = updated_at, set()
+                self._at_watermark.add(job_id)
+                try:
+                    data = json.loads(job_data)
+                except (TypeError, ValueError) as e:
+                    log.warning("Skipping saved job with invalid job_data", job_id=job_id, error=str(e))
+                    continue
+                if not isinstance(data, dict):
+                    log.warning("Skipping saved job whose job_data is not an object", job_id=job_id)
+                    continue
+                self.index.add(job_id, data, user_id)
+                self._synced.add(job_id)
+                indexed += 1
+            for job_id in self._synced - ids:
+                self.index.remove(job_id)
+            self._synced &= ids
+            if indexed:
+                log.info("Job index synced", updated=indexed, indexed=len(self.index))
+            return indexed
+
+
+job_index = JobIndex()
+saved_jobs_sync = SavedJobsSync(job_index)
+
+
+def match_jobs(resume_text: str, top_k: int = 10, user_id: Optional[str] = None) -> dict:
+    """Top-k indexed jobs for a resume's text"""
+    try:
+        saved_jobs_sync.sync()
+    except sqlite3.Error as e:
+        log.warning("Job index sync failed, using the current index", error=str(e))
+    matches = job_index.search(resume_text, top_k=top_k, user_id=user_id)
+    return {
+        "status": "success",
+        "source": "local_job_index",
+        "indexed_jobs": len(job_index),
+        "matches": matches,
+    }
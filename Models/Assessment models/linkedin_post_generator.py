@@ -3,10 +3,14 @@ import requests
 from typing import Optional, Dict, Any
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from dotenv import load_dotenv
-from llm_provider import get_chat_model
+from settings import load_settings
+from llm_provider import get_chat_model, invoke_model
+from tracing import http_request, span
+from structured_logging import get_logger
 
-load_dotenv()
+load_settings()
+
+log = get_logger(__name__)
 
 # Initialize model using OpenRouter
 model = get_chat_model()
@@ -46,12 +50,13 @@ def exchange_code_for_token(authorization_code: str) -> Dict[str, Any]:
     }
     
     try:
-        response = requests.post(token_url, data=data)
+        response = http_request("POST", token_url, data=data)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
         return {"error": f"Failed to exchange code for token: {str(e)}"}
 
+@span("linkedin.get_user_profile")
 def get_user_profile(access_token: str) -> Dict[str, Any]:
     """Get user's LinkedIn profile information"""
     headers = {
@@ -60,7 +65,8 @@ def get_user_profile(access_token: str) -> Dict[str, Any]:
     }
     
     try:
-        response = requests.get(
+        response = http_request(
+            "GET",
             "https://api.linkedin.com/v2/me",
             headers=headers
         )
@@ -69,6 +75,7 @@ def get_user_profile(access_token: str) -> Dict[str, Any]:
     except requests.exceptions.RequestException as e:
         return {"error": f"Failed to get profile: {str(e)}"}
 
+@span("linkedin.post_to_linkedin")
 def post_to_linkedin(access_token: str, post_content: str) -> Dict[str, Any]:
     """Post content directly to LinkedIn"""
     headers = {
@@ -102,7 +109,8 @@ def post_to_linkedin(access_token: str, post_content: str) -> Dict[str, Any]:
     }
     
     try:
-        response = requests.post(
+        response = http_request(
+            "POST",
             "https://api.linkedin.com/v2/ugcPosts",
             headers=headers,
             json=post_data
@@ -112,6 +120,7 @@ def post_to_linkedin(access_token: str, post_content: str) -> Dict[str, Any]:
     except requests.exceptions.RequestException as e:
         return {"error": f"Failed to post to LinkedIn: {str(e)}"}
 
+@span("linkedin.generate_linkedin_post")
 def generate_linkedin_post(
     post_type: str = "Professional Insight",
     topic: str = "Career Development", 
@@ -120,7 +129,7 @@ def generate_linkedin_post(
     """
     Generate a LinkedIn post using AI
     """
-    print(f"🔄 Generating LinkedIn post: {post_type} about {topic}")
+    log.info("Generating LinkedIn post", post_type=post_type, topic=topic, sample=True)
     
     try:
         if model:
@@ -165,22 +174,21 @@ def generate_linkedin_post(
                     topic=topic,
                     post_description=post_description
                 )
-                result = model.invoke(prompt)
+                content = invoke_model(model, prompt, endpoint="linkedin_post")
                 
-                print("✅ AI LinkedIn post generated successfully!")
+                log.info("AI LinkedIn post generated", sample=True)
                 
                 return {
-                    "post_content": result.content,
+                    "post_content": content,
                     "source": "openrouter_ai",
                     "post_type": post_type,
                     "topic": topic,
                     "status": "success"
                 }
             except Exception as ai_error:
-                print(f"❌ AI generation failed: {ai_error}")
-                print("🔄 Falling back to template post...")
+                log.warning("AI generation failed, using template post", error=str(ai_error))
         else:
-            print("⚠️ No model available, using template post...")
+            log.warning("No model available, using template post")
         
         # Enhanced fallback template posts
         fallback_posts = {
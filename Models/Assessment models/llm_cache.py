@@ -0,0 +1,196 @@
+import contextvars
+import hashlib
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+# Endpoints whose completions may be cached (comma-separated). Resume-based
+# endpoints are left out by default: their prompts embed personal documents.
+DEFAULT_CACHED_ENDPOINTS = "technical_assessment,general_aptitude,communication_test,personality_assessment"
+
+LLM_CACHE_ENDPOINTS = {
+    e.strip() for e in os.getenv("LLM_CACHE_ENDPOINTS", DEFAULT_CACHED_ENDPOINTS).split(",") if e.strip()
+}
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(tempfile.gettempdir(), "talento_llm_cache.sqlite3"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+LLM_CACHE_VARIANTS = int(os.getenv("LLM_CACHE_VARIANTS", "3"))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+LLM_CACHE_DISK_ENTRIES = int(os.getenv("LLM_CACHE_DISK_ENTRIES", "5000"))
+
+# Set while the question pool refills: pooled sets must be fresh generations, not copies of cached variants
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_cache():
+    """Neither read nor fill the response cache inside the block (or in work it hands to batch threads)"""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def cache_bypassed() -> bool:
+    return _bypass.get()
+
+
+def make_cache_key(endpoint: str, model_name: str, prompt: str) -> str:
+    """Stable key for a prompt; role, difficulty and count are already part of the prompt text"""
+    return hashlib.sha256(f"{endpoint}\0{model_name}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-level cache of model completions: an in-memory LRU in front of SQLite.
+    Each key holds up to `variants` completions. Until that many are stored a
+    lookup is a miss (so a fresh completion gets generated and added); after
+    that a random stored variant is served, so repeated requests still vary.
+    The cache covers live requests for any role; the question pool, which
+    bypasses it, supplies variety for the hottest combinations.
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl: float = LLM_CACHE_TTL,
+        variants: int = LLM_CACHE_VARIANTS,
+        memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        disk_entries: int = LLM_CACHE_DISK_ENTRIES,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.variants = max(1, variants)
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._memory: "OrderedDict[str, List[Tuple[float, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT NOT NULL,
+                    variant INTEGER NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    completion TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (key, variant)
+                )"""
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+            self._db.commit()
+        return self._db
+
+    def _fresh(self, entries: List[Tuple[float, str]], now: float) -> List[Tuple[float, str]]:
+        return [(created, text) for created, text in entries if now - created < self.ttl]
+
+    def _remember(self, key: str, entries: List[Tuple[float, str]]) -> None:
+        self._memory[key] = entries
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a random stored variant once the key has a full set, else None"""
+        now = time.time()
+        with self._lock:
+            entries = self._fresh(self._memory.get(key, []), now)
+            source = "memory_hits"
+            if len(entries) < self.variants:
+                db = self._connection()
+                db.execute("DELETE FROM llm_cache WHERE key = ? AND created_at <= ?", (key, now - self.ttl))
+                rows = db.execute(
+                    "SELECT created_at, completion FROM llm_cache WHERE key = ? ORDER BY variant", (key,)
+                ).fetchall()
+                entries = [(created, text) for created, text in rows]
+                source = "disk_hits"
+                if entries:
+                    db.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+                db.commit()
+            if entries:
+                self._remember(key, entries)
+            if len(entries) < self.variants:
+                self.stats["misses"] += 1
+                return None
+            self.stats[source] += 1
+            return random.choice(entries)[1]
+
+    def add(self, key: str, endpoint: str, completion: str) -> None:
+        """Store a new completion as one of the key's variants"""
+        now = time.time()
+        with self._lock:
+            db = self._connection()
+            # Expired variants go first (same transaction), so their numbers cannot collide with the new one
+            db.execute("DELETE FROM llm_cache WHERE key = ? AND created_at <= ?", (key, now - self.ttl))
+            stored, variant = db.execute(
+                "SELECT COUNT(*), COALESCE(MAX(variant), -1) + 1 FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if stored >= self.variants:
+                db.commit()
+                return
+            self._remember(key, self._fresh(self._memory.get(key, []), now) + [(now, completion)])
+            db.execute(
+                "INSERT INTO llm_cache (key, variant, endpoint, completion, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, variant, endpoint, completion, now, now),
+            )
+            self.stats["stores"] += 1
+            overflow = db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.disk_entries
+            if overflow > 0:
+                db.execute(
+                    "DELETE FROM llm_cache WHERE rowid IN (SELECT rowid FROM llm_cache ORDER BY last_access LIMIT ?)",
+                    (overflow,),
+                )
+                self.stats["evictions"] += overflow
+            db.commit()
+
+    def preload(self) -> int:
+        """Load the most recently used fresh entries from disk into memory; returns keys loaded"""
+        now = time.time()
+        with self._lock:
+            rows = self._connection().execute(
+                """SELECT key, created_at, completion FROM llm_cache
+                   WHERE created_at > ? AND key IN (
+                       SELECT key FROM llm_cache GROUP BY key ORDER BY MAX(last_access) DESC LIMIT ?
+                   )
+                   ORDER BY last_access, key, variant""",
+                (now - self.ttl, self.memory_entries),
+            ).fetchall()
+            loaded: "OrderedDict[str, List[Tuple[float, str]]]" = OrderedDict()
+            for key, created, text in rows:
+                loaded.setdefault(key, []).append((created, text))
+            for key, entries in loaded.items():
+                if key not in self._memory:
+                    self._remember(key, entries)
+            return len(loaded)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._connection().execute("DELETE FROM llm_cache")
+            self._db.commit()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            lookups = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "hits": hits,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "variants_per_key": self.variants,
+                "ttl_seconds": self.ttl,
+                "endpoints": sorted(LLM_CACHE_ENDPOINTS),
+            }
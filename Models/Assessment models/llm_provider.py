@@ -1,53 +1,186 @@
 import os
-from typing import Optional
-from dotenv import load_dotenv
-
-# Load environment variables from current directory first, then from parent directories
-load_dotenv()
-load_dotenv('.env')
-load_dotenv('../../.env')
-
-# Debug: Print current working directory and check for .env files
-print(f"Current working directory: {os.getcwd()}")
-print(f"Local .env exists: {os.path.exists('.env')}")
-print(f"Root .env exists: {os.path.exists('../../.env')}")
-
-# Try importing LangChain OpenAI
-try:
-    from langchain_openai import ChatOpenAI
-    print("✅ LangChain OpenAI imported successfully")
-except ImportError as e:
-    print(f"❌ LangChain OpenAI import failed: {e}")
-    ChatOpenAI = None
+import threading
+import time
+from typing import Callable, Optional
+from settings import load_settings
+from llm_cache import LLMResponseCache, LLM_CACHE_ENDPOINTS, cache_bypassed, make_cache_key
+from prompt_compaction import count_tokens, prompt_stats
+from metrics import llm_requests, stage
+from structured_logging import get_logger
+from tracing import ainject_httpx, inject_httpx
+
+# Load environment variables (.env in the working directory, this service, the repository root)
+load_settings()
+
+log = get_logger(__name__)
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_MODEL = "microsoft/phi-3-mini-128k-instruct"
+
+# Connection pool and timeouts shared by every request to OpenRouter
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "60"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "120"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "1"))
+
+_model = None
+_http_client = None
+_model_lock = threading.Lock()
+
+
+def _load_chat_openai():
+    """
+    Import LangChain's ChatOpenAI. This is the slowest import in the service,
+    so it happens when the model is first needed, not when this module loads.
+    """
+    try:
+        from langchain_openai import ChatOpenAI
+        from langchain_core.caches import BaseCache  # noqa: F401 - needed by model_rebuild()
+        from langchain_core.callbacks import Callbacks  # noqa: F401 - needed by model_rebuild()
+        # langchain-core 0.3.x leaves ChatOpenAI partially defined under pydantic 2.11
+        ChatOpenAI.model_rebuild()
+        log.info("LangChain OpenAI imported")
+        return ChatOpenAI
+    except ImportError as e:
+        log.error("LangChain OpenAI import failed", error=str(e))
+        return None
+
+
+def _build_http_clients():
+    """Create the sync/async HTTP clients with a keep-alive pool and explicit timeouts"""
+    import httpx
+
+    timeout = httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+    limits = httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE,
+        keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+    )
+    return (
+        # The hooks add the current request's traceparent to every model API call
+        httpx.Client(timeout=timeout, limits=limits, event_hooks={"request": [inject_httpx]}),
+        httpx.AsyncClient(timeout=timeout, limits=limits, event_hooks={"request": [ainject_httpx]}),
+        timeout,
+    )
+
 
 def get_chat_model() -> Optional[object]:
     """
-    Get OpenRouter chat model for question generation.
+    Get the shared OpenRouter chat model for question generation.
+    The model and its HTTP connection pool are created once per process.
     Returns None if API key is not available.
     """
-    # OpenRouter API key
-    openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
-    print(f"API key found: {openrouter_api_key is not None}")
-    if openrouter_api_key:
-        print(f"API key preview: {openrouter_api_key[:15]}...")
-    
-    if openrouter_api_key and ChatOpenAI is not None:
+    global _model, _http_client
+    if _model is not None:
+        return _model
+
+    with _model_lock:
+        if _model is not None:
+            return _model
+
+        # OpenRouter API key
+        openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
+
+        ChatOpenAI = _load_chat_openai() if openrouter_api_key else None
+        if openrouter_api_key and ChatOpenAI is not None:
+            try:
+                http_client, http_async_client, timeout = _build_http_clients()
+                _model = ChatOpenAI(
+                    api_key=openrouter_api_key,
+                    base_url=OPENROUTER_BASE_URL,
+                    model=OPENROUTER_MODEL,
+                    temperature=0.7,
+                    max_tokens=2000,
+                    timeout=timeout,
+                    max_retries=LLM_MAX_RETRIES,
+                    http_client=http_client,
+                    http_async_client=http_async_client,
+                )
+                _http_client = http_client
+                log.info("OpenRouter model initialized", model=OPENROUTER_MODEL)
+                return _model
+            except Exception as e:
+                log.exception("OpenRouter initialization failed")
+                return None
+
+        log.warning("No OpenRouter model: API key missing or ChatOpenAI unavailable", api_key_set=bool(openrouter_api_key))
+        return None
+
+
+def warm_connection() -> Optional[int]:
+    """
+    Open a keep-alive connection to OpenRouter (DNS, TCP, TLS) before the
+    first real request needs it. Returns the HTTP status, or None without a model.
+    """
+    if get_chat_model() is None or _http_client is None:
+        return None
+    response = _http_client.get(f"{OPENROUTER_BASE_URL}/models", timeout=LLM_CONNECT_TIMEOUT * 2)
+    return response.status_code
+
+
+_response_cache = None
+
+
+def get_response_cache() -> LLMResponseCache:
+    """Return the process-wide LLM response cache"""
+    global _response_cache
+    if _response_cache is None:
+        with _model_lock:
+            if _response_cache is None:
+                _response_cache = LLMResponseCache()
+    return _response_cache
+
+
+def invoke_model(model, prompt: str, endpoint: Optional[str] = None, validate: Optional[Callable[[str], bool]] = None) -> str:
+    """
+    Run a prompt through the chat model and return the completion text.
+    Endpoints listed in LLM_CACHE_ENDPOINTS are served from the response cache
+    unless it is bypassed (see llm_cache.bypass_cache). With `validate`, only completions it accepts are cached or served from
+    the cache, so a cache hit never needs follow-up work.
+    """
+    key = None
+    if endpoint in LLM_CACHE_ENDPOINTS and not cache_bypassed():
+        key = make_cache_key(endpoint, getattr(model, "model_name", ""), prompt)
+        try:
+            with stage("llm_cache", endpoint=endpoint) as lookup:
+                cached = get_response_cache().get(key)
+                if lookup is not None:
+                    lookup.set_attribute("cache.hit", cached is not None)
+            if cached is not None and (validate is None or validate(cached)):
+                llm_requests.inc(endpoint=endpoint, result="cache_hit")
+                log.info("LLM completion served from cache", endpoint=endpoint, cache="hit", sample=True)
+                return cached
+        except Exception as e:
+            log.warning("LLM cache lookup failed", endpoint=endpoint, error=str(e))
+            key = None
+
+    tokens = count_tokens(prompt)
+    if endpoint:
+        prompt_stats.record_prompt(endpoint, tokens)
+    cache = "miss" if key else "off"
+    started = time.perf_counter()
+    try:
+        with stage("llm", kind="CLIENT", endpoint=endpoint or "", model=getattr(model, "model_name", ""), prompt_tokens=tokens):
+            response = model.invoke(prompt)
+    except Exception as e:
+        llm_requests.inc(endpoint=endpoint or "", result="error")
+        log.warning("LLM call failed", endpoint=endpoint, cache=cache, prompt_tokens=tokens,
+                    duration_ms=round((time.perf_counter() - started) * 1000, 1), error=str(e))
+        raise
+    llm_requests.inc(endpoint=endpoint or "", result="success")
+    content = response.content if hasattr(response, "content") else str(response)
+    log.info("LLM completion", endpoint=endpoint, cache=cache, prompt_tokens=tokens,
+             duration_ms=round((time.perf_counter() - started) * 1000, 1), sample=True)
+
+    if key and content and (validate is None or validate(content)):
         try:
-            model = ChatOpenAI(
-                api_key=openrouter_api_key,
-                base_url="https://openrouter.ai/api/v1",
-                model="microsoft/phi-3-mini-128k-instruct",
-                temperature=0.7,
-                max_tokens=2000,
-            )
-            print("✅ OpenRouter model initialized successfully")
-            return model
+            get_response_cache().add(key, endpoint, content)
         except Exception as e:
-            print(f"❌ OpenRouter initialization failed: {e}")
-            return None
-    
-    print("❌ No OpenRouter API key found or ChatOpenAI not available")
-    return None
+            log.warning("LLM cache store failed", endpoint=endpoint, error=str(e))
+    return content
+
 
 if __name__ == "__main__":
     model = get_chat_model()
@@ -60,4 +193,4 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"Test call failed: {e}")
     else:
-        print("❌ Model initialization failed!")
\ No newline at end of file
+        print("❌ Model initialization failed!")
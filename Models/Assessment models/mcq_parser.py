@@ -0,0 +1,140 @@
+import re
+from typing import List, Optional
+
+from metrics import stage
+
+# Line patterns, applied after stripping leading markdown emphasis/bullets
+QUESTION_LINE = re.compile(r"Q(?:uestion)?\s*(\d+)\s*[.:)]\s*(.*)", re.IGNORECASE)
+OPTION_LINE = re.compile(r"\(?([A-Da-d])\s*(?:\)|[.:](?=\s))\s*(.*)")
+ANSWER_LINE = re.compile(r"Correct\s+Answer\s*[:\-]?\s*(.*)", re.IGNORECASE)
+EXPLANATION_LINE = re.compile(r"Explanation\s*[:\-]?\s*(.*)", re.IGNORECASE)
+ANSWER_LETTER = re.compile(r"(?:Option\s+)?[(\[]?([A-Da-d])(?:\s*[).:\]]|\s*$|\s+)", re.IGNORECASE)
+
+LETTERS = "ABCD"
+
+
+def _clean(text: str) -> str:
+    return text.replace("**", "").strip()
+
+
+class IncrementalMCQParser:
+    """
+    Single-pass parser for model output in the
+    "Q1. ... A) ... Correct Answer: B / Explanation: ..." format.
+
+    Text can be fed in arbitrary chunks; feed() returns each question as soon
+    as it is complete (its explanation followed by a blank line, or the next
+    question starting). Questions use the same shape as the predefined
+    fallback questions: {question, options, correct_answer, explanation}.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._current: Optional[dict] = None
+        self._field: Optional[str] = None
+        self._answer_raw = ""
+
+    def feed(self, chunk: str) -> List[dict]:
+        """Add a chunk of model output and return the questions it completed"""
+        self._pending += chunk
+        if "\n" not in chunk:
+            return []
+        *lines, self._pending = self._pending.split("\n")
+        completed = []
+        for line in lines:
+            question = self._consume_line(line)
+            if question:
+                completed.append(question)
+        return completed
+
+    def close(self) -> List[dict]:
+        """Finish parsing and return any remaining question"""
+        completed = []
+        if self._pending:
+            question = self._consume_line(self._pending)
+            self._pending = ""
+            if question:
+                completed.append(question)
+        question = self._finish()
+        if question:
+            completed.append(question)
+        return completed
+
+    def _consume_line(self, raw: str) -> Optional[dict]:
+        line = raw.strip().lstrip("*#-• ").strip()
+        if not line:
+            # A blank line after the explanation closes the question
+            return self._finish() if self._field == "explanation" else None
+
+        first = line[0].upper()
+        if first == "Q":
+            match = QUESTION_LINE.match(line)
+            if match:
+                finished = self._finish()
+                self._current = {"question": _clean(match.group(2)), "options": [], "correct_answer": "", "explanation": ""}
+                self._field = "question"
+                return finished
+        if self._current is None:
+            # Preamble before the first question
+            return None
+        if first == "C":
+            match = ANSWER_LINE.match(line)
+            if match:
+                self._answer_raw = _clean(match.group(1))
+                self._field = "answer"
+                return None
+        if first == "E":
+            match = EXPLANATION_LINE.match(line)
+            if match:
+                self._current["explanation"] = _clean(match.group(1))
+                self._field = "explanation"
+                return None
+        if first in LETTERS or first == "(":
+            match = OPTION_LINE.match(line)
+            if match and self._field in ("question", "options"):
+                self._current["options"].append(_clean(match.group(2)))
+                self._field = "options"
+                return None
+
+        # Continuation of whichever field is open
+        text = _clean(line)
+        if self._field == "question":
+            self._current["question"] = f"{self._current['question']} {text}".strip()
+        elif self._field == "options" and self._current["options"]:
+            self._current["options"][-1] = f"{self._current['options'][-1]} {text}"
+        elif self._field == "answer" and not self._answer_raw:
+            self._answer_raw = text
+        elif self._field == "explanation":
+            self._current["explanation"] = f"{self._current['explanation']} {text}".strip()
+        return None
+
+    def _finish(self) -> Optional[dict]:
+        question = self._current
+        if question is not None:
+            question["correct_answer"] = self._resolve_answer(question["options"], self._answer_raw)
+        self._current = None
+        self._field = None
+        self._answer_raw = ""
+        return question
+
+    @staticmethod
+    def _resolve_answer(options: List[str], raw: str) -> str:
+        """Turn "B", "B) 42" or the option text itself into the option text"""
+        if not raw:
+            return ""
+        lowered = raw.lower()
+        for option in options:
+            if option.lower() == lowered:
+                return option
+        match = ANSWER_LETTER.match(raw)
+        if match:
+            index = LETTERS.index(match.group(1).upper())
+            return options[index] if index < len(options) else ""
+        return ""
+
+
+@stage("parse")
+def parse_mcqs(text: str) -> List[dict]:
+    """Parse a complete model response into structured question objects"""
+    parser = IncrementalMCQParser()
+    return parser.feed(text + "\n") + parser.close()
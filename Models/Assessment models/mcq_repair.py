@@ -0,0 +1,101 @@
+import os
+import re
+from typing import Callable, List, Tuple
+
+from mcq_parser import parse_mcqs
+from structured_logging import get_logger
+
+log = get_logger(__name__)
+
+# Follow-up prompts allowed per request to replace broken or missing questions
+MCQ_REPAIR_ROUNDS = int(os.getenv("MCQ_REPAIR_ROUNDS", "1"))
+
+_NON_WORD = re.compile(r"\W+")
+
+
+def normalize_question(text: str) -> str:
+    """Key used to spot duplicate questions regardless of case/punctuation"""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def validate_question(question: dict) -> List[str]:
+    """Return the problems with a parsed MCQ (empty list if it is well-formed)"""
+    problems = []
+    if not question.get("question", "").strip():
+        problems.append("missing question text")
+    options = question.get("options", [])
+    if len(options) != 4:
+        problems.append(f"expected 4 options, got {len(options)}")
+    elif len({normalize_question(o) for o in options}) != 4:
+        problems.append("duplicate options")
+    answer = question.get("correct_answer", "")
+    if not answer:
+        problems.append("missing or unresolvable correct answer")
+    elif answer not in options:
+        problems.append("correct answer is not one of the options")
+    return problems
+
+
+def is_complete(content: str, num_questions: int) -> bool:
+    """True if raw model output holds `num_questions` distinct well-formed MCQs (nothing to repair)"""
+    keys = {normalize_question(q.get("question", "")) for q in parse_mcqs(content) if not validate_question(q)}
+    return len(keys) >= num_questions
+
+
+def avoid_clause(questions: List[dict]) -> str:
+    """Prompt suffix listing questions the follow-up must not repeat"""
+    if not questions:
+        return ""
+    listed = "\n".join(f"- {q['question']}" for q in questions)
+    return f"\nDo not repeat any of these existing questions:\n{listed}\n"
+
+
+def repair_questions(
+    questions: List[dict],
+    num_questions: int,
+    regenerate: Callable[[int, List[dict]], str],
+    max_rounds: int = MCQ_REPAIR_ROUNDS,
+) -> Tuple[List[dict], dict]:
+    """
+    Keep every well-formed question and ask the model only for the shortfall.
+
+    `regenerate(count, existing)` must return raw model output with `count`
+    new questions that avoid `existing`. Returns the merged questions (at most
+    `num_questions`) and a small report of what was repaired.
+    """
+    valid, seen = [], set()
+    for question in questions:
+        key = normalize_question(question.get("question", ""))
+        if not validate_question(question) and key not in seen:
+            seen.add(key)
+            valid.append(question)
+    report = {"invalid": len(questions) - len(valid), "requested": 0, "repaired": 0, "rounds": 0}
+
+    while len(valid) < num_questions and report["rounds"] < max_rounds:
+        missing = num_questions - len(valid)
+        report["rounds"] += 1
+        report["requested"] += missing
+        try:
+            replacements = parse_mcqs(regenerate(missing, valid))
+        except Exception as e:
+            log.warning("Question repair failed", error=str(e), missing=missing)
+            break
+        for question in replacements:
+            key = normalize_question(question.get("question", ""))
+            if len(valid) < num_questions and not validate_question(question) and key not in seen:
+                seen.add(key)
+                valid.append(question)
+                report["repaired"] += 1
+
+    return valid[:num_questions], report
+
+
+def parse_and_repair(content: str, num_questions: int, regenerate: Callable[[int, List[dict]], str]) -> Tuple[List[dict], dict]:
+    """
+    Parse a model response and repair it. Output that does not parse at all is
+    left alone (the caller returns the raw text) rather than fully regenerated.
+    """
+    parsed = parse_mcqs(content)
+    if not parsed:
+        return [], {"invalid": 0, "requested": 0, "repaired": 0, "rounds": 0}
+    return repair_questions(parsed, num_questions, regenerate)
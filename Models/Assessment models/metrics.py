@@ -0,0 +1,333 @@
+import contextvars
+import inspect
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from structured_logging import bind, get_logger
+from tracing import span
+
+log = get_logger(__name__)
+
+# Latency histogram bucket bounds in seconds (comma-separated); LLM round trips need the long tail
+METRICS_BUCKETS = tuple(
+    float(b) for b in os.getenv("METRICS_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30,60").split(",")
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Generator arguments copied into the log context of each call
+GENERATOR_LOG_ARGUMENTS = ("job_role", "num_questions", "difficulty", "assessment_focus", "post_type", "top_k")
+
+# Route template of the request being served; worker threads inherit it via run_blocking
+current_route: contextvars.ContextVar[str] = contextvars.ContextVar("current_route", default="background")
+
+LabelValues = Tuple[str, ...]
+# A collector returns (name, kind, help, [(labels, value), ...]) families read at scrape time
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    """Monotonic count, e.g. requests served"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.label_names, key)} {_number(v)}" for key, v in items]
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. requests in flight"""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    @contextmanager
+    def track(self, **labels):
+        """Count the block as in flight while it runs"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(Metric):
+    """Distribution of observed values (latencies) over fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (), buckets: Iterable[float] = METRICS_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # per-bucket counts (last one is +Inf), then count and sum
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0, 0.0]
+            series[0][index] += 1
+            series[1] += 1
+            series[2] += value
+
+    def count(self, **labels) -> int:
+        series = self._values.get(self._key(labels))
+        return series[1] if series else 0
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*series[0]], series[1], series[2])) for key, series in self._values.items())
+        lines = self.header()
+        for key, (counts, count, total) in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics in the Prometheus text format. Metrics are created
+    once by name; collectors turn existing get_stats() counters (caches,
+    pools, warm-up) into samples when /metrics is scraped.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str, labels: Iterable[str] = (), buckets: Iterable[float] = METRICS_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets)
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                log.warning("Metrics collector failed", collector=getattr(collector, "__name__", str(collector)), error=str(e))
+                continue
+            for name, kind, help, samples in families:
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+stage_seconds = registry.histogram(
+    "talento_stage_duration_seconds", "Time spent in one pipeline stage of a request", ("route", "stage")
+)
+generator_results = registry.counter(
+    "talento_generator_results_total", "Generator calls by result status (success, fallback, error)", ("generator", "status", "source")
+)
+llm_requests = registry.counter(
+    "talento_llm_requests_total", "Model completions by endpoint and outcome (cache_hit, success, error)", ("endpoint", "result")
+)
+workers_in_flight = registry.gauge(
+    "talento_worker_pool_in_flight", "Blocking calls running or queued on the assessment worker pool"
+)
+
+
+@contextmanager
+def stage(name: str, **attributes):
+    """
+    Time a pipeline stage (extract, prompt, llm, parse, serialize) under the
+    current route, and record it as a span of the current trace (yielded, None outside one)
+    """
+    with stage_seconds.time(route=current_route.get(), stage=name), span(name, **attributes) as current:
+        yield current
+
+
+def instrument_generator(name: str, func: Callable) -> Callable:
+    """
+    Wrap a generator function to time it, count its result status (e.g.
+    fallbacks) and log one line per call. The request arguments that
+    describe it (job role, question count, ...) are bound to its log context.
+    Async generators (the stream_* functions) are timed over the whole stream.
+    """
+    if inspect.isasyncgenfunction(func):
+        return _instrument_stream(name, func)
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        signature = None
+
+    @wraps(func)
+    def call(*args, **kwargs):
+        try:
+            arguments = signature.bind_partial(*args, **kwargs).arguments if signature else kwargs
+        except TypeError:
+            arguments = kwargs
+        fields = {key: arguments[key] for key in GENERATOR_LOG_ARGUMENTS if key in arguments}
+        started = time.perf_counter()
+        with bind(generator=name, **fields):
+            try:
+                with stage("generate", generator=name) as current:
+                    result = func(*args, **kwargs)
+                    if isinstance(result, dict) and current is not None:
+                        current.set_attribute("result.status", result.get("status", "success"))
+                        current.set_attribute("result.source", result.get("source", ""))
+            except Exception:
+                generator_results.inc(generator=name, status="exception", source="")
+                log.exception("Generator raised", duration_ms=round((time.perf_counter() - started) * 1000, 1))
+                raise
+            if isinstance(result, dict):
+                status, source = result.get("status", "success"), result.get("source", "")
+                generator_results.inc(generator=name, status=status, source=source)
+                log.info(
+                    "Generator finished", status=status, source=source,
+                    duration_ms=round((time.perf_counter() - started) * 1000, 1), sample=status == "success",
+                )
+        return result
+
+    return call
+
+
+def _log_arguments(func: Callable, args, kwargs) -> dict:
+    try:
+        arguments = inspect.signature(func).bind_partial(*args, **kwargs).arguments
+    except (TypeError, ValueError):
+        arguments = kwargs
+    return {key: arguments[key] for key in GENERATOR_LOG_ARGUMENTS if key in arguments}
+
+
+def _instrument_stream(name: str, func: Callable) -> Callable:
+    """
+    instrument_generator for an async generator of question events: the
+    "generate" stage lasts until the stream ends, and the result status and
+    source come from its final "done" event ("cancelled" if the client left)
+    """
+
+    @wraps(func)
+    async def stream(*args, **kwargs):
+        status, source = "cancelled", ""
+        started = time.perf_counter()
+        with bind(generator=name, **_log_arguments(func, args, kwargs)):
+            try:
+                with stage("generate", generator=name, streaming=True) as current:
+                    async for event in func(*args, **kwargs):
+                        if isinstance(event, dict) and event.get("type") in ("done", "error"):
+                            status, source = event.get("status", "success"), event.get("source", source)
+                        yield event
+                    if current is not None:
+                        current.set_attribute("result.status", status)
+                        current.set_attribute("result.source", source)
+            except Exception:
+                status = "exception"
+                log.exception("Generator raised", duration_ms=round((time.perf_counter() - started) * 1000, 1))
+                raise
+            finally:
+                generator_results.inc(generator=name, status=status, source=source)
+                if status != "exception":
+                    log.info(
+                        "Generator finished", status=status, source=source,
+                        duration_ms=round((time.perf_counter() - started) * 1000, 1), sample=status == "success",
+                    )
+
+    return stream
+
+
+def hit_ratio_families(caches: Dict[str, Optional[Tuple[float, float]]]) -> List[Family]:
+    """Hits, misses and hit ratio per cache from (hits, misses) pairs; None entries are skipped"""
+    present = {cache: pair for cache, pair in caches.items() if pair is not None}
+    return [
+        ("talento_cache_hits_total", "counter", "Cache hits", [({"cache": c}, h) for c, (h, _) in present.items()]),
+        ("talento_cache_misses_total", "counter", "Cache misses", [({"cache": c}, m) for c, (_, m) in present.items()]),
+        (
+            "talento_cache_hit_ratio", "gauge", "Cache hits / lookups since start",
+            [({"cache": c}, h / (h + m) if h + m else 0.0) for c, (h, m) in present.items()],
+        ),
+    ]
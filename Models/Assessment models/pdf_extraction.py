@@ -0,0 +1,130 @@
+import io
+import os
+import re
+from typing import BinaryIO, List, Optional, Union
+
+import pdfplumber  # type: ignore
+
+from extraction_sandbox import ExtractionSandbox, get_sandbox
+
+# Pages read from a single PDF; resumes rarely need more, pathological files can have thousands
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "10"))
+# Documents with at least this many pages are split across the extraction workers
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "4"))
+
+# Lines at the top and bottom of each page checked for running headers/footers
+PDF_PAGE_EDGE_LINES = int(os.getenv("PDF_PAGE_EDGE_LINES", "2"))
+
+# Page numbers: "3", "3 of 5", "Page 3", "Page 3 / 5"; only removed at a page's edge ("9/10" stays)
+PAGE_NUMBER_LINE = re.compile(r"^(?:page\s*\d+(?:\s*(?:/|of)\s*\d+)?|\d{1,3}(?:\s+of\s+\d{1,3})?)$", re.IGNORECASE)
+_DIGITS = re.compile(r"\d+")
+
+PdfSource = Union[str, os.PathLike, bytes, BinaryIO]
+
+
+def _open(source: PdfSource, pages=None):
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return pdfplumber.open(source, pages=pages)
+
+
+def _count_pages(pdf) -> int:
+    """Page count from the document catalog, without building every page"""
+    try:
+        from pdfminer.pdftypes import resolve1  # type: ignore
+        return int(resolve1(pdf.doc.catalog["Pages"])["Count"])
+    except Exception:
+        return len(pdf.pages)
+
+
+def count_pages(source: PdfSource) -> int:
+    """Number of pages in a PDF; runs in an extraction worker"""
+    with _open(source) as pdf:
+        return _count_pages(pdf)
+
+
+def _extract_page(page) -> str:
+    # Layout analysis caches chars/objects on the page; drop them as soon as it is read
+    try:
+        return page.extract_text() or ""
+    finally:
+        page.close()
+
+
+def extract_page_range(source: PdfSource, first: int, last: int) -> List[str]:
+    """Extract pages first..last (1-based, inclusive); runs in an extraction worker"""
+    with _open(source, pages=range(first, last + 1)) as pdf:
+        return [_extract_page(page) for page in pdf.pages]
+
+
+def plan_page_ranges(page_count: int, workers: int) -> List[tuple]:
+    """Split pages 1..page_count into contiguous (first, last) ranges, one per worker"""
+    workers = max(1, min(workers, page_count))
+    base, extra = divmod(page_count, workers)
+    ranges, first = [], 1
+    for i in range(workers):
+        size = base + (1 if i < extra else 0)
+        ranges.append((first, first + size - 1))
+        first += size
+    return ranges
+
+
+def _edge_key(line: str) -> str:
+    # "Jane Doe - Page 2" and "Jane Doe - Page 3" are the same running footer
+    return _DIGITS.sub("#", " ".join(line.split()).lower())
+
+
+def strip_page_furniture(pages: List[str], edge_lines: int = PDF_PAGE_EDGE_LINES) -> List[str]:
+    """
+    Remove running headers/footers: lines among the first or last
+    `edge_lines` of a page that recur at the edge of another page (kept on
+    the first page they appear on), and page numbers at a page's edge.
+    Repeats inside the page body are left alone.
+    """
+    if edge_lines <= 0:
+        return pages
+    split = [page.splitlines() for page in pages]
+    edges = []
+    for lines in split:
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        edges.append(set(filled[:edge_lines] + filled[-edge_lines:]))
+    counts: dict = {}
+    for lines, edge in zip(split, edges):
+        for key in {_edge_key(lines[i]) for i in edge}:
+            counts[key] = counts.get(key, 0) + 1
+
+    cleaned, kept = [], set()
+    for lines, edge in zip(split, edges):
+        out = []
+        for i, line in enumerate(lines):
+            if i in edge:
+                key = _edge_key(line)
+                if PAGE_NUMBER_LINE.match(line.strip()) or (counts[key] > 1 and key in kept):
+                    continue
+                kept.add(key)
+            out.append(line)
+        cleaned.append("\n".join(out))
+    return cleaned
+
+
+def extract_pdf(source: PdfSource, max_pages: int = PDF_MAX_PAGES, sandbox: Optional[ExtractionSandbox] = None) -> dict:
+    """
+    Extract text from the first `max_pages` pages of a PDF (path, bytes or
+    binary file object). Parsing runs in the extraction sandbox; large
+    documents are split into page ranges across its workers.
+    Running page headers/footers and page numbers are removed.
+    Returns {text, page_count, pages_extracted}.
+    Raises ExtractionError if a worker times out, crashes or hits its limits.
+    """
+    if hasattr(source, "read"):
+        source = source.read()
+    sandbox = sandbox or get_sandbox()
+
+    page_count = sandbox.run(count_pages, source)
+    pages = min(page_count, max_pages) if max_pages > 0 else page_count
+    if pages == 0:
+        return {"text": "", "page_count": page_count, "pages_extracted": 0}
+    workers = sandbox.workers if pages >= PDF_PARALLEL_MIN_PAGES else 1
+    futures = [sandbox.submit(extract_page_range, source, first, last) for first, last in plan_page_ranges(pages, workers)]
+    texts = [text for future in futures for text in future.result()]
+    return {"text": "\n".join(strip_page_furniture(texts)), "page_count": page_count, "pages_extracted": len(texts)}
@@ -1,11 +1,15 @@
 import os
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from dotenv import load_dotenv
-from llm_provider import get_chat_model
+from settings import load_settings
+from llm_provider import get_chat_model, invoke_model
+from question_stream import stream_question_blocks
+from structured_logging import get_logger
 
 # Load environment variables
-load_dotenv()
+load_settings()
+
+log = get_logger(__name__)
 
 model = get_chat_model()
 
@@ -49,7 +53,7 @@ personality_assessment_prompt = PromptTemplate(
 )
 
 def generate_personality_assessment(num_questions: int = 10, assessment_focus: str = "Work Style", job_role: str = "Professional") -> dict:
-    print(f"🔄 Generating {num_questions} personality assessment questions ({assessment_focus}) for {job_role}")
+    log.info("Generating personality questions", job_role=job_role, num_questions=num_questions, assessment_focus=assessment_focus, sample=True)
     
     try:
         if model:
@@ -60,12 +64,12 @@ def generate_personality_assessment(num_questions: int = 10, assessment_focus: s
                     assessment_focus=assessment_focus,
                     job_role=job_role
                 )
-                result = model.invoke(prompt)
+                content = invoke_model(model, prompt, endpoint="personality_assessment")
                 
-                print("✅ AI personality assessment generated successfully!")
+                log.info("AI personality assessment generated", sample=True)
                 
                 return {
-                    "questions": result.content,
+                    "questions": content,
                     "source": "openrouter_ai",
                     "num_questions": num_questions,
                     "assessment_focus": assessment_focus,
@@ -73,10 +77,9 @@ def generate_personality_assessment(num_questions: int = 10, assessment_focus: s
                     "status": "success"
                 }
             except Exception as ai_error:
-                print(f"❌ AI generation failed: {ai_error}")
-                print("🔄 Falling back to predefined questions...")
+                log.warning("AI generation failed, using predefined questions", error=str(ai_error))
         else:
-            print("⚠️ No model available, using fallback questions...")
+            log.warning("No model available, using fallback questions")
         
         # Fallback response with sample personality questions
         fallback_questions = {
@@ -374,6 +377,21 @@ D) Inspire and motivate others""",
             "status": "error"
         }
 
+async def stream_personality_assessment(num_questions: int = 10, assessment_focus: str = "Work Style", job_role: str = "Professional"):
+    """Stream personality questions, yielding each one as soon as it is complete"""
+    log.info("Streaming personality questions", job_role=job_role, num_questions=num_questions, assessment_focus=assessment_focus, sample=True)
+    prompt = personality_assessment_prompt.format(
+        num_questions=num_questions,
+        assessment_focus=assessment_focus,
+        job_role=job_role
+    )
+    async for event in stream_question_blocks(
+        model, prompt, "personality",
+        fallback=lambda: generate_personality_assessment(num_questions, assessment_focus, job_role),
+        metadata={"assessment_focus": assessment_focus, "job_role": job_role}
+    ):
+        yield event
+
 if __name__ == "__main__":
     result = generate_personality_assessment(10, "Work Style", "Software Engineer")
     print(result) 
\ No newline at end of file
@@ -0,0 +1,190 @@
+import math
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from metrics import stage
+from structured_logging import get_logger
+
+log = get_logger(__name__)
+
+# Encoding used to count prompt tokens (an approximation for non-OpenAI models)
+TOKEN_ENCODING = os.getenv("TOKEN_ENCODING", "cl100k_base")
+
+# Token budget for the resume part of each endpoint's prompt; override with RESUME_TOKEN_BUDGET_<ENDPOINT>
+DEFAULT_RESUME_TOKEN_BUDGETS = {
+    "ats_score": 1200,
+    "resume_optimize": 2000,
+    "domain_questions": 1000,
+    "resume_ranking": 800,
+}
+FALLBACK_RESUME_TOKEN_BUDGET = 1500
+
+# "optimi-\nzation" -> "optimization"; a capital after the break is a real hyphen ("Problem-\nSolving")
+HYPHENATED_BREAK = re.compile(r"(\w)-\n([a-z])")
+BULLETS = re.compile(r"^[\s]*[●•▪◦■□➢►▸✓✔]\s*", re.MULTILINE)
+SPACE_RUNS = re.compile(r"[ \t ]+")
+# "Page 2", "Page 2 of 3", "2 of 3"; bare numbers and "9/10" may be content (PDF page edges are cleaned at extraction)
+PAGE_FOOTER = re.compile(r"^(?:page\s*\d+(?:\s*(?:/|of)\s*\d+)?|\d+\s+of\s+\d+)$", re.IGNORECASE)
+
+_encoder = None
+_encoder_loaded = False
+_encoder_lock = threading.Lock()
+
+
+def _get_encoder():
+    """tiktoken encoder if it is installed and its data can be loaded, else None"""
+    global _encoder, _encoder_loaded
+    with _encoder_lock:
+        if not _encoder_loaded:
+            _encoder_loaded = True
+            try:
+                import tiktoken  # type: ignore
+                _encoder = tiktoken.get_encoding(TOKEN_ENCODING)
+            except Exception as e:
+                log.warning("Token counts are estimated, tiktoken unavailable", error=type(e).__name__)
+        return _encoder
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens in `text`; about 4 characters per token when tiktoken is unavailable"""
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / 4)
+
+
+def resume_token_budget(endpoint: str) -> int:
+    default = DEFAULT_RESUME_TOKEN_BUDGETS.get(endpoint, FALLBACK_RESUME_TOKEN_BUDGET)
+    return int(os.getenv(f"RESUME_TOKEN_BUDGET_{endpoint.upper()}", str(default)))
+
+
+def normalize_text(text: str) -> str:
+    """
+    Clean pdfplumber output for a prompt: re-join hyphenated line breaks,
+    unify bullets, collapse whitespace, and drop page-number lines.
+    Repeated lines are kept: identical dates or bullets under different
+    roles are content (running page headers/footers are removed at extraction).
+    """
+    text = HYPHENATED_BREAK.sub(r"\1\2", text)
+    text = BULLETS.sub("- ", text)
+    lines = []
+    for line in text.splitlines():
+        line = SPACE_RUNS.sub(" ", line).strip()
+        if line and not PAGE_FOOTER.match(line):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _truncate_lines(text: str, budget: int) -> str:
+    """Longest prefix of whole lines that fits in `budget` tokens"""
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = count_tokens(line + "\n")
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+class PromptStats:
+    """Per-endpoint prompt token totals, and what compaction saved"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, int]] = {}
+
+    def _entry(self, endpoint: str) -> Dict[str, int]:
+        return self._endpoints.setdefault(endpoint, {"requests": 0, "prompt_tokens": 0, "resume_raw_tokens": 0, "resume_compacted_tokens": 0})
+
+    def record_prompt(self, endpoint: str, tokens: int) -> None:
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry["requests"] += 1
+            entry["prompt_tokens"] += tokens
+
+    def record_compaction(self, endpoint: str, raw_tokens: int, compacted_tokens: int) -> None:
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry["resume_raw_tokens"] += raw_tokens
+            entry["resume_compacted_tokens"] += compacted_tokens
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = {}
+            for endpoint, entry in self._endpoints.items():
+                raw, compacted = entry["resume_raw_tokens"], entry["resume_compacted_tokens"]
+                stats[endpoint] = {
+                    **entry,
+                    "avg_prompt_tokens": round(entry["prompt_tokens"] / entry["requests"], 1) if entry["requests"] else 0.0,
+                    "resume_tokens_saved": raw - compacted,
+                    "resume_savings_ratio": round(1 - compacted / raw, 4) if raw else 0.0,
+                }
+            return {"tokenizer": "tiktoken" if _get_encoder() is not None else "estimate", "endpoints": stats}
+
+
+prompt_stats = PromptStats()
+
+
+@stage("prompt")
+def compact_resume(
+    sections: Dict[str, str],
+    priority: Iterable[str],
+    endpoint: str,
+    fallback: str = "",
+    budget: Optional[int] = None,
+) -> Tuple[str, dict]:
+    """
+    Build the resume part of a prompt within the endpoint's token budget.
+    Sections are normalized and added in `priority` order;
+    the first one that does not fit is cut at a line boundary and the rest
+    are dropped. `fallback` is the full extracted text: it is used if no
+    section is found, and savings are measured against sending it verbatim.
+    Returns the text and a report of token counts and what was kept.
+    """
+    budget = resume_token_budget(endpoint) if budget is None else budget
+    names = [name for name in priority if sections.get(name)]
+    raw_tokens = count_tokens(fallback) if fallback else count_tokens("\n\n".join(sections[name] for name in names))
+    if not names:
+        sections, names = {"Resume": fallback}, ["Resume"]
+
+    blocks: List[str] = []
+    kept, truncated, dropped = [], [], []
+    used = 0
+    for name in names:
+        body = normalize_text(sections[name])
+        if not body:
+            continue
+        heading = f"## {name}\n" if name != "Resume" else ""
+        block = heading + body
+        cost = count_tokens(block + "\n\n")
+        if used + cost <= budget:
+            blocks.append(block)
+            kept.append(name)
+            used += cost
+            continue
+        remaining = budget - used - count_tokens(heading)
+        partial = _truncate_lines(body, remaining) if remaining > 0 else ""
+        if partial:
+            blocks.append(heading + partial)
+            truncated.append(name)
+            used += count_tokens(heading + partial + "\n\n")
+        else:
+            dropped.append(name)
+        dropped.extend(n for n in names[names.index(name) + 1:] if n not in dropped)
+        break
+
+    text = "\n\n".join(blocks)
+    compacted_tokens = count_tokens(text)
+    prompt_stats.record_compaction(endpoint, raw_tokens, compacted_tokens)
+    return text, {
+        "endpoint": endpoint,
+        "budget": budget,
+        "raw_tokens": raw_tokens,
+        "compacted_tokens": compacted_tokens,
+        "sections_kept": kept,
+        "sections_truncated": truncated,
+        "sections_dropped": dropped,
+    }
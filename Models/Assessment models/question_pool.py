@@ -0,0 +1,183 @@
+import math
+import os
+import queue
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Dict, Optional, Tuple
+
+from llm_cache import bypass_cache
+from tracing import trace
+
+# Pre-generated question sets kept across all hot combinations
+QUESTION_POOL_ENABLED = os.getenv("QUESTION_POOL_ENABLED", "1") == "1"
+QUESTION_POOL_TOTAL_SETS = int(os.getenv("QUESTION_POOL_TOTAL_SETS", "40"))
+QUESTION_POOL_MAX_COMBINATIONS = int(os.getenv("QUESTION_POOL_MAX_COMBINATIONS", "8"))
+QUESTION_POOL_MIN_REQUESTS = int(os.getenv("QUESTION_POOL_MIN_REQUESTS", "2"))
+QUESTION_POOL_MIN_SIZE = int(os.getenv("QUESTION_POOL_MIN_SIZE", "2"))
+QUESTION_POOL_MAX_SIZE = int(os.getenv("QUESTION_POOL_MAX_SIZE", "10"))
+QUESTION_POOL_LOW_WATER = float(os.getenv("QUESTION_POOL_LOW_WATER", "0.5"))
+QUESTION_POOL_DECAY_EVERY = int(os.getenv("QUESTION_POOL_DECAY_EVERY", "500"))
+QUESTION_POOL_RETRY_AFTER = float(os.getenv("QUESTION_POOL_RETRY_AFTER", "300"))
+
+PoolKey = Tuple[str, str, int, str]
+
+
+class QuestionPool:
+    """
+    Keeps ready-made question sets for the most requested
+    (kind, job_role, num_questions, difficulty) combinations.
+
+    Every request is counted; the most frequent combinations get a share of
+    the pool budget proportional to their traffic. A background thread tops
+    a combination up whenever it drops below its low-water mark.
+
+    Refills bypass the LLM response cache. Otherwise a pool larger than
+    LLM_CACHE_VARIANTS would only hold copies of the same few cached
+    completions. The pool supplies variety for hot combinations, and the
+    cache covers the long tail.
+    """
+
+    def __init__(
+        self,
+        generators: Dict[str, Callable[..., dict]],
+        total_sets: int = QUESTION_POOL_TOTAL_SETS,
+        max_combinations: int = QUESTION_POOL_MAX_COMBINATIONS,
+        min_requests: int = QUESTION_POOL_MIN_REQUESTS,
+        min_size: int = QUESTION_POOL_MIN_SIZE,
+        max_size: int = QUESTION_POOL_MAX_SIZE,
+        low_water: float = QUESTION_POOL_LOW_WATER,
+        enabled: bool = QUESTION_POOL_ENABLED,
+    ):
+        self.generators = generators
+        self.total_sets = total_sets
+        self.max_combinations = max_combinations
+        self.min_requests = min_requests
+        self.min_size = min_size
+        self.max_size = max_size
+        self.low_water = low_water
+        self.enabled = enabled
+        self._pools: Dict[PoolKey, deque] = {}
+        self._frequency: Counter = Counter()
+        self._requests = 0
+        self._scheduled = set()
+        self._backoff: Dict[PoolKey, float] = {}
+        self._queue: "queue.Queue[Optional[PoolKey]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self.stats = {"hits": 0, "misses": 0, "refills": 0, "refill_failures": 0}
+
+    @staticmethod
+    def make_key(kind: str, job_role: str, num_questions: int, difficulty: str) -> PoolKey:
+        return (kind, job_role.strip(), int(num_questions), difficulty.strip().lower())
+
+    def take(self, kind: str, job_role: str, num_questions: int, difficulty: str) -> Optional[dict]:
+        """Record the request and return a pre-generated set, or None on a miss"""
+        if not self.enabled or kind not in self.generators:
+            return None
+        key = self.make_key(kind, job_role, num_questions, difficulty)
+        with self._lock:
+            self._record(key)
+            pool = self._pools.get(key)
+            result = pool.popleft() if pool else None
+            self.stats["hits" if result else "misses"] += 1
+        self._top_up(key)
+        return result
+
+    def _record(self, key: PoolKey) -> None:
+        self._frequency[key] += 1
+        self._requests += 1
+        if self._requests % QUESTION_POOL_DECAY_EVERY == 0:
+            # Halve all counts so the hot set follows shifts in traffic
+            for k in list(self._frequency):
+                self._frequency[k] //= 2
+                if not self._frequency[k]:
+                    del self._frequency[k]
+
+    def _hot_keys(self) -> Dict[PoolKey, int]:
+        hot = [(k, n) for k, n in self._frequency.most_common(self.max_combinations) if n >= self.min_requests]
+        total = sum(n for _, n in hot)
+        return {
+            k: max(self.min_size, min(self.max_size, round(self.total_sets * n / total)))
+            for k, n in hot
+        }
+
+    def target_size(self, key: PoolKey) -> int:
+        with self._lock:
+            return self._hot_keys().get(key, 0)
+
+    def _top_up(self, key: PoolKey) -> None:
+        with self._lock:
+            target = self._hot_keys().get(key, 0)
+            size = len(self._pools.get(key, ()))
+            if not target or size > math.floor(target * self.low_water):
+                return
+            if key in self._scheduled or self._backoff.get(key, 0) > time.monotonic():
+                return
+            self._scheduled.add(key)
+        self._ensure_worker()
+        self._queue.put(key)
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._refill_loop, name="question-pool-refill", daemon=True)
+                self._worker.start()
+
+    def _refill_loop(self) -> None:
+        while True:
+            key = self._queue.get()
+            if key is None:
+                return
+            try:
+                self._refill(key)
+            finally:
+                with self._lock:
+                    self._scheduled.discard(key)
+
+    def _refill(self, key: PoolKey) -> None:
+        kind, job_role, num_questions, difficulty = key
+        generate = self.generators[kind]
+        while True:
+            with self._lock:
+                target = self._hot_keys().get(key, 0)
+                if len(self._pools.get(key, ())) >= target:
+                    return
+            try:
+                with trace("question_pool.refill", kind="INTERNAL", pool_kind=kind, job_role=job_role), bypass_cache():
+                    result = generate(job_role=job_role, num_questions=num_questions, difficulty=difficulty)
+            except Exception as e:
+                result = {"error": str(e), "status": "error"}
+            # Only pool real generations; predefined fallbacks are instant anyway
+            if result.get("status") != "success" or result.get("source") != "openrouter_ai":
+                with self._lock:
+                    self.stats["refill_failures"] += 1
+                    self._backoff[key] = time.monotonic() + QUESTION_POOL_RETRY_AFTER
+                return
+            with self._lock:
+                self._pools.setdefault(key, deque()).append(result)
+                self.stats["refills"] += 1
+
+    def stop(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            hot = self._hot_keys()
+            return {
+                **self.stats,
+                "enabled": self.enabled,
+                "pools": [
+                    {
+                        "kind": k[0],
+                        "job_role": k[1],
+                        "num_questions": k[2],
+                        "difficulty": k[3],
+                        "requests": self._frequency[k],
+                        "target_size": size,
+                        "ready": len(self._pools.get(k, ())),
+                    }
+                    for k, size in hot.items()
+                ],
+            }
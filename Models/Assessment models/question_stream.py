@@ -0,0 +1,189 @@
+import asyncio
+import json
+import re
+from typing import AsyncIterator, Callable, List, Optional, Union
+
+from batch_generation import MCQ_MAX_PARALLEL_BATCHES
+from mcq_parser import IncrementalMCQParser
+from mcq_repair import normalize_question
+from structured_logging import get_logger
+from worker_pool import run_blocking
+
+log = get_logger(__name__)
+
+# Start of a new question/scenario block, e.g. "Q3.", "**Q3.**", "Scenario 3:"
+BLOCK_HEADER = re.compile(r"^\s*(?:\*\*)?\s*(?:Q\s*\d+\s*[.:)]|Scenario\s+\d+\s*:)", re.IGNORECASE)
+
+# Line that closes a block for each kind of free-text assessment output
+TERMINAL_FIELDS = {
+    "scenario": re.compile(r"^\s*(?:\*\*)?\s*Question\s*:", re.IGNORECASE),
+    "personality": re.compile(r"^\s*(?:\*\*)?\s*D\s*\)", re.IGNORECASE),
+}
+
+
+class QuestionBlockSplitter:
+    """
+    Incrementally splits streamed model output into complete question blocks.
+    A block is complete once its terminal field (e.g. "Question:") is followed
+    by a blank line, or when the next block header arrives.
+    """
+
+    def __init__(self, kind: str):
+        self.terminal = TERMINAL_FIELDS[kind]
+        self._pending = ""
+        self._lines: List[str] = []
+        self._terminal_seen = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add a chunk of text and return any blocks it completed"""
+        self._pending += chunk
+        *lines, self._pending = self._pending.split("\n")
+        blocks = []
+        for line in lines:
+            block = self._consume_line(line)
+            if block:
+                blocks.append(block)
+        return blocks
+
+    def close(self) -> List[str]:
+        """Return whatever is left once the stream has ended"""
+        blocks = []
+        if self._pending:
+            block = self._consume_line(self._pending)
+            self._pending = ""
+            if block:
+                blocks.append(block)
+        block = self._emit()
+        if block:
+            blocks.append(block)
+        return blocks
+
+    def _consume_line(self, line: str) -> Optional[str]:
+        if BLOCK_HEADER.match(line):
+            block = self._emit()
+            self._lines = [line]
+            return block
+        if not self._lines:
+            # Preamble before the first question
+            return None
+        if not line.strip():
+            return self._emit() if self._terminal_seen else None
+        self._lines.append(line)
+        if self.terminal.match(line):
+            self._terminal_seen = True
+        return None
+
+    def _emit(self) -> Optional[str]:
+        block = "\n".join(self._lines).strip()
+        self._lines = []
+        self._terminal_seen = False
+        return block or None
+
+
+def make_splitter(kind: str):
+    """MCQ output is parsed into question objects; other kinds stream as text blocks"""
+    return IncrementalMCQParser() if kind == "mcq" else QuestionBlockSplitter(kind)
+
+
+async def _merge_blocks(model, prompts: List[str], kind: str, limit: int) -> AsyncIterator[tuple]:
+    """
+    Stream every prompt, at most `limit` at a time, and yield ("block", block)
+    as blocks complete in any of them, or ("error", exception) for a prompt
+    whose stream failed
+    """
+    events: asyncio.Queue = asyncio.Queue()
+    slots = asyncio.Semaphore(limit)
+
+    async def pump(prompt: str) -> None:
+        async with slots:
+            splitter = make_splitter(kind)
+            try:
+                async for chunk in model.astream(prompt):
+                    for block in splitter.feed(chunk.content or ""):
+                        await events.put(("block", block))
+                for block in splitter.close():
+                    await events.put(("block", block))
+            except Exception as e:
+                await events.put(("error", e))
+            await events.put(("finished", None))
+
+    tasks = [asyncio.create_task(pump(prompt)) for prompt in prompts]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            event = await events.get()
+            if event[0] == "finished":
+                remaining -= 1
+            else:
+                yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _block_key(block) -> str:
+    text = block.get("question", "") if isinstance(block, dict) else block.splitlines()[0]
+    return normalize_question(text)
+
+
+async def stream_question_blocks(
+    model,
+    prompt: Union[str, List[str]],
+    kind: str,
+    fallback: Callable[[], dict],
+    metadata: dict,
+) -> AsyncIterator[dict]:
+    """
+    Stream question events for a prompt: one {"type": "question"} event per
+    completed block, then a final {"type": "done"} event with the metadata.
+    A list of prompts (the batches of a large request) is streamed
+    MCQ_MAX_PARALLEL_BATCHES at a time, questions repeated across batches
+    are skipped. Falls back to the synchronous generator if the model is
+    unavailable or fails before the first question is produced.
+    """
+    prompts = [prompt] if isinstance(prompt, str) else prompt
+    emitted, seen, errors = 0, set(), []
+    if model:
+        async for event, value in _merge_blocks(model, prompts, kind, MCQ_MAX_PARALLEL_BATCHES):
+            if event == "error":
+                log.warning("AI streaming failed", error=str(value), emitted=emitted)
+                errors.append(value)
+                continue
+            key = _block_key(value)
+            if key in seen:
+                continue
+            seen.add(key)
+            emitted += 1
+            yield {"type": "question", "index": emitted, "question": value}
+        if not errors:
+            yield {"type": "done", "total_questions": emitted, "source": "openrouter_ai", "status": "success", **metadata}
+            return
+        if emitted:
+            yield {"type": "error", "error": f"Generation interrupted: {errors[0]}", "status": "error"}
+            yield {"type": "done", "total_questions": emitted, "source": "openrouter_ai", "status": "partial", **metadata}
+            return
+
+    result = await run_blocking(fallback)
+    if "error" in result:
+        yield {"type": "error", "error": result["error"], "status": "error"}
+        return
+    questions = result.get("questions", [])
+    if isinstance(questions, str):
+        splitter = make_splitter(kind)
+        questions = splitter.feed(questions) + splitter.close()
+    for question in questions:
+        emitted += 1
+        yield {"type": "question", "index": emitted, "question": question}
+    yield {"type": "done", "total_questions": emitted, "source": result.get("source", "fallback"), "status": result.get("status", "success"), **metadata}
+
+
+async def encode_ndjson(events: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Serialize events as newline-delimited JSON"""
+    async for event in events:
+        yield json.dumps(event) + "\n"
+
+
+async def encode_sse(events: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Serialize events as server-sent events"""
+    async for event in events:
+        yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
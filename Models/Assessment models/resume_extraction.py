@@ -0,0 +1,165 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Optional, Union
+
+from docx_extraction import extract_docx_text
+from extraction_sandbox import ExtractionError, ExtractionFailed, get_sandbox
+from metrics import stage
+from pdf_extraction import extract_pdf
+from structured_logging import get_logger
+
+log = get_logger(__name__)
+
+# Number of distinct uploaded files whose extracted text is kept in memory
+RESUME_CACHE_ENTRIES = int(os.getenv("RESUME_CACHE_ENTRIES", "128"))
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc")
+
+# A path on disk, the raw uploaded bytes, or a binary file object (e.g. UploadFile.file)
+ResumeSource = Union[str, os.PathLike, bytes, BinaryIO]
+
+
+def extract_text_from_pdf(file_path: str) -> str:
+    """Extract text from PDF file"""
+    return _extract_pdf(file_path)["text"]
+
+
+def extract_text_from_docx(file_path: str) -> str:
+    """Extract text from DOCX file"""
+    return _extract_docx(file_path)["text"]
+
+
+def _extract_pdf(source) -> dict:
+    try:
+        return extract_pdf(source)
+    except (ExtractionFailed, OSError) as e:
+        log.warning("PDF text extraction failed", error=str(e))
+        return {"text": "", "page_count": 0, "pages_extracted": 0}
+
+
+def _extract_docx(source) -> dict:
+    try:
+        if hasattr(source, "read"):
+            source = source.read()
+        text = get_sandbox().run(extract_docx_text, source)
+        return {"text": text, "page_count": None, "pages_extracted": None}
+    except (ExtractionFailed, OSError) as e:
+        log.warning("DOCX text extraction failed", error=str(e))
+        return {"text": "", "page_count": None, "pages_extracted": None}
+
+
+class ExtractionCache:
+    """
+    LRU cache of extraction results keyed by the SHA-256 of the file bytes.
+    Concurrent requests for the same file wait for a single extraction.
+    """
+
+    def __init__(self, max_entries: int = RESUME_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_or_extract(self, key: str, extract) -> dict:
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return self._entries[key]
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._inflight[key] = threading.Event()
+                    self.stats["misses"] += 1
+                    break
+            # Another request is parsing the same file; reuse its result
+            waiter.wait()
+
+        try:
+            result = extract()
+            with self._lock:
+                self._entries[key] = result
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats["evictions"] += 1
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_ratio": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+extraction_cache = ExtractionCache()
+
+
+def read_source(source: ResumeSource) -> bytes:
+    """Read the full contents of a path, bytes or binary file object"""
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    if source.seekable():
+        source.seek(0)
+    return source.read()
+
+
+def extract_resume(source: ResumeSource, filename: Optional[str] = None) -> Optional[dict]:
+    """
+    Extract text and metadata from a resume (PDF or DOCX) given as a path,
+    bytes or file object; `filename` supplies the extension for the latter two.
+    Parsing happens in memory. Each unique file is parsed once; repeat uploads
+    are served from the cache. Returns None for unsupported formats.
+    """
+    if filename is None and isinstance(source, (str, os.PathLike)):
+        filename = os.fspath(source)
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        log.warning("Unsupported resume file format", extension=ext)
+        return None
+
+    with stage("upload_read"):
+        data = read_source(source)
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    def extract() -> dict:
+        # .doc files are attempted with the DOCX reader; both parse in the extraction sandbox
+        with stage("extract"):
+            result = _extract_pdf(data) if ext == ".pdf" else _extract_docx(data)
+        return {
+            "sha256": sha256,
+            "format": ext.lstrip("."),
+            "text": result["text"],
+            "page_count": result["page_count"],
+            "pages_extracted": result["pages_extracted"],
+            "char_count": len(result["text"]),
+        }
+
+    return dict(extraction_cache.get_or_extract(f"{sha256}{ext}", extract))
+
+
+def extract_resume_text(source: ResumeSource, filename: Optional[str] = None) -> Optional[str]:
+    """
+    Extract text from resume file (PDF or DOCX). Returns None if the file
+    cannot be read; raises ExtractionError if parsing crashed or hit a limit.
+    """
+    try:
+        result = extract_resume(source, filename)
+        return result["text"] if result else None
+    except ExtractionError:
+        raise
+    except Exception as e:
+        log.exception("Resume text extraction failed")
+        return None
@@ -1,57 +1,36 @@
 import os
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from settings import load_settings
+from llm_provider import get_chat_model, invoke_model
+from resume_extraction import ResumeSource
+from resume_sections import get_resume_sections
+from prompt_compaction import compact_resume
+from resume_report import assemble_report, generate_report_parts
+from analysis_store import incremental_report_parts
+from extraction_sandbox import ExtractionError
 from typing import Optional
-from dotenv import load_dotenv
-import pdfplumber   #type: ignore
-import docx #type: ignore
-from llm_provider import get_chat_model
+from structured_logging import get_logger
 
 # Load environment variables
-load_dotenv()
+load_settings()
+
+log = get_logger(__name__)
 
 model = get_chat_model()
 
-# Output parser
-parser = StrOutputParser()
+# Write the report as concurrent per-section calls instead of one long generation
+# (opt-in: one model call per report part, 12 instead of 1, for lower latency)
+RESUME_ANALYSIS_PARALLEL = os.getenv("RESUME_ANALYSIS_PARALLEL", "0") == "1"
+# With a user_id, write the report per part and reuse the parts whose sections did not change since
+# that user's previous upload; independent of RESUME_ANALYSIS_PARALLEL
+RESUME_ANALYSIS_INCREMENTAL = os.getenv("RESUME_ANALYSIS_INCREMENTAL", "1") == "1"
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file"""
-    try:
-        with pdfplumber.open(file_path) as pdf:
-            text = "\n".join(page.extract_text() or '' for page in pdf.pages)
-        return text
-    except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
-        return ""
+# Everything but the header (name/contact details), most valuable first when the token budget is tight
+OPTIMIZER_PROMPT_SECTIONS = ("Experience", "Skills", "Projects", "Education", "Summary", "Certifications", "Other")
 
-def extract_text_from_docx(file_path: str) -> str:
-    """Extract text from DOCX file"""
-    try:
-        doc = docx.Document(file_path)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text
-    except Exception as e:
-        print(f"Error extracting text from DOCX: {e}")
-        return ""
-
-def extract_resume_text(file_path: str) -> Optional[str]:
-    """Extract text from resume file (PDF or DOCX)"""
-    try:
-        ext = os.path.splitext(file_path)[1].lower()
-        if ext == ".pdf":
-            return extract_text_from_pdf(file_path)
-        elif ext == ".docx":
-            return extract_text_from_docx(file_path)
-        elif ext == ".doc":
-            # For .doc files, we'll try to extract as much as possible
-            return extract_text_from_docx(file_path)
-        else:
-            print(f"Unsupported file format: {ext}")
-            return None
-    except Exception as e:
-        print(f"Error extracting resume text: {e}")
-        return None
+# Output parser
+parser = StrOutputParser()
 
 # Prompt template for resume analysis
 resume_analysis_template = """
@@ -124,11 +103,29 @@ resume_analysis_prompt = PromptTemplate(
 )
 
 # Function to analyze resume
-def analyze_resume(file_path: str, job_role: str = "Software Engineer") -> str:
-    print(f"🔄 Analyzing resume for {job_role} position")
+def analyze_resume(
+    resume_file: ResumeSource,
+    job_role: str = "Software Engineer",
+    filename: Optional[str] = None,
+    parallel: Optional[bool] = None,
+    user_id: Optional[str] = None,
+    lineage_id: Optional[str] = None,
+) -> str:
+    """
+    Markdown resume analysis report. With `parallel` (default
+    RESUME_ANALYSIS_PARALLEL) each report section is a separate, concurrent
+    model call, so latency follows the slowest section rather than the sum.
+    With a `user_id` (and RESUME_ANALYSIS_INCREMENTAL), the report is
+    always written per part, and parts whose sections are unchanged since
+    that user's previous upload of the document (`lineage_id`, default the
+    filename) are reused.
+    """
+    log.info("Analyzing resume", job_role=job_role, sample=True)
+    parallel = RESUME_ANALYSIS_PARALLEL if parallel is None else parallel
     
     try:
-        resume_text = extract_resume_text(file_path)
+        resume = get_resume_sections(resume_file, filename)
+        resume_text = resume["text"] if resume else None
         
         if not resume_text or not resume_text.strip():
             return f"Error: Could not extract text from the uploaded resume. Please ensure the file is not corrupted and is in PDF or DOCX format."
@@ -136,20 +133,37 @@ def analyze_resume(file_path: str, job_role: str = "Software Engineer") -> str:
         if model:
             # Try AI analysis first
             try:
+                complete = lambda prompt: invoke_model(model, prompt, endpoint="resume_optimize_section")
+                if user_id and RESUME_ANALYSIS_INCREMENTAL:
+                    parts, changes = incremental_report_parts(complete, user_id, lineage_id or filename or "resume", resume, job_role)
+                    log.info(
+                        "AI resume analysis completed",
+                        parts_reused=len(changes["parts_reused"]),
+                        parts_generated=len(changes["parts_generated"]),
+                        changed_sections=changes["changed_sections"],
+                        sample=True,
+                    )
+                    return assemble_report(parts, resume_text, job_role)
+                if parallel:
+                    parts = generate_report_parts(complete, resume["sections"], resume_text, job_role)
+                    log.info("AI resume analysis completed", sample=True)
+                    return assemble_report(parts, resume_text, job_role)
+
+                resume_prompt_text, compaction = compact_resume(resume["sections"], OPTIMIZER_PROMPT_SECTIONS, "resume_optimize", fallback=resume_text)
+                log.debug("Resume compacted for prompt", raw_tokens=compaction["raw_tokens"], compacted_tokens=compaction["compacted_tokens"])
                 prompt = resume_analysis_prompt.format(
-                    resume_text=resume_text,
+                    resume_text=resume_prompt_text,
                     job_role=job_role
                 )
-                result = model.invoke(prompt)
+                content = invoke_model(model, prompt, endpoint="resume_optimize")
                 
-                print("✅ AI resume analysis completed successfully!")
+                log.info("AI resume analysis completed", sample=True)
                 
-                return result.content
+                return content
             except Exception as ai_error:
-                print(f"❌ AI analysis failed: {ai_error}")
-                print("🔄 Falling back to basic analysis...")
+                log.warning("AI analysis failed, using basic analysis", error=str(ai_error))
         else:
-            print("⚠️ No model available, using basic analysis...")
+            log.warning("No model available, using basic analysis")
         
         # Fallback response when model is not available
         word_count = len(resume_text.split())
@@ -195,6 +209,9 @@ Please contact support to enable AI-powered analysis.
 ---
 *Basic analysis completed. Resume content extracted successfully and ready for detailed review.*
         """
+    except ExtractionError:
+        # Parser crashed or hit its limits; the API rejects the upload
+        raise
     except Exception as e:
         return f"Error analyzing resume: {str(e)} 😵"
 
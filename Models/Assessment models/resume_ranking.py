@@ -0,0 +1,229 @@
+import contextvars
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.prompts import PromptTemplate
+
+from ats_engine import score_resume
+from extraction_sandbox import EXTRACTION_WORKERS
+from llm_provider import get_chat_model, invoke_model
+from prompt_compaction import compact_resume
+from resume_extraction import ResumeSource
+from resume_sections import get_resume_sections
+from structured_logging import get_logger
+
+log = get_logger(__name__)
+
+# Resumes accepted in one ranking request
+RANKING_MAX_RESUMES = int(os.getenv("RANKING_MAX_RESUMES", "200"))
+# Most top-ranked resumes that may get an LLM deep-dive
+RANKING_MAX_DEEP_DIVES = int(os.getenv("RANKING_MAX_DEEP_DIVES", "10"))
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = float(os.getenv("BM25_K1", "1.5"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+# Sections a deep-dive reads, most valuable first
+RANKING_PROMPT_SECTIONS = ("Experience", "Skills", "Projects", "Summary", "Education", "Certifications")
+
+# Keeps "c++", "c#", "node.js" and "ci-cd" as single terms
+TOKEN = re.compile(r"[a-z][a-z0-9]*(?:[.+#-][a-z0-9+#]*)*")
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does doing
+during each etc few for from had has have having he her here his how i if in into is it its itself just
+me more most my no nor not of off on once only or other our out over own per same she should so some
+such than that the their them then there these they this those through to too under until up upon us
+very via was we were what when where which while who whom why will with within would you your
+""".split())
+
+# Extraction threads only wait on the sandbox workers, which do the parsing
+_extraction_executor = ThreadPoolExecutor(max_workers=EXTRACTION_WORKERS * 2, thread_name_prefix="ranking-extract")
+_deep_dive_executor = ThreadPoolExecutor(max_workers=RANKING_MAX_DEEP_DIVES, thread_name_prefix="ranking-deep-dive")
+
+deep_dive_template = """
+You are an experienced technical recruiter. Assess how well this candidate fits the job below.
+
+Job Description:
+{job_description}
+
+Candidate Resume:
+{resume_text}
+
+Keyword match against the job description: {match_score}/100. Matched terms: {matched_terms}. Missing terms: {missing_terms}.
+
+Respond in markdown with:
+1. **Fit Summary**: Two or three sentences on overall fit
+2. **Strengths for this Role**: 3 bullet points grounded in the resume
+3. **Gaps and Risks**: 2-3 bullet points
+4. **Interview Focus**: 2-3 questions to probe in a first interview
+"""
+
+deep_dive_prompt = PromptTemplate(
+    input_variables=["job_description", "resume_text", "match_score", "matched_terms", "missing_terms"],
+    template=deep_dive_template,
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased terms of `text` without stopwords"""
+    terms = (token.rstrip(".-") for token in TOKEN.findall(text.lower()))
+    return [term for term in terms if len(term) > 1 and term not in STOPWORDS]
+
+
+def score_documents(texts: Sequence[str], job_description: str) -> Dict[str, np.ndarray]:
+    """
+    Vectorized similarity of each text to the job description: Okapi BM25
+    with the description as the query, and cosine similarity of sublinear
+    TF-IDF vectors. IDF is computed over the batch. `score` (0-100) blends
+    BM25 scaled to the batch's best match with the cosine similarity.
+    """
+    query = tokenize(job_description)
+    documents = [tokenize(text) for text in texts]
+    vocabulary: Dict[str, int] = {}
+    for terms in [query, *documents]:
+        for term in terms:
+            vocabulary.setdefault(term, len(vocabulary))
+    size = max(len(vocabulary), 1)
+
+    # Term counts: one row per resume, and the query's own row
+    counts = np.zeros((len(documents), size), dtype=np.float64)
+    for row, terms in enumerate(documents):
+        if terms:
+            counts[row] = np.bincount([vocabulary[t] for t in terms], minlength=size)
+    query_counts = np.bincount([vocabulary[t] for t in query], minlength=size).astype(np.float64) if query else np.zeros(size)
+
+    n = len(documents)
+    df = (counts > 0).sum(axis=0)
+    lengths = counts.sum(axis=1)
+    avg_length = lengths.mean() if n and lengths.mean() > 0 else 1.0
+
+    # BM25: every query term's saturated frequency, weighted by IDF and by how often the description repeats it
+    bm25_idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    saturated = counts * (BM25_K1 + 1) / (counts + BM25_K1 * (1 - BM25_B + BM25_B * lengths[:, None] / avg_length))
+    bm25 = saturated @ (bm25_idf * query_counts)
+
+    # TF-IDF cosine, with smoothed IDF so terms in every resume still count
+    tfidf_idf = np.log((1 + n) / (1 + df)) + 1
+    doc_vectors = np.log1p(counts) * tfidf_idf
+    query_vector = np.log1p(query_counts) * tfidf_idf
+    norms = np.linalg.norm(doc_vectors, axis=1) * np.linalg.norm(query_vector)
+    cosine = np.divide(doc_vectors @ query_vector, norms, out=np.zeros(n), where=norms > 0)
+
+    best = bm25.max() if n else 0.0
+    bm25_scaled = bm25 / best if best > 0 else np.zeros(n)
+    return {
+        "score": np.round(100 * (0.5 * bm25_scaled + 0.5 * cosine), 1),
+        "bm25": bm25,
+        "cosine": cosine,
+        "present": counts > 0,
+        # Query terms by weight in the description, for matched/missing lists
+        "terms": np.array(list(vocabulary) or [""], dtype=object),
+        "query_weights": query_vector,
+    }
+
+
+def _extract(name: str, source: ResumeSource) -> dict:
+    try:
+        resume = get_resume_sections(source, name)
+        if not resume or not resume["text"].strip():
+            return {"filename": name, "error": "Could not extract text. Supported formats: PDF, DOCX."}
+        return {"filename": name, **resume}
+    except Exception as e:
+        # One bad upload should not fail the batch; sandbox errors included
+        return {"filename": name, "error": f"{type(e).__name__}: {e}"}
+
+
+def extract_batch(resumes: Sequence[Tuple[str, ResumeSource]]) -> List[dict]:
+    """Extract (filename, source) pairs concurrently on the sandboxed parser pool"""
+    futures = [_extraction_executor.submit(contextvars.copy_context().run, _extract, name, source) for name, source in resumes]
+    return [future.result() for future in futures]
+
+
+def deep_dive(model, resume: dict, job_description: str, ranked: dict) -> str:
+    resume_text, _ = compact_resume(resume["sections"], RANKING_PROMPT_SECTIONS, "resume_ranking", fallback=resume["text"])
+    prompt = deep_dive_prompt.format(
+        job_description=job_description.strip(),
+        resume_text=resume_text,
+        match_score=ranked["score"],
+        matched_terms=", ".join(ranked["matched_terms"]) or "None",
+        missing_terms=", ".join(ranked["missing_terms"]) or "None",
+    )
+    return invoke_model(model, prompt, endpoint="resume_ranking")
+
+
+def rank_resumes(
+    resumes: Sequence[Tuple[str, ResumeSource]],
+    job_description: str,
+    job_role: Optional[str] = None,
+    top_k: int = 0,
+    max_terms: int = 10,
+) -> dict:
+    """
+    Rank (filename, source) resumes against a job description. Scoring is
+    local and vectorized; only the `top_k` best matches get an LLM
+    deep-dive. With `job_role`, each resume's local ATS score is included.
+    """
+    log.info("Ranking resumes", resumes=len(resumes), top_k=top_k, sample=True)
+    timings = {}
+    started = time.perf_counter()
+    extracted = extract_batch(resumes)
+    timings["extraction_seconds"] = round(time.perf_counter() - started, 3)
+
+    parsed = [resume for resume in extracted if "error" not in resume]
+    failed = [{"filename": resume["filename"], "error": resume["error"]} for resume in extracted if "error" in resume]
+
+    started = time.perf_counter()
+    scores = score_documents([resume["text"] for resume in parsed], job_description)
+    order = np.argsort(-scores["score"], kind="stable")
+    query_terms = np.argsort(-scores["query_weights"], kind="stable")
+    query_terms = query_terms[scores["query_weights"][query_terms] > 0]
+    ranked = []
+    for rank, index in enumerate(order, start=1):
+        resume = parsed[index]
+        present = scores["present"][index][query_terms]
+        entry = {
+            "rank": rank,
+            "filename": resume["filename"],
+            "sha256": resume["sha256"],
+            "score": float(scores["score"][index]),
+            "bm25": round(float(scores["bm25"][index]), 4),
+            "tfidf_similarity": round(float(scores["cosine"][index]), 4),
+            "matched_terms": list(scores["terms"][query_terms[present]][:max_terms]),
+            "missing_terms": list(scores["terms"][query_terms[~present]][:max_terms]),
+        }
+        if job_role:
+            entry["ats_score"] = score_resume(resume["text"], job_role)["score"]
+        ranked.append(entry)
+    timings["scoring_seconds"] = round(time.perf_counter() - started, 4)
+
+    top_k = max(0, min(top_k, RANKING_MAX_DEEP_DIVES, len(ranked)))
+    model = get_chat_model() if top_k else None
+    if top_k and model:
+        started = time.perf_counter()
+        futures = [
+            _deep_dive_executor.submit(contextvars.copy_context().run, deep_dive, model, parsed[index], job_description, ranked[rank])
+            for rank, index in enumerate(order[:top_k])
+        ]
+        for entry, future in zip(ranked, futures):
+            try:
+                entry["analysis"] = future.result()
+            except Exception as e:
+                log.warning("Deep-dive failed", filename=entry["filename"], error=str(e))
+                entry["analysis"] = None
+        timings["deep_dive_seconds"] = round(time.perf_counter() - started, 3)
+    elif top_k:
+        log.warning("No model available, skipping deep-dives")
+
+    log.info("Ranked resumes", ranked=len(ranked), failed=len(failed), timings=timings, sample=True)
+    return {
+        "status": "success",
+        "source": "local_bm25_tfidf",
+        "job_role": job_role,
+        "count": len(ranked),
+        "ranked": ranked,
+        "failed": failed,
+        "timings": timings,
+    }
@@ -0,0 +1,187 @@
+import contextvars
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from ats_engine import score_resume
+from prompt_compaction import compact_resume
+from structured_logging import get_logger
+
+log = get_logger(__name__)
+
+# Section calls in flight at once, shared by all reports (12 writes one report's parts all at once)
+RESUME_ANALYSIS_MAX_PARALLEL = int(os.getenv("RESUME_ANALYSIS_MAX_PARALLEL", "12"))
+
+# Separate from the request worker pool, which is blocked waiting on these calls; threads start on first use
+_section_executor = ThreadPoolExecutor(max_workers=RESUME_ANALYSIS_MAX_PARALLEL, thread_name_prefix="resume-section")
+
+ALL_SECTIONS = ("Summary", "Education", "Experience", "Skills", "Projects", "Certifications", "Other")
+
+
+class ReportPart(NamedTuple):
+    key: str
+    # Resume sections the part is written from (in priority order)
+    inputs: Tuple[str, ...]
+    # Text the model must produce, in the report's exact format
+    instructions: str
+
+
+REPORT_PARTS: List[ReportPart] = [
+    ReportPart("profile", ("Summary", "Experience", "Education", "Projects"), """**Profile Overview:**
+- Current Status: [Student/Professional/Career Changer]
+- Education Level: [Degree, Institution, GPA if strong]
+- Years of Experience: [Entry-level/X years]
+- Core Expertise: [Primary technical/professional focus]"""),
+    ReportPart("education", ("Education",), """**Education:**
+[List educational background with key details]"""),
+    ReportPart("skills", ("Skills",), """**Technical Skills:**
+[Categorize skills by proficiency level]"""),
+    ReportPart("projects", ("Experience", "Projects"), """**Projects/Experience:**
+[List major projects or work experience with impact]"""),
+    ReportPart("achievements", ("Certifications", "Other"), """**Achievements:**
+[Notable accomplishments, awards, certifications]"""),
+    ReportPart("strengths", ALL_SECTIONS, """[Provide 4-6 specific strengths with detailed explanations of why they're valuable for the target role]"""),
+    ReportPart("improvements", ALL_SECTIONS, """[Identify 4-6 specific weaknesses with clear explanations of why they limit effectiveness]"""),
+    ReportPart("priority_1", ("Summary", "Skills", "Experience", "Projects"), """**PRIORITY 1 - IMMEDIATE ACTIONS:**
+1. **Professional Summary**: [Specific guidance on crafting a compelling summary]
+2. **Keywords Integration**: [Industry-specific keywords to add for ATS optimization]
+3. **Quantifiable Results**: [How to add metrics and measurable achievements]"""),
+    ReportPart("priority_2", ("Projects", "Experience", "Skills"), """**PRIORITY 2 - CONTENT ENHANCEMENTS:**
+4. **Project Descriptions**: [How to improve project narratives with STAR method]
+5. **Skills Organization**: [Better categorization and presentation of technical skills]
+6. **Format Optimization**: [Layout and structure improvements]"""),
+    ReportPart("priority_3", ALL_SECTIONS, """**PRIORITY 3 - STRATEGIC ADDITIONS:**
+7. **Missing Elements**: [What sections or content should be added]
+8. **Industry Alignment**: [How to better align with {job_role} requirements]
+9. **Competitive Edge**: [Unique value propositions to highlight]"""),
+    ReportPart("ats", ALL_SECTIONS, """A deterministic ATS scan scored this resume {ats_score}/100 (keywords {keyword_points}/50, sections {section_points}/20, formatting {formatting_points}/30; missing keywords: {missing_keywords}). Explain it as:
+**Keyword Density**: [Rating with explanation]
+**Format Compatibility**: [Rating with explanation]
+**Content Relevance**: [Rating with explanation]"""),
+    ReportPart("next_steps", ALL_SECTIONS, """[3-5 specific, actionable next steps prioritized by impact]"""),
+]
+
+section_prompt_template = """
+You are a senior career coach and resume optimization expert with 15+ years of experience helping professionals land jobs at top companies. You are writing ONE part of a resume analysis report for a {job_role} candidate.
+
+Resume Content:
+{resume_text}
+
+Write only this part of the report, following this EXACT format and nothing else (no report title, no section heading):
+{instructions}
+"""
+
+PART_FAILED = "_This part of the analysis could not be generated. Please try again._"
+
+
+def part_prompt(part: ReportPart, sections: Dict[str, str], resume_text: str, job_role: str, ats: dict) -> str:
+    """Prompt for one report part, carrying only the resume sections it reads"""
+    if sections:
+        text, _ = compact_resume(sections, part.inputs, "resume_optimize_section")
+        text = text or "(These sections are not present in the resume.)"
+    else:
+        text, _ = compact_resume({}, (), "resume_optimize_section", fallback=resume_text)
+    instructions = part.instructions.format(
+        job_role=job_role,
+        ats_score=ats["score"],
+        keyword_points=ats["score_breakdown"]["keywords"],
+        section_points=ats["score_breakdown"]["sections"],
+        formatting_points=ats["score_breakdown"]["formatting"],
+        missing_keywords=", ".join(ats["missing_keywords"]) or "None",
+    )
+    return section_prompt_template.format(job_role=job_role, resume_text=text, instructions=instructions)
+
+
+def part_prompts(sections: Dict[str, str], resume_text: str, job_role: str, parts: Optional[List[ReportPart]] = None) -> Dict[str, str]:
+    """Prompt for each report part, keyed by part"""
+    parts = REPORT_PARTS if parts is None else parts
+    ats = score_resume(resume_text, job_role)
+    return {part.key: part_prompt(part, sections, resume_text, job_role, ats) for part in parts}
+
+
+def prompt_fingerprint(prompt: str) -> str:
+    """A part's output only depends on its prompt, so equal fingerprints mean it can be reused"""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def _clean_part(content: str) -> str:
+    """Drop markdown headings the model echoed back despite the instructions"""
+    lines = content.strip().splitlines()
+    while lines and (lines[0].lstrip().startswith("#") or not lines[0].strip()):
+        lines.pop(0)
+    return "\n".join(lines).strip()
+
+
+def generate_report_parts(
+    complete: Callable[[str], str],
+    sections: Dict[str, str],
+    resume_text: str,
+    job_role: str,
+    parts: Optional[List[ReportPart]] = None,
+    prompts: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """
+    Write the report parts concurrently; `complete(prompt)` returns the model
+    output. `prompts` are the parts' prompts if already built. A part whose
+    call fails gets a placeholder; if every part fails the first error is
+    raised so the caller can fall back.
+    """
+    parts = REPORT_PARTS if parts is None else parts
+    prompts = prompts or part_prompts(sections, resume_text, job_role, parts)
+    futures = {
+        part.key: _section_executor.submit(contextvars.copy_context().run, complete, prompts[part.key])
+        for part in parts
+    }
+    results, errors = {}, []
+    for part in parts:
+        try:
+            results[part.key] = _clean_part(futures[part.key].result())
+        except Exception as e:
+            log.warning("Resume analysis part failed", part=part.key, error=str(e))
+            errors.append(e)
+            results[part.key] = PART_FAILED
+    if parts and len(errors) == len(parts):
+        raise errors[0]
+    return results
+
+
+def assemble_report(results: Dict[str, str], resume_text: str, job_role: str) -> str:
+    """Put the parts together in the single-call report's format"""
+    ats_score = score_resume(resume_text, job_role)["score"]
+    return f"""## 📊 RESUME ANALYSIS REPORT
+
+### 🔍 KEY COMPONENTS EXTRACTED
+{results['profile']}
+
+{results['education']}
+
+{results['skills']}
+
+{results['projects']}
+
+{results['achievements']}
+
+### ✅ STRENGTHS ANALYSIS
+{results['strengths']}
+
+### ⚠️ AREAS FOR IMPROVEMENT
+{results['improvements']}
+
+### 🚀 OPTIMIZATION RECOMMENDATIONS
+
+{results['priority_1']}
+
+{results['priority_2']}
+
+{results['priority_3']}
+
+### 📈 ATS OPTIMIZATION SCORE: {round(ats_score / 10)}/10
+{results['ats']}
+
+### 🎯 NEXT STEPS
+{results['next_steps']}
+
+---
+*This analysis is tailored specifically for {job_role} positions. Implementing these recommendations should significantly improve your resume's effectiveness and interview callback rate.*
+"""
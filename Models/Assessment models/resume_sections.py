@@ -0,0 +1,71 @@
+import re
+from typing import Dict, Optional
+
+from resume_extraction import RESUME_CACHE_ENTRIES, ExtractionCache, ResumeSource, extract_resume
+
+# Heading spellings for each section, compared after lower-casing and stripping punctuation
+SECTION_HEADINGS = {
+    "Summary": ["summary", "profile", "objective", "about me", "about", "professional summary", "career objective"],
+    "Education": ["education", "academic background", "academics", "qualifications", "educational qualifications"],
+    "Experience": ["experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "internships", "internship", "internship experience"],
+    "Skills": ["skills", "technical skills", "core competencies", "technologies", "tech stack", "key skills", "skill set"],
+    "Projects": ["projects", "personal projects", "academic projects", "key projects", "project work"],
+    "Certifications": ["certifications", "certificates", "courses", "licenses", "certifications and courses"],
+    "Other": ["achievements", "awards", "honors", "honours", "activities", "extracurricular", "extracurricular activities",
+              "interests", "hobbies", "publications", "volunteering", "volunteer experience", "leadership",
+              "positions of responsibility", "languages", "references"],
+}
+SECTIONS = tuple(SECTION_HEADINGS)
+
+_ALIASES = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+_NON_HEADING_CHARS = re.compile(r"[^a-z& ]+")
+_JOINERS = re.compile(r"\s+(?:&|and)\s+")
+
+# Segmentations are small, keep one per cached extraction
+section_cache = ExtractionCache(max_entries=RESUME_CACHE_ENTRIES)
+
+
+def heading_section(line: str) -> Optional[str]:
+    """Section a line introduces if it looks like a heading ("EDUCATION", "Work Experience:")"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    key = " ".join(_NON_HEADING_CHARS.sub(" ", stripped.lower()).split())
+    if key in _ALIASES:
+        return _ALIASES[key]
+    # "Skills & Interests", "Certifications and Achievements": use the first part
+    first = _JOINERS.split(key)[0]
+    return _ALIASES.get(first) if first != key else None
+
+
+def segment_resume(text: str) -> Dict[str, str]:
+    """
+    Split resume text into sections by its headings. Text before the first
+    heading (name, contact details) is returned as "Header"; repeated
+    headings are merged. Only non-empty sections are returned.
+    """
+    parts: Dict[str, list] = {"Header": []}
+    current = "Header"
+    for line in text.splitlines():
+        section = heading_section(line)
+        if section:
+            current = section
+            parts.setdefault(current, [])
+        elif line.strip():
+            parts[current].append(line.rstrip())
+    return {name: "\n".join(lines) for name, lines in parts.items() if lines}
+
+
+def get_resume_sections(source: ResumeSource, filename: Optional[str] = None) -> Optional[dict]:
+    """
+    Extract and segment a resume. Both steps are cached by the document's
+    SHA-256, so every analyzer of the same upload shares one parse.
+    Returns {sha256, text, sections} or None for unsupported formats.
+    """
+    extracted = extract_resume(source, filename)
+    if not extracted:
+        return None
+    sections = section_cache.get_or_extract(extracted["sha256"], lambda: segment_resume(extracted["text"]))
+    return {"sha256": extracted["sha256"], "text": extracted["text"], "sections": dict(sections)}
+
@@ -0,0 +1,32 @@
+import os
+import threading
+from typing import List
+
+from dotenv import load_dotenv
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# .env files in precedence order: the working directory, this service, the repository root.
+# Variables already in the environment (e.g. set by Railway) always win.
+ENV_FILES = (
+    os.path.join(os.getcwd(), ".env"),
+    os.path.join(MODULE_DIR, ".env"),
+    os.path.join(MODULE_DIR, "..", "..", ".env"),
+)
+
+_loaded: List[str] = []
+_loaded_once = False
+_lock = threading.Lock()
+
+
+def load_settings() -> List[str]:
+    """Load the .env files once per process; returns the files that were found"""
+    global _loaded_once
+    with _lock:
+        if not _loaded_once:
+            _loaded_once = True
+            for path in dict.fromkeys(os.path.normpath(p) for p in ENV_FILES):
+                if os.path.isfile(path):
+                    load_dotenv(path)
+                    _loaded.append(path)
+        return list(_loaded)
@@ -0,0 +1,194 @@
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, List, Optional
+
+# Minimum level written (DEBUG, INFO, WARNING, ERROR)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# json: one JSON object per line; text: human-readable lines for local runs
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Fraction of high-volume success lines (logged with sample=True) that are kept
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))
+# Records buffered for the writer thread; when full, new records are dropped rather than blocking
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Keyword arguments that logging itself understands; anything else becomes a structured field
+RESERVED = {"exc_info", "stack_info", "stacklevel", "extra"}
+
+# Fields bound for the current request (route, request id, job role, ...); worker threads inherit them
+_context: contextvars.ContextVar[Dict[str, object]] = contextvars.ContextVar("log_context", default={})
+_context_providers: List[Callable[[], Dict[str, object]]] = []
+
+stats = {"dropped": 0, "sampled_out": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        stats[key] += 1
+
+
+@contextmanager
+def bind(**fields):
+    """Add fields to every log line written inside the block (and in work it hands to run_blocking)"""
+    token = _context.set({**_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def add_context_provider(provider: Callable[[], Dict[str, object]]) -> None:
+    """Register a callable whose fields (e.g. the current trace id) are added to each record"""
+    _context_providers.append(provider)
+
+
+def current_context() -> Dict[str, object]:
+    context = dict(_context.get())
+    for provider in _context_providers:
+        context.update(provider())
+    return context
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """
+    log.info("questions generated", count=10, source="openrouter_ai") writes the
+    keyword arguments as fields; info/warning/error all go through log().
+    sample=True marks a high-volume success line that is kept with
+    probability LOG_SAMPLE_RATE.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__(logger, {})
+
+    def log(self, level, msg, *args, sample: bool = False, **kwargs):
+        if not self.isEnabledFor(level):
+            return
+        if sample and random.random() >= LOG_SAMPLE_RATE:
+            _count("sampled_out")
+            return
+        fields = {k: kwargs.pop(k) for k in list(kwargs) if k not in RESERVED}
+        kwargs["extra"] = {**kwargs.get("extra", {}), "fields": fields}
+        self.logger.log(level, msg, *args, **kwargs)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    return StructuredLogger(logging.getLogger(name))
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Runs in the calling thread: captures the request context, renders the
+    message and exception text, and hands the record to the writer thread
+    without waiting. A full queue drops the record instead of blocking.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.context = current_context()
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _count("dropped")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, request context and fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+            **getattr(record, "context", {}),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Readable lines for local runs: time, level, logger, message, then key=value fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {**getattr(record, "context", {}), **getattr(record, "fields", {})}
+        line = f"{self.formatTime(record)} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line + (f"\n{record.exc_text}" if record.exc_text else "")
+
+
+class StdoutHandler(logging.StreamHandler):
+    """Writes to whatever sys.stdout is at the time (test runners swap it)"""
+
+    def __init__(self):
+        super().__init__()
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+_listener: Optional[QueueListener] = None
+_queue: Optional[queue.Queue] = None
+_configure_lock = threading.Lock()
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT) -> None:
+    """Route the root logger through a bounded queue to a single writer thread (idempotent)"""
+    global _listener, _queue
+    with _configure_lock:
+        if _listener is not None:
+            return
+        output = StdoutHandler()
+        output.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+        _queue = queue.Queue(LOG_QUEUE_SIZE)
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(ContextQueueHandler(_queue))
+        root.setLevel(level)
+        _listener = QueueListener(_queue, output, respect_handler_level=False)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Write out what is still queued and stop the writer thread"""
+    global _listener
+    with _configure_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def get_stats() -> dict:
+    with _stats_lock:
+        return {
+            **stats,
+            "queued": _queue.qsize() if _queue is not None else 0,
+            "level": LOG_LEVEL,
+            "format": LOG_FORMAT,
+            "sample_rate": LOG_SAMPLE_RATE,
+        }
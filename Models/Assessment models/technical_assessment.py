@@ -1,11 +1,17 @@
 import os
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from dotenv import load_dotenv
-from llm_provider import get_chat_model
+from settings import load_settings
+from llm_provider import get_chat_model, invoke_model
+from question_stream import stream_question_blocks
+from mcq_repair import avoid_clause, is_complete
+from batch_generation import format_areas, generate_mcq_batches, plan_batches
+from structured_logging import get_logger
 
 # Load environment variables
-load_dotenv()
+load_settings()
+
+log = get_logger(__name__)
 
 model = get_chat_model()
 
@@ -17,14 +23,7 @@ technical_assessment_template = """
 You are an expert technical interviewer. Generate {num_questions} technical multiple-choice questions for {job_role} position with {difficulty} difficulty level.
 
 Cover these technical areas:
-1. Programming fundamentals
-2. Data structures and algorithms
-3. System design
-4. Database concepts
-5. Web technologies
-6. DevOps and tools
-7. Problem-solving
-8. Best practices
+{areas}
 
 For {difficulty} difficulty:
 - Easy: Basic concepts, fundamental knowledge
@@ -43,40 +42,63 @@ Explanation: [Brief technical explanation]
 Make questions relevant to {job_role} and {difficulty} difficulty level.
 """
 
+# Topic areas; large requests split these across parallel batches
+TECHNICAL_AREAS = [
+    "Programming fundamentals",
+    "Data structures and algorithms",
+    "System design",
+    "Database concepts",
+    "Web technologies",
+    "DevOps and tools",
+    "Problem-solving",
+    "Best practices",
+]
+
 technical_assessment_prompt = PromptTemplate(
     input_variables=["job_role", "num_questions", "difficulty"],
+    partial_variables={"areas": format_areas(TECHNICAL_AREAS)},
     template=technical_assessment_template
 )
 
 def generate_technical_mcqs(job_role: str = "Software Engineer", num_questions: int = 10, difficulty: str = "moderate") -> dict:
-    print(f"🔄 Generating {num_questions} technical questions for {job_role} ({difficulty} difficulty)")
+    log.info("Generating technical questions", job_role=job_role, num_questions=num_questions, difficulty=difficulty, sample=True)
     
     try:
         if model:
             # Try AI generation first
             try:
-                prompt = technical_assessment_prompt.format(
-                    job_role=job_role, 
-                    num_questions=num_questions, 
-                    difficulty=difficulty
-                )
-                result = model.invoke(prompt)
+                def complete(count, areas, existing):
+                    prompt = technical_assessment_prompt.format(
+                        job_role=job_role, 
+                        num_questions=count, 
+                        difficulty=difficulty,
+                        areas=format_areas(areas)
+                    )
+                    # Follow-ups for broken/missing questions are never cached, and only
+                    # complete batches are, so a cache hit never triggers a repair call
+                    if existing:
+                        return invoke_model(model, prompt + avoid_clause(existing), endpoint="technical_assessment_repair")
+                    return invoke_model(model, prompt, endpoint="technical_assessment", validate=lambda content: is_complete(content, count))
+
+                # Large requests run as parallel batches; bad questions are repaired, not regenerated
+                questions, report = generate_mcq_batches(num_questions, TECHNICAL_AREAS, complete)
                 
-                print("✅ AI questions generated successfully!")
+                log.info("AI questions generated", questions=len(questions), repaired=report["repaired"], sample=True)
                 
+                # Same shape as the fallback questions; raw text only if parsing found nothing
                 return {
-                    "questions": result.content,
+                    "questions": questions,
                     "source": "openrouter_ai",
                     "job_role": job_role,
-                    "total_questions": num_questions,
+                    "total_questions": len(questions) if isinstance(questions, list) else num_questions,
                     "difficulty": difficulty,
+                    "repaired_questions": report["repaired"],
                     "status": "success"
                 }
             except Exception as ai_error:
-                print(f"❌ AI generation failed: {ai_error}")
-                print("🔄 Falling back to predefined questions...")
+                log.warning("AI generation failed, using predefined questions", error=str(ai_error))
         else:
-            print("⚠️ No model available, using fallback questions...")
+            log.warning("No model available, using fallback questions")
         
         # Fallback response with structured data  
         fallback_questions = [
@@ -186,6 +208,21 @@ def generate_technical_mcqs(job_role: str = "Software Engineer", num_questions:
             "status": "error"
         }
 
+async def stream_technical_mcqs(job_role: str = "Software Engineer", num_questions: int = 10, difficulty: str = "moderate"):
+    """Stream technical MCQs, yielding each question as soon as it is complete"""
+    log.info("Streaming technical questions", job_role=job_role, num_questions=num_questions, difficulty=difficulty, sample=True)
+    # Same batches as the non-streaming path; their questions are interleaved as they complete
+    prompts = [
+        technical_assessment_prompt.format(job_role=job_role, num_questions=count, difficulty=difficulty, areas=format_areas(focus))
+        for count, focus in plan_batches(num_questions, TECHNICAL_AREAS)
+    ]
+    async for event in stream_question_blocks(
+        model, prompts, "mcq",
+        fallback=lambda: generate_technical_mcqs(job_role, num_questions, difficulty),
+        metadata={"job_role": job_role, "difficulty": difficulty}
+    ):
+        yield event
+
 if __name__ == "__main__":
     result = generate_technical_mcqs("Software Engineer", 5)
     print(result)
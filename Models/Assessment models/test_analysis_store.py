@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from analysis_store import AnalysisStore, incremental_report_parts
+from resume_report import PART_FAILED, REPORT_PARTS
+from resume_sections import segment_resume
+
+RESUME = """Jane Doe
+jane@example.com
+Summary
+Machine learning engineer focused on fraud detection
+Education
+B.Tech Computer Science
+Experience
+ML Intern at Acme
+Skills
+Python, PyTorch
+Projects
+- Built a fraud detection model
+Certifications
+AWS Certified Cloud Practitioner
+"""
+
+
+def upload(text: str) -> dict:
+    return {"sha256": str(hash(text)), "text": text, "sections": segment_resume(text)}
+
+
+def recording_complete(calls: list, fail: str = None):
+    def complete(prompt: str) -> str:
+        calls.append(prompt)
+        if fail and fail in prompt:
+            raise RuntimeError("rate limited")
+        return f"part {len(calls)}"
+    return complete
+
+
+def test_reupload_regenerates_only_parts_that_read_changed_sections():
+    store = AnalysisStore()
+    calls = []
+    first, changes = incremental_report_parts(recording_complete(calls), "user-1", "resume.pdf", upload(RESUME), "ML Engineer", store)
+    assert len(calls) == len(REPORT_PARTS) and not changes["previous_analysis"]
+
+    # Same content re-flowed with extra whitespace: nothing to regenerate
+    calls.clear()
+    same, changes = incremental_report_parts(recording_complete(calls), "user-1", "resume.pdf", upload(RESUME.replace("\n", "  \n")), "ML Engineer", store)
+    assert calls == [] and same == first and changes["changed_sections"] == []
+
+    # Only the certifications changed, under a new file name
+    edited = RESUME.replace("AWS Certified Cloud Practitioner", "AWS Certified Machine Learning Specialty")
+    calls.clear()
+    second, changes = incremental_report_parts(recording_complete(calls), "user-1", "resume (1).pdf", upload(edited), "ML Engineer", store)
+    assert changes["changed_sections"] == ["Certifications"]
+    assert {"profile", "education", "skills", "projects"} <= set(changes["parts_reused"])
+    assert "achievements" in changes["parts_generated"] and len(calls) == len(changes["parts_generated"])
+    assert all(second[key] == first[key] for key in changes["parts_reused"])
+    assert store.get_stats()["parts_reused"] == len(REPORT_PARTS) + len(changes["parts_reused"])
+
+
+def test_failed_parts_are_retried_and_other_users_do_not_share_results():
+    store = AnalysisStore()
+    calls = []
+    parts, _ = incremental_report_parts(recording_complete(calls, fail="Categorize skills"), "user-1", "cv", upload(RESUME), "ML Engineer", store)
+    assert parts["skills"] == PART_FAILED
+
+    calls.clear()
+    _, changes = incremental_report_parts(recording_complete(calls), "user-1", "cv", upload(RESUME), "ML Engineer", store)
+    assert changes["parts_generated"] == ["skills"]
+
+    calls.clear()
+    _, changes = incremental_report_parts(recording_complete(calls), "user-2", "cv", upload(RESUME), "ML Engineer", store)
+    assert len(calls) == len(REPORT_PARTS) and changes["parts_reused"] == []
+
+
+def test_analyze_resume_reuses_parts_in_the_default_configuration(monkeypatch):
+    import resume_optimizer
+
+    calls = []
+    monkeypatch.setattr(resume_optimizer, "model", object())
+    monkeypatch.setattr(resume_optimizer, "invoke_model", lambda model, prompt, endpoint=None: recording_complete(calls)(prompt))
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "Krishil Agrawal Resume - ML.pdf")
+
+    assert not resume_optimizer.RESUME_ANALYSIS_PARALLEL
+    resume_optimizer.analyze_resume(path, "ML Engineer", user_id="default-config-user")
+    assert len(calls) == len(REPORT_PARTS)
+
+    # Re-uploading the same resume reuses every part without a model call
+    calls.clear()
+    report = resume_optimizer.analyze_resume(path, "ML Engineer", user_id="default-config-user")
+    assert calls == [] and "RESUME ANALYSIS REPORT" in report
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+import asyncio
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import re
+import json
+import tempfile
+import httpx
+import assessment_api
+import technical_assessment
+import ats_score
+from batch_generation import MCQ_MAX_PARALLEL_BATCHES, plan_batches
+from extraction_sandbox import ExtractionTimeout
+
+SLOW_CALL_SECONDS = 0.5
+CONCURRENT_REQUESTS = 8
+
+
+def slow_generator(job_role: str = "Software Engineer", num_questions: int = 10, difficulty: str = "moderate") -> dict:
+    # Stands in for a blocking model.invoke(...) round trip
+    time.sleep(SLOW_CALL_SECONDS)
+    return {"questions": [], "job_role": job_role, "total_questions": num_questions, "status": "success"}
+
+
+async def fire_concurrent_requests():
+    transport = httpx.ASGITransport(app=assessment_api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def technical():
+            return await client.post("/api/assessment/technical_assessment/", data={"job_role": "Software Engineer", "num_questions": "5"})
+
+        async def health():
+            # Give the slow requests a head start so they are all in flight
+            await asyncio.sleep(SLOW_CALL_SECONDS / 5)
+            started = time.perf_counter()
+            response = await client.get("/health")
+            return response, time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(technical() for _ in range(CONCURRENT_REQUESTS)), health())
+        return results[:-1], results[-1], time.perf_counter() - started
+
+
+def test_concurrent_requests_do_not_serialize(monkeypatch):
+    monkeypatch.setattr(technical_assessment, "generate_technical_mcqs", slow_generator)
+
+    responses, (health_response, health_latency), elapsed = asyncio.run(fire_concurrent_requests())
+
+    assert all(r.status_code == 200 for r in responses)
+    assert health_response.status_code == 200
+    print(f"{CONCURRENT_REQUESTS} requests x {SLOW_CALL_SECONDS}s took {elapsed:.2f}s, /health answered in {health_latency * 1000:.1f}ms")
+
+    # Serialized execution would take CONCURRENT_REQUESTS * SLOW_CALL_SECONDS
+    assert elapsed < SLOW_CALL_SECONDS * CONCURRENT_REQUESTS / 2
+    # The event loop stays free while generators are blocked
+    assert health_latency < SLOW_CALL_SECONDS / 2
+
+
+class FakeStreamingModel:
+    """Emits a few MCQs in small chunks with a delay per chunk, like a token stream"""
+
+    def __init__(self, num_questions: int, chunk_delay: float):
+        self.text = "".join(
+            f"Q{i}. Question {i}?\nA) one\nB) two\nC) three\nD) four\nCorrect Answer: B\nExplanation: Because {i}.\n\n"
+            for i in range(1, num_questions + 1)
+        )
+        self.chunk_delay = chunk_delay
+
+    async def astream(self, prompt):
+        for start in range(0, len(self.text), 16):
+            await asyncio.sleep(self.chunk_delay)
+            yield type("Chunk", (), {"content": self.text[start:start + 16]})()
+
+
+async def time_first_question():
+    started = time.perf_counter()
+    first_question_at = None
+    async for event in technical_assessment.stream_technical_mcqs(num_questions=5):
+        if first_question_at is None and event["type"] == "question":
+            first_question_at = time.perf_counter() - started
+    return first_question_at, time.perf_counter() - started
+
+
+async def read_stream():
+    transport = httpx.ASGITransport(app=assessment_api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/assessment/technical_assessment/stream/", data={"num_questions": "5"})
+        return response, [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_stream_emits_first_question_before_generation_finishes(monkeypatch):
+    monkeypatch.setattr(technical_assessment, "model", FakeStreamingModel(num_questions=5, chunk_delay=0.01))
+
+    first_question_at, elapsed = asyncio.run(time_first_question())
+    print(f"first question after {first_question_at:.2f}s, full stream {elapsed:.2f}s")
+    assert first_question_at < elapsed / 3
+
+    response, events = asyncio.run(read_stream())
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    questions = [e for e in events if e["type"] == "question"]
+    assert [q["index"] for q in questions] == [1, 2, 3, 4, 5]
+    assert questions[0]["question"] == {"question": "Question 1?", "options": ["one", "two", "three", "four"], "correct_answer": "two", "explanation": "Because 1."}
+    assert events[-1]["type"] == "done" and events[-1]["total_questions"] == 5
+
+
+class BatchCountingModel:
+    """Answers each prompt with the number of questions it asks for, tracking concurrent streams"""
+
+    def __init__(self):
+        self.prompts, self.running, self.peak = [], 0, 0
+
+    async def astream(self, prompt):
+        count = int(re.search(r"Generate (\d+) technical", prompt).group(1))
+        batch = len(self.prompts)
+        self.prompts.append(prompt)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            for i in range(1, count + 1):
+                await asyncio.sleep(0.005)
+                yield type("Chunk", (), {"content": f"Q{i}. Batch {batch} question {i}?\nA) a\nB) b\nC) c\nD) d\nCorrect Answer: A\n\n"})()
+        finally:
+            self.running -= 1
+
+
+def test_large_stream_uses_capped_batches(monkeypatch):
+    model = BatchCountingModel()
+    monkeypatch.setattr(technical_assessment, "model", model)
+
+    async def read():
+        transport = httpx.ASGITransport(app=assessment_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/assessment/technical_assessment/stream/", data={"num_questions": "500"})
+            return [json.loads(line) for line in response.text.splitlines() if line]
+
+    events = asyncio.run(read())
+
+    # Clamped to MAX_QUESTIONS, split like the non-streaming path, and never more than the batch cap at once
+    questions = [e for e in events if e["type"] == "question"]
+    assert len(questions) == assessment_api.MAX_QUESTIONS and events[-1]["total_questions"] == assessment_api.MAX_QUESTIONS
+    assert len(model.prompts) == len(plan_batches(assessment_api.MAX_QUESTIONS, technical_assessment.TECHNICAL_AREAS))
+    assert model.peak == MCQ_MAX_PARALLEL_BATCHES
+    assert [q["index"] for q in questions] == list(range(1, len(questions) + 1))
+
+
+async def upload_resume(path):
+    transport = httpx.ASGITransport(app=assessment_api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        with open(path, "rb") as f:
+            return await client.post("/api/assessment/ats_score/", files={"file": (os.path.basename(path), f, "application/pdf")}, data={"job_role": "ML Engineer"})
+
+
+def test_upload_is_parsed_without_temp_file(monkeypatch):
+    resume = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "Krishil Agrawal Resume - ML.pdf")
+    monkeypatch.setattr(ats_score, "model", None)
+
+    def no_temp_files(*args, **kwargs):
+        raise AssertionError("upload should be parsed in memory")
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", no_temp_files)
+
+    response = asyncio.run(upload_resume(resume))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "fallback" and body["job_role"] == "ML Engineer"
+
+
+def test_extraction_timeout_is_rejected_with_422(monkeypatch):
+    resume = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "Krishil Agrawal Resume - ML.pdf")
+
+    def stuck(*args, **kwargs):
+        raise ExtractionTimeout("extraction did not finish within 30s")
+    monkeypatch.setattr(ats_score, "process_resume_file", stuck)
+
+    response = asyncio.run(upload_resume(resume))
+
+    assert response.status_code == 422
+    assert "30s" in response.json()["error"]
+
+
+if __name__ == "__main__":
+    technical_assessment.generate_technical_mcqs = slow_generator
+    responses, (health_response, health_latency), elapsed = asyncio.run(fire_concurrent_requests())
+    print(f"{CONCURRENT_REQUESTS} requests x {SLOW_CALL_SECONDS}s took {elapsed:.2f}s (serialized: {CONCURRENT_REQUESTS * SLOW_CALL_SECONDS:.2f}s)")
+    print(f"/health answered in {health_latency * 1000:.1f}ms while generations were in flight")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import ats_score
+from ats_engine import KeywordAutomaton, resolve_role, score_resume
+
+SAMPLE_RESUME = """Jane Doe
+jane@example.com | +1 555 123 4567 | github.com/jane
+Education
+B.Tech Computer Science, 2024
+Skills
+Python, PyTorch, scikit-learn, Docker, Git
+Experience
+ML Intern, Acme
+• Built an NLP pipeline with transformers that reduced labelling time by 40%
+• Deployed models with FastAPI on AWS serving 10k users
+Projects
+• Developed a computer vision classifier using OpenCV
+"""
+
+
+def test_automaton_matches_synonyms_on_word_boundaries():
+    automaton = KeywordAutomaton({"go": "Go", "google": "Google", "c++": "C++", "he": "he", "hers": "hers"})
+
+    assert automaton.find("Used C++ and Go at Google; hers, not her") == {"C++": 1, "Go": 1, "Google": 1, "hers": 1}
+    assert automaton.find("golang gopher") == {}
+
+
+def test_resolve_role_prefers_specific_profile():
+    assert resolve_role("ML Engineer") == "machine learning engineer"
+    assert resolve_role("Frontend Developer") == "web developer"
+    assert resolve_role("Chief Happiness Officer") == "software engineer"
+
+
+def test_score_is_deterministic_with_keyword_lists():
+    result = score_resume(SAMPLE_RESUME, "Machine Learning Engineer")
+
+    assert result == score_resume(SAMPLE_RESUME, "Machine Learning Engineer")
+    assert 0 <= result["score"] <= 100
+    assert result["score"] == round(sum(result["score_breakdown"].values()))
+    assert {"Python", "PyTorch", "Scikit-learn", "NLP", "Computer Vision", "Cloud", "APIs"} <= set(result["found_keywords"])
+    assert "TensorFlow" in result["missing_keywords"]
+    assert result["sections_found"] == ["Contact", "Education", "Experience", "Skills", "Projects"]
+    assert set(result["feedback"]) == {"strengths", "weaknesses", "tips"}
+
+
+def test_process_resume_file_falls_back_to_local_score(monkeypatch):
+    monkeypatch.setattr(ats_score, "model", None)
+
+    result = ats_score.calculate_ats_score(SAMPLE_RESUME, "ML Engineer")
+
+    assert result["status"] == "fallback" and result["source"] == "local_ats_engine"
+    assert isinstance(result["score"], int)
+    assert f"{result['score']}/100" in result["analysis"]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+import threading
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from batch_generation import MCQ_MAX_PARALLEL_BATCHES, generate_mcq_batches, plan_batches
+
+AREAS = ["Programming", "Algorithms", "System design", "Databases", "Web", "DevOps"]
+
+
+def make_mcqs(prefix: str, count: int) -> str:
+    return "\n".join(
+        f"Q{i}. {prefix} question {i}?\nA) a\nB) b\nC) c\nD) d\nCorrect Answer: A\nExplanation: Because.\n"
+        for i in range(1, count + 1)
+    )
+
+
+def test_plan_splits_evenly_with_distinct_focus():
+    batches = plan_batches(32, AREAS, batch_size=10)
+
+    assert [count for count, _ in batches] == [8, 8, 8, 8]
+    assert batches[0][1] == ["Programming", "Web"]
+    assert batches[1][1] == ["Algorithms", "DevOps"]
+    assert batches[3][1] == ["Databases"]
+    assert plan_batches(7, AREAS, batch_size=10) == [(7, AREAS)]
+
+
+def test_batches_run_concurrently():
+    def complete(count, areas, existing):
+        time.sleep(0.3)
+        return make_mcqs(areas[0], count)
+
+    started = time.perf_counter()
+    questions, report = generate_mcq_batches(30, AREAS, complete)
+    elapsed = time.perf_counter() - started
+
+    assert len(questions) == 30 and report["batches"] == 3
+    # Sequential generation would take 0.9s
+    assert elapsed < 0.6
+
+
+def test_one_request_keeps_at_most_max_parallel_batches_in_flight():
+    lock, running, peak = threading.Lock(), [0], [0]
+
+    def complete(count, areas, existing):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return make_mcqs(f"{areas[0]} {time.perf_counter_ns()}", count)
+
+    questions, report = generate_mcq_batches(100, AREAS, complete)
+
+    assert report["batches"] == 10 and len(questions) == 100
+    assert peak[0] == MCQ_MAX_PARALLEL_BATCHES
+
+
+def test_duplicates_across_batches_are_dropped_and_refilled():
+    calls = []
+
+    def complete(count, areas, existing):
+        calls.append((count, len(existing)))
+        if existing:
+            return make_mcqs("Repair", count)
+        # Every batch returns the same questions
+        return make_mcqs("Same", count)
+
+    questions, report = generate_mcq_batches(20, AREAS, complete)
+
+    assert len(questions) == 20
+    assert len({q["question"] for q in questions}) == 20
+    assert report["repaired"] == 10
+    assert calls[-1] == (10, 10)
+
+
+
+def test_valid_copy_replaces_an_invalid_duplicate_from_another_batch():
+    repairs = []
+
+    def complete(count, areas, existing):
+        if existing:
+            repairs.append(count)
+            return make_mcqs("Repair", count)
+        if "Programming" in areas:
+            # The same questions as the other batch, but broken: three options each
+            return make_mcqs("Shared", count).replace("D) d\n", "")
+        return make_mcqs("Shared", count)
+
+    questions, report = generate_mcq_batches(20, AREAS, complete)
+
+    # The broken copies arrive first, yet the well-formed ones are kept
+    assert report["invalid"] == 0 and repairs == [10]
+    assert len(questions) == 20 and all(len(q["options"]) == 4 for q in questions)
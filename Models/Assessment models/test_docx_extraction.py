@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import io
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import docx  # type: ignore
+from docx_extraction import extract_docx
+from resume_extraction import extract_resume
+from resume_sections import segment_resume
+
+
+def build_resume() -> bytes:
+    document = docx.Document()
+    section = document.sections[0]
+    section.header.paragraphs[0].text = "Jane Doe | jane@example.com"
+    section.footer.paragraphs[0].text = "References available on request"
+    document.add_heading("Experience", level=1)
+    document.add_paragraph("ML Intern at Acme: cut inference latency by 40%")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Skills"
+    table.cell(0, 1).text = "Python, PyTorch"
+    table.cell(1, 0).text = "Tools"
+    table.cell(1, 1).text = "Docker\nGit"
+    paragraph = document.add_paragraph("Built a ")
+    paragraph.add_run("fraud detection").bold = True
+    paragraph.add_run(" model")
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+def test_headers_tables_and_footers_in_reading_order():
+    data = build_resume()
+    result = extract_docx(data)
+
+    assert result["text"].splitlines() == [
+        "Jane Doe | jane@example.com",
+        "Experience",
+        "ML Intern at Acme: cut inference latency by 40%",
+        "Skills",
+        "Python, PyTorch",
+        "Tools",
+        "Docker",
+        "Git",
+        "Built a fraud detection model",
+        "References available on request",
+    ]
+    assert result["header_lines"] == 1 and result["footer_lines"] == 1
+
+    # python-docx's paragraph view sees only the body paragraphs
+    paragraphs = [p.text for p in docx.Document(io.BytesIO(data)).paragraphs if p.text]
+    assert "Python, PyTorch" not in paragraphs
+    assert all(p in result["text"] for p in paragraphs)
+
+
+def test_table_skills_reach_the_section_segmenter():
+    sections = segment_resume(extract_resume(build_resume(), "resume.docx")["text"])
+    assert "Python, PyTorch" in sections["Skills"]
+    assert sections["Header"] == "Jane Doe | jane@example.com"
+
+
+def test_corrupt_docx_yields_empty_text():
+    assert extract_resume(b"PK\x03\x04 not really a zip", "broken.docx")["text"] == ""
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+
+import pytest
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from extraction_sandbox import ExtractionCrashed, ExtractionFailed, ExtractionSandbox, ExtractionTimeout
+
+
+# Jobs run in spawned workers, so they must be module-level functions
+def worker_pid() -> int:
+    return os.getpid()
+
+
+def hang() -> None:
+    time.sleep(60)
+
+
+def crash() -> None:
+    os._exit(3)
+
+
+def allocate(megabytes: int) -> int:
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+def corrupt() -> None:
+    raise ValueError("not a PDF")
+
+
+@pytest.fixture
+def sandbox():
+    sandbox = ExtractionSandbox(workers=1, timeout=3, memory_limit_mb=256, max_jobs=2)
+    yield sandbox
+    sandbox.shutdown()
+
+
+def test_worker_is_reused_then_recycled(sandbox):
+    first, second, third = (sandbox.run(worker_pid) for _ in range(3))
+
+    assert first == second != third != os.getpid()
+    assert sandbox.get_stats()["recycled"] == 1
+
+
+def test_warm_up_spawns_workers_before_first_job():
+    sandbox = ExtractionSandbox(workers=2, timeout=10)
+    try:
+        assert sandbox.warm_up() == 2
+        assert sandbox.get_stats()["idle_workers"] == 2
+        assert sandbox.run(worker_pid) != os.getpid()
+        assert sandbox.get_stats()["started"] == 2
+    finally:
+        sandbox.shutdown()
+
+
+def test_timeout_kills_worker_and_pool_recovers(sandbox):
+    sandbox.timeout = 0.5
+    hung_pid = sandbox.run(worker_pid)
+    with pytest.raises(ExtractionTimeout):
+        sandbox.run(hang)
+
+    sandbox.timeout = 3
+    assert sandbox.run(worker_pid) != hung_pid
+    assert sandbox.get_stats()["timeouts"] == 1
+
+
+def test_crash_and_memory_cap_are_reported(sandbox):
+    with pytest.raises(ExtractionCrashed, match="code 3"):
+        sandbox.run(crash)
+    with pytest.raises(ExtractionCrashed, match="memory limit"):
+        sandbox.run(allocate, 1024)
+
+    assert sandbox.run(allocate, 16) == 16 * 1024 * 1024
+    assert sandbox.get_stats()["crashes"] == 2
+
+
+def test_ordinary_errors_keep_the_worker(sandbox):
+    pid = sandbox.run(worker_pid)
+    with pytest.raises(ExtractionFailed, match="ValueError: not a PDF"):
+        sandbox.run(corrupt)
+
+    assert sandbox.run(worker_pid) == pid
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import asyncio
+import subprocess
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import assessment_api
+from generator_registry import GeneratorRegistry
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_api_import_leaves_heavy_modules_unloaded():
+    heavy = ["langchain_core", "langchain_openai", "pdfplumber", "docx", "numpy", "technical_assessment"]
+    code = f"import sys, assessment_api; print([m for m in {heavy!r} if m in sys.modules])"
+    output = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == "[]"
+
+
+def test_modules_load_on_first_use_and_load_all_loads_the_rest():
+    registry = GeneratorRegistry(["prompt_compaction", "mcq_parser"])
+    count_tokens = registry.lazy("prompt_compaction", "count_tokens")
+    assert registry.get_stats()["pending"] == ["prompt_compaction", "mcq_parser"]
+
+    assert count_tokens("four") == 1
+    assert list(registry.get_stats()["loaded"]) == ["prompt_compaction"]
+
+    assert registry.load_all() == []
+    assert registry.get_stats()["pending"] == []
+
+
+def test_failed_import_answers_503(monkeypatch):
+    monkeypatch.setattr(assessment_api, "generators", GeneratorRegistry())
+    monkeypatch.setitem(sys.modules, "communication_test", None)
+
+    async def post():
+        transport = httpx.ASGITransport(app=assessment_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/assessment/communication_test/", data={"num_questions": "3"})
+            health = await client.get("/health")
+            return response, health
+
+    response, health = asyncio.run(post())
+    assert response.status_code == 503
+    assert response.json()["import_errors"][0].startswith("communication_test:")
+    assert health.json()["imports_successful"] is False
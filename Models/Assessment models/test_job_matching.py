@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import time
+import random
+import itertools
+import sqlite3
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from job_matching import JobIndex, SavedJobsSync
+from resume_ranking import tokenize
+from resume_extraction import extract_resume_text
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# saved_jobs_table.sql with SQLite types
+SAVED_JOBS_SCHEMA = """
+CREATE TABLE saved_jobs (
+  id TEXT PRIMARY KEY,
+  user_id TEXT,
+  job_data TEXT NOT NULL,
+  search_params TEXT,
+  created_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+  updated_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+)
+"""
+
+JOBS = {
+    "ml": {"title": "Machine Learning Engineer", "company": "Acme AI", "url": "https://jobs.example/ml",
+           "description": "<p>Train deep learning models with <b>PyTorch</b> and TensorFlow; NLP, computer vision, Python, pandas.</p>"},
+    "web": {"title": "Frontend Developer", "company": "Webby", "url": "https://jobs.example/web",
+            "description": "Build React and Next.js interfaces with TypeScript, Tailwind CSS, REST APIs and some Python tooling."},
+    "sales": {"title": "Account Executive", "company": "SellCo", "url": "https://jobs.example/sales",
+              "description": "Own the sales pipeline, negotiate contracts and grow enterprise accounts."},
+}
+
+
+def ml_resume() -> str:
+    return extract_resume_text(os.path.join(DATA_DIR, "Krishil Agrawal Resume - ML.pdf"))
+
+
+def test_sync_follows_inserts_updates_and_deletes(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute(SAVED_JOBS_SCHEMA)
+    for job_id, job in JOBS.items():
+        db.execute("INSERT INTO saved_jobs (id, user_id, job_data) VALUES (?, ?, ?)", (job_id, "user-1", json.dumps(job)))
+    db.commit()
+
+    index = JobIndex()
+    index.add("pushed", JOBS["web"], "user-2")
+    sync = SavedJobsSync(index, path, interval=0)
+    assert sync.sync() == 3
+    matches = index.search(ml_resume(), top_k=2)
+    assert [m["job_id"] for m in matches][0] == "ml"
+    assert "python" in matches[0]["matched_terms"]
+
+    # The sales posting is rewritten as an ML role; the ML posting is deleted
+    time.sleep(0.01)
+    db.execute("UPDATE saved_jobs SET job_data = ?, updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id = 'sales'",
+               (json.dumps({**JOBS["ml"], "url": "https://jobs.example/ml-2"}),))
+    db.execute("DELETE FROM saved_jobs WHERE id = 'ml'")
+    db.commit()
+    assert sync.sync() == 1
+    assert index.search(ml_resume(), top_k=1)[0]["job_id"] == "sales"
+    # Jobs pushed through the API are not the table's to delete
+    assert sorted(index.job_ids()) == ["pushed", "sales", "web"]
+    assert index.get_stats()["tombstones"] == 2
+
+
+def test_sync_skips_bad_rows_and_rows_sharing_a_timestamp(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute(SAVED_JOBS_SCHEMA)
+    stamp = "2026-01-01 00:00:00.000"
+    rows = [("bad-json", "{not json"), ("bad-list", "[1, 2]"), ("ml", json.dumps(JOBS["ml"]))]
+    db.executemany("INSERT INTO saved_jobs (id, job_data, updated_at) VALUES (?, ?, ?)", [(i, d, stamp) for i, d in rows])
+    db.commit()
+
+    index = JobIndex()
+    sync = SavedJobsSync(index, path, interval=0)
+    assert sync.sync() == 1 and index.job_ids() == ["ml"]
+
+    # A row written later with the same updated_at is still picked up; already applied rows are not redone
+    db.execute("INSERT INTO saved_jobs (id, job_data, updated_at) VALUES (?, ?, ?)", ("web", json.dumps(JOBS["web"]), stamp))
+    db.commit()
+    assert sync.sync() == 1
+    assert sorted(index.job_ids()) == ["ml", "web"]
+    assert sync.sync() == 0
+
+
+def test_user_filter_and_duplicate_postings():
+    index = JobIndex()
+    index.add("a", JOBS["ml"], "user-1")
+    index.add("b", JOBS["ml"], "user-2")
+    index.add("c", JOBS["web"], "user-2")
+
+    assert [m["job_id"] for m in index.search(ml_resume(), top_k=5)] == ["a", "c"]
+    assert [m["job_id"] for m in index.search(ml_resume(), top_k=5, user_id="user-2")] == ["b", "c"]
+    assert index.search(ml_resume(), user_id="nobody") == []
+
+
+def test_updates_do_not_accumulate_tombstones():
+    index = JobIndex()
+    index.add("web", JOBS["web"])
+    for version in range(5000):
+        index.add("ml", {**JOBS["ml"], "title": f"Machine Learning Engineer {version}"})
+
+    stats = index.get_stats()
+    assert len(index) == 2 and stats["rebuilds"] >= 1
+    assert stats["tombstones"] <= 1024 and len(index._ids) <= 1026
+    assert index.search(ml_resume(), top_k=1)[0]["job_id"] == "ml"
+
+
+def test_top_k_under_100ms_at_tens_of_thousands_of_jobs():
+    # Job text drawn from the resume's own terms plus filler, so queries hit long posting lists
+    resume = ml_resume()
+    rng = random.Random(3)
+    vocabulary = sorted(set(tokenize(resume))) + [f"term{i}" for i in range(5000)]
+    rng.shuffle(vocabulary)
+    cumulative = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    jobs = [
+        (f"job-{i}", {"title": " ".join(rng.choices(vocabulary, cum_weights=cumulative, k=3)),
+                      "description": " ".join(rng.choices(vocabulary, cum_weights=cumulative, k=150))}, None)
+        for i in range(30000)
+    ]
+    index = JobIndex()
+    started = time.perf_counter()
+    index.add_many(jobs)
+    print(f"Indexed 30000 jobs in {time.perf_counter() - started:.1f}s")
+
+    index.search(resume)  # builds the posting arrays
+    started = time.perf_counter()
+    for _ in range(10):
+        matches = index.search(resume, top_k=20)
+    elapsed = (time.perf_counter() - started) / 10
+
+    print(f"Top-20 query over 30000 jobs: {elapsed * 1000:.1f} ms")
+    assert len(matches) == 20 and elapsed < 0.1
+
+    # Adding one job only invalidates its own terms
+    index.add("new", JOBS["ml"])
+    started = time.perf_counter()
+    assert index.search(resume, top_k=1)[0]["job_id"] == "new"
+    assert time.perf_counter() - started < 0.1
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import llm_provider
+from llm_cache import LLMResponseCache
+
+
+class CountingModel:
+    model_name = "test-model"
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return type("Message", (), {"content": f"completion {self.calls} for {prompt}"})()
+
+
+def test_serves_random_variant_once_full(tmp_path, monkeypatch):
+    cache = LLMResponseCache(path=str(tmp_path / "cache.sqlite3"), variants=3)
+    monkeypatch.setattr(llm_provider, "_response_cache", cache)
+    model = CountingModel()
+
+    results = {llm_provider.invoke_model(model, "prompt", endpoint="technical_assessment") for _ in range(20)}
+
+    # The first three calls fill the variants, the rest are served from them
+    assert model.calls == 3
+    assert results == {f"completion {i} for prompt" for i in (1, 2, 3)}
+    stats = cache.get_stats()
+    assert stats["misses"] == 3 and stats["hits"] == 17 and stats["stores"] == 3
+
+
+def test_endpoints_are_opt_in(tmp_path, monkeypatch):
+    cache = LLMResponseCache(path=str(tmp_path / "cache.sqlite3"), variants=1)
+    monkeypatch.setattr(llm_provider, "_response_cache", cache)
+    model = CountingModel()
+
+    for _ in range(3):
+        llm_provider.invoke_model(model, "resume text", endpoint="resume_optimize")
+
+    assert model.calls == 3
+    assert cache.get_stats()["stores"] == 0
+
+
+def test_only_validated_completions_are_cached(tmp_path, monkeypatch):
+    cache = LLMResponseCache(path=str(tmp_path / "cache.sqlite3"), variants=1)
+    monkeypatch.setattr(llm_provider, "_response_cache", cache)
+    model = CountingModel()
+    complete = lambda content: not content.startswith("completion 1 ")
+
+    # The first completion fails validation, so it is neither stored nor served later
+    results = [llm_provider.invoke_model(model, "prompt", endpoint="technical_assessment", validate=complete) for _ in range(3)]
+
+    assert results == ["completion 1 for prompt"] + ["completion 2 for prompt"] * 2
+    assert model.calls == 2 and cache.get_stats()["stores"] == 1
+
+
+def test_disk_store_survives_restart_and_expires(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    LLMResponseCache(path=path, variants=1).add("key", "technical_assessment", "stored")
+
+    # A fresh instance (new process) reads the completion back from SQLite
+    reopened = LLMResponseCache(path=path, variants=1)
+    assert reopened.get("key") == "stored"
+    assert reopened.get_stats()["disk_hits"] == 1
+
+    expired = LLMResponseCache(path=path, variants=1, ttl=0.01)
+    time.sleep(0.02)
+    assert expired.get("key") is None
+
+
+def test_preload_fills_memory_from_disk(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = LLMResponseCache(path=path, variants=1)
+    for i in range(3):
+        writer.add(f"key{i}", "technical_assessment", f"stored {i}")
+
+    reopened = LLMResponseCache(path=path, variants=1, memory_entries=2)
+    assert reopened.preload() == 2
+    assert reopened.get("key2") == "stored 2"
+    assert reopened.get_stats()["memory_hits"] == 1
+
+
+def test_size_based_eviction_drops_least_recently_used(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "cache.sqlite3"), variants=1, memory_entries=1, disk_entries=2)
+    cache.add("a", "technical_assessment", "A")
+    cache.add("b", "technical_assessment", "B")
+    time.sleep(0.01)
+    assert cache.get("a") == "A"
+    cache.add("c", "technical_assessment", "C")
+
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+
+
+def test_add_after_expiry_replaces_unpurged_variants(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "cache.sqlite3"), variants=2, ttl=0.05)
+    cache.add("key", "technical_assessment", "old 1")
+    cache.add("key", "technical_assessment", "old 2")
+    time.sleep(0.06)
+
+    # No get() in between to purge the expired rows
+    cache.add("key", "technical_assessment", "new 1")
+    cache.add("key", "technical_assessment", "new 2")
+    assert cache.get("key") in {"new 1", "new 2"}
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mcq_parser import IncrementalMCQParser, parse_mcqs
+from mcq_repair import repair_questions, validate_question
+
+SAMPLE_OUTPUT = """Here are your questions:
+
+**Q1.** What is the time complexity of binary search?
+A) O(1)
+B) O(log n)
+C) O(n)
+D) O(n²)
+**Correct Answer:** B
+**Explanation:** The search space halves
+on every step.
+
+Q2. Which data structure is LIFO
+in nature?
+A. Queue
+B. Stack
+C. Heap
+D. Tree
+Correct Answer: B) Stack
+Explanation: A stack pops the most recent item first.
+Q3: Which option is the correct answer text?
+(A) alpha
+(B) beta
+(C) gamma
+(D) delta
+Correct Answer: gamma
+"""
+
+
+def test_parses_model_output_into_fallback_shape():
+    questions = parse_mcqs(SAMPLE_OUTPUT)
+
+    assert len(questions) == 3
+    assert questions[0] == {
+        "question": "What is the time complexity of binary search?",
+        "options": ["O(1)", "O(log n)", "O(n)", "O(n²)"],
+        "correct_answer": "O(log n)",
+        "explanation": "The search space halves on every step.",
+    }
+    assert questions[1]["question"] == "Which data structure is LIFO in nature?"
+    assert questions[1]["correct_answer"] == "Stack"
+    assert questions[2]["correct_answer"] == "gamma"
+    assert questions[2]["explanation"] == ""
+
+
+def test_incremental_parsing_matches_batch_for_any_chunking():
+    expected = parse_mcqs(SAMPLE_OUTPUT)
+    for size in (1, 3, 16, 1000):
+        parser = IncrementalMCQParser()
+        questions = []
+        for start in range(0, len(SAMPLE_OUTPUT), size):
+            questions.extend(parser.feed(SAMPLE_OUTPUT[start:start + size]))
+        questions.extend(parser.close())
+        assert questions == expected
+
+
+def test_question_is_emitted_once_its_explanation_block_ends():
+    parser = IncrementalMCQParser()
+    assert parser.feed("Q1. First?\nA) a\nB) b\nC) c\nD) d\nCorrect Answer: A\nExplanation: Because.\n") == []
+    completed = parser.feed("\n")
+    assert [q["question"] for q in completed] == ["First?"]
+
+
+def test_missing_answer_letter_leaves_correct_answer_empty():
+    questions = parse_mcqs("Q1. Broken?\nA) a\nB) b\nCorrect Answer: D\n")
+    assert questions[0]["options"] == ["a", "b"]
+    assert questions[0]["correct_answer"] == ""
+
+
+def make_mcqs(start: int, count: int) -> str:
+    return "\n".join(
+        f"Q{i}. Question number {i}?\nA) w{i}\nB) x{i}\nC) y{i}\nD) z{i}\nCorrect Answer: C\nExplanation: Reason {i}.\n"
+        for i in range(start, start + count)
+    )
+
+
+def test_repair_only_requests_the_broken_questions():
+    # 20 questions, two of them malformed (missing options / answer)
+    text = make_mcqs(1, 18) + "\nQ19. Missing options?\nA) only one\nCorrect Answer: A\n\nQ20. No answer?\nA) a\nB) b\nC) c\nD) d\n"
+    calls = []
+
+    def regenerate(count, existing):
+        calls.append((count, len(existing)))
+        return make_mcqs(100, count)
+
+    questions, report = repair_questions(parse_mcqs(text), 20, regenerate)
+
+    assert calls == [(2, 18)]
+    assert len(questions) == 20
+    assert report == {"invalid": 2, "requested": 2, "repaired": 2, "rounds": 1}
+    assert [q["question"] for q in questions[-2:]] == ["Question number 100?", "Question number 101?"]
+    assert all(not validate_question(q) for q in questions)
+
+
+def test_repair_drops_duplicates_and_fills_short_responses():
+    text = make_mcqs(1, 3) + "\n" + make_mcqs(1, 1)
+
+    questions, report = repair_questions(parse_mcqs(text), 5, lambda count, existing: make_mcqs(1, 1) + make_mcqs(50, count))
+
+    assert [q["question"] for q in questions] == [f"Question number {i}?" for i in (1, 2, 3, 50, 51)]
+    assert report["invalid"] == 1 and report["repaired"] == 2
+
+
+class ScriptedModel:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return type("Message", (), {"content": self.responses.pop(0)})()
+
+
+def test_technical_generator_sends_targeted_follow_up(tmp_path, monkeypatch):
+    import llm_provider
+    import technical_assessment
+    from llm_cache import LLMResponseCache
+
+    monkeypatch.setattr(llm_provider, "_response_cache", LLMResponseCache(path=str(tmp_path / "cache.sqlite3")))
+    model = ScriptedModel(make_mcqs(1, 4), make_mcqs(10, 1))
+    monkeypatch.setattr(technical_assessment, "model", model)
+
+    result = technical_assessment.generate_technical_mcqs("Software Engineer", 5, "moderate")
+
+    assert result["total_questions"] == 5 and result["repaired_questions"] == 1
+    assert "Generate 1 technical multiple-choice questions" in model.prompts[1]
+    assert "- Question number 4?" in model.prompts[1]
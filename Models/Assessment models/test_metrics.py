@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+import asyncio
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import assessment_api
+import communication_test
+from mcq_parser import parse_mcqs
+from metrics import MetricsRegistry, generator_results, instrument_generator, stage_seconds
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("stage_seconds", "Stage latency", ("stage",), buckets=(0.1, 1))
+    for seconds in (0.05, 0.1, 0.5, 3):
+        latency.observe(seconds, stage="llm")
+    registry.counter("requests_total", "Requests", ("route",)).inc(route='/a"b')
+
+    text = registry.render()
+    assert 'stage_seconds_bucket{stage="llm",le="0.1"} 2' in text
+    assert 'stage_seconds_bucket{stage="llm",le="1"} 3' in text
+    assert 'stage_seconds_bucket{stage="llm",le="+Inf"} 4' in text
+    assert 'stage_seconds_count{stage="llm"} 4' in text and 'stage_seconds_sum{stage="llm"} 3.65' in text
+    assert 'requests_total{route="/a\\"b"} 1' in text
+
+
+def test_routes_stages_and_fallbacks_are_exported(monkeypatch):
+    def fallback_test(num_questions: int = 10, difficulty: str = "moderate") -> dict:
+        questions = parse_mcqs("Q1. Pick one\nA) yes\nB) no\nC) maybe\nD) never\nCorrect Answer: A")
+        return {"questions": questions, "source": "fallback", "status": "fallback"}
+
+    monkeypatch.setattr(communication_test, "generate_communication_test", fallback_test)
+
+    async def scrape():
+        transport = httpx.ASGITransport(app=assessment_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/assessment/communication_test/", data={"num_questions": "1"})
+            return response, await client.get("/metrics")
+
+    response, scraped = asyncio.run(scrape())
+    assert response.status_code == 200 and scraped.headers["content-type"].startswith("text/plain")
+    text = scraped.text
+    route = 'route="/api/assessment/communication_test/"'
+    assert f'talento_http_requests_total{{method="POST",{route},status="200"}}' in text
+    for name in ("generate", "parse", "serialize"):
+        assert f'talento_stage_duration_seconds_count{{{route},stage="{name}"}}' in text
+    assert 'talento_generator_results_total{generator="communication_test.generate_communication_test",status="fallback",source="fallback"}' in text
+    assert 'talento_cache_hit_ratio{cache="question_pool"}' in text
+    assert "talento_http_requests_in_flight 1" in text  # the scrape itself
+
+
+def test_streams_are_timed_until_their_last_event():
+    async def stream_questions(num_questions: int = 2, difficulty: str = "moderate"):
+        for index in range(num_questions):
+            await asyncio.sleep(0.05)
+            yield {"type": "question", "index": index}
+        yield {"type": "done", "status": "success", "source": "openrouter_ai"}
+
+    async def consume():
+        stream = instrument_generator("test.stream_questions", stream_questions)
+        return [event async for event in stream(num_questions=2)]
+
+    before = stage_seconds._values.get(("background", "generate"), [None, 0, 0.0])[1:]
+    started = time.perf_counter()
+    events = asyncio.run(consume())
+    assert len(events) == 3 and time.perf_counter() - started >= 0.1
+
+    count, total = stage_seconds._values[("background", "generate")][1:]
+    assert count == before[0] + 1 and total - before[1] >= 0.1
+    assert generator_results.value(generator="test.stream_questions", status="success", source="openrouter_ai") == 1
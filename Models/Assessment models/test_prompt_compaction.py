@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from prompt_compaction import compact_resume, count_tokens, normalize_text
+
+RAW = """Experience
+●   Optimi-
+zation of   the   billing\tservice
+● Built Problem-
+Solving tools
+Page 1 of 2
+"""
+
+
+def test_normalize_rejoins_hyphens_and_drops_noise():
+    assert normalize_text(RAW) == "Experience\n- Optimization of the billing service\n- Built Problem-\nSolving tools"
+
+
+def test_normalize_keeps_repeated_content_lines():
+    text = "Data Engineer, Acme\nJun 2021 - Present\n● Led code reviews\nML Engineer, Initech\nJun 2021 - Present\n● Led code reviews\nGPA\n9/10"
+
+    assert normalize_text(text).splitlines() == [
+        "Data Engineer, Acme", "Jun 2021 - Present", "- Led code reviews",
+        "ML Engineer, Initech", "Jun 2021 - Present", "- Led code reviews", "GPA", "9/10",
+    ]
+
+
+def test_compaction_keeps_priority_sections_within_budget():
+    sections = {
+        "Skills": "Python, Go, Kafka",
+        "Experience": "\n".join(f"- Shipped feature number {i} to production" for i in range(100)),
+        "Education": "B.Tech, 2024",
+    }
+    full_text = "\n".join(sections.values()) * 2
+
+    text, report = compact_resume(sections, ("Skills", "Experience", "Education"), "test_endpoint", fallback=full_text, budget=120)
+
+    assert text.startswith("## Skills\nPython, Go, Kafka\n\n## Experience\n- Shipped feature number 0")
+    assert count_tokens(text) <= 120
+    assert report["sections_kept"] == ["Skills"]
+    assert report["sections_truncated"] == ["Experience"]
+    assert report["sections_dropped"] == ["Education"]
+    assert report["raw_tokens"] == count_tokens(full_text) > report["compacted_tokens"]
+
+
+def test_compaction_falls_back_to_full_text_without_sections():
+    text, report = compact_resume({"Header": "Jane"}, ("Skills",), "test_endpoint", fallback="Jane  Doe\n\n\nPython", budget=100)
+
+    assert text == "Jane Doe\nPython"
+    assert report["sections_kept"] == ["Resume"]
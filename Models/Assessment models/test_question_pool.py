@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from question_pool import QuestionPool
+
+
+class FakeGenerator:
+    def __init__(self, source: str = "openrouter_ai"):
+        self.calls = 0
+        self.source = source
+
+    def __call__(self, job_role: str, num_questions: int, difficulty: str) -> dict:
+        self.calls += 1
+        return {"questions": f"set {self.calls}", "job_role": job_role, "difficulty": difficulty, "status": "success", "source": self.source}
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_hot_combination_is_served_from_pool():
+    generator = FakeGenerator()
+    pool = QuestionPool({"technical": generator}, total_sets=4, min_requests=2, min_size=2, max_size=4, enabled=True)
+
+    # First request only records frequency; the second makes the combination hot
+    assert pool.take("technical", "Software Engineer", 10, "moderate") is None
+    assert pool.take("technical", "Software Engineer", 10, "Moderate") is None
+    key = pool.make_key("technical", "Software Engineer", 10, "moderate")
+    assert wait_for(lambda: pool.get_stats()["pools"][0]["ready"] == pool.target_size(key))
+
+    result = pool.take("technical", "Software Engineer", 10, "moderate")
+    assert result["status"] == "success" and result["questions"].startswith("set ")
+    assert pool.get_stats()["hits"] == 1
+    pool.stop()
+
+
+def test_pool_budget_follows_request_frequency():
+    pool = QuestionPool({"technical": FakeGenerator()}, total_sets=12, min_requests=2, min_size=1, max_size=10, enabled=True)
+    for _ in range(9):
+        pool._record(pool.make_key("technical", "Data Scientist", 10, "hard"))
+    for _ in range(3):
+        pool._record(pool.make_key("technical", "Software Engineer", 10, "easy"))
+    pool._record(pool.make_key("technical", "Designer", 10, "easy"))
+
+    assert pool.target_size(pool.make_key("technical", "Data Scientist", 10, "hard")) == 9
+    assert pool.target_size(pool.make_key("technical", "Software Engineer", 10, "easy")) == 3
+    # Seen once: not worth pre-generating
+    assert pool.target_size(pool.make_key("technical", "Designer", 10, "easy")) == 0
+
+
+def test_fallback_results_are_not_pooled():
+    generator = FakeGenerator(source="fallback")
+    pool = QuestionPool({"technical": generator}, total_sets=4, min_requests=1, enabled=True)
+
+    pool.take("technical", "Software Engineer", 10, "moderate")
+    assert wait_for(lambda: pool.get_stats()["refill_failures"] == 1)
+    assert generator.calls == 1
+    assert pool.take("technical", "Software Engineer", 10, "moderate") is None
+    pool.stop()
+
+
+def test_refills_bypass_the_llm_cache(tmp_path, monkeypatch):
+    import llm_provider
+    from llm_cache import LLMResponseCache
+
+    monkeypatch.setattr(llm_provider, "_response_cache", LLMResponseCache(path=str(tmp_path / "cache.sqlite3"), variants=1))
+    completions = []
+
+    class Model:
+        model_name = "test-model"
+
+        def invoke(self, prompt):
+            completions.append(prompt)
+            return type("Message", (), {"content": f"set {len(completions)}"})()
+
+    def generate(job_role, num_questions, difficulty):
+        questions = llm_provider.invoke_model(Model(), f"{job_role} {num_questions}", endpoint="technical_assessment")
+        return {"questions": questions, "status": "success", "source": "openrouter_ai"}
+
+    pool = QuestionPool({"technical": generate}, total_sets=3, min_requests=1, min_size=3, max_size=3, enabled=True)
+    pool.take("technical", "Software Engineer", 10, "moderate")
+    assert wait_for(lambda: pool.get_stats()["pools"][0]["ready"] == 3)
+
+    # Every pooled set is its own generation, not the one cached variant repeated
+    sets = {pool.take("technical", "Software Engineer", 10, "moderate")["questions"] for _ in range(3)}
+    assert sets == {"set 1", "set 2", "set 3"}
+    assert llm_provider.get_response_cache().get_stats()["stores"] == 0
+    pool.stop()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import io
+import shutil
+import threading
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pdf_extraction
+import resume_extraction
+from extraction_sandbox import ExtractionSandbox
+from resume_extraction import ExtractionCache, extract_resume
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+ML_RESUME = os.path.join(DATA_DIR, "Krishil Agrawal Resume - ML.pdf")
+
+
+def test_extracts_text_and_metadata():
+    result = extract_resume(ML_RESUME)
+
+    assert result["format"] == "pdf"
+    assert result["page_count"] == 1
+    assert result["char_count"] == len(result["text"]) > 500
+    assert len(result["sha256"]) == 64
+
+
+def test_bytes_and_file_objects_match_path_extraction():
+    with open(ML_RESUME, "rb") as f:
+        data = f.read()
+
+    from_path = extract_resume(ML_RESUME)
+    from_bytes = extract_resume(data, "upload.pdf")
+    upload = io.BytesIO(data)
+    upload.read(10)  # A partially consumed upload is rewound before parsing
+    from_file = extract_resume(upload, "upload.pdf")
+
+    assert from_path == from_bytes == from_file
+    assert extract_resume(data, "upload.txt") is None
+
+
+def test_same_bytes_under_another_name_are_parsed_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_extraction, "extraction_cache", ExtractionCache(max_entries=4))
+    copy = tmp_path / "upload-copy.pdf"
+    shutil.copy(ML_RESUME, copy)
+    calls = []
+    real_extract = resume_extraction._extract_pdf
+    monkeypatch.setattr(resume_extraction, "_extract_pdf", lambda source: calls.append(source) or real_extract(source))
+
+    first = extract_resume(ML_RESUME)
+    second = extract_resume(str(copy))
+
+    assert len(calls) == 1
+    assert first["text"] == second["text"]
+    assert resume_extraction.extraction_cache.get_stats()["hits"] == 1
+
+
+def test_concurrent_requests_share_one_extraction():
+    cache = ExtractionCache(max_entries=4)
+    release = threading.Event()
+    calls = []
+
+    def slow_extract():
+        calls.append(1)
+        release.wait(2)
+        return {"text": "resume"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_extract("key", slow_extract))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"text": "resume"}] * 5
+
+
+def test_lru_eviction():
+    cache = ExtractionCache(max_entries=2)
+    for key in ("a", "b", "a", "c"):
+        cache.get_or_extract(key, lambda: {"text": key})
+
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get_or_extract("a", lambda: {"text": "new"}) == {"text": "a"}
+    assert cache.get_or_extract("b", lambda: {"text": "new"}) == {"text": "new"}
+
+
+def build_pdf(path, pages):
+    import pypdfium2 as pdfium  # type: ignore  # installed with pdfplumber
+
+    source = pdfium.PdfDocument(ML_RESUME)
+    document = pdfium.PdfDocument.new()
+    for _ in range(pages):
+        document.import_pages(source, [0])
+    document.save(str(path))
+    return str(path)
+
+
+def test_page_limit_and_parallel_extraction_match_sequential(tmp_path, monkeypatch):
+    path = build_pdf(tmp_path / "long.pdf", 6)
+    sequential = pdf_extraction.extract_pdf(path, max_pages=4, sandbox=ExtractionSandbox(enabled=False))
+
+    monkeypatch.setattr(pdf_extraction, "PDF_PARALLEL_MIN_PAGES", 2)
+    sandbox = ExtractionSandbox(workers=2)
+    try:
+        with open(path, "rb") as f:
+            parallel = pdf_extraction.extract_pdf(f.read(), max_pages=4, sandbox=sandbox)
+    finally:
+        sandbox.shutdown()
+
+    assert sequential["page_count"] == parallel["page_count"] == 6
+    assert sequential["pages_extracted"] == parallel["pages_extracted"] == 4
+    assert sequential["text"] == parallel["text"]
+    assert pdf_extraction.plan_page_ranges(10, 4) == [(1, 3), (4, 6), (7, 8), (9, 10)]
+
+
+def test_running_headers_footers_and_page_numbers_are_stripped():
+    pages = [
+        "JANE DOE | jane@example.com\nExperience\nJun 2021 - Present\n- Led code reviews\nConfidential - Page 1",
+        "JANE DOE | jane@example.com\nProjects\nJun 2021 - Present\n- Led code reviews\nGPA 9/10\nConfidential - Page 2",
+        "Certifications\nAWS\n3",
+    ]
+
+    first, second, third = pdf_extraction.strip_page_furniture(pages)
+
+    # The header and footer stay once; body repeats and "9/10" are content
+    assert first.splitlines()[0] == "JANE DOE | jane@example.com" and first.endswith("Confidential - Page 1")
+    assert second.splitlines() == ["Projects", "Jun 2021 - Present", "- Led code reviews", "GPA 9/10"]
+    assert third.splitlines() == ["Certifications", "AWS"]
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+import random
+import asyncio
+from pathlib import Path
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import assessment_api
+from resume_ranking import rank_resumes, score_documents, tokenize
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+JOB_DESCRIPTION = """Machine Learning Engineer. You will train and deploy deep learning models
+with Python, PyTorch and TensorFlow, build NLP and computer vision pipelines, and work with
+pandas, scikit-learn and MLOps tooling."""
+
+
+def test_tokenize_keeps_technical_terms():
+    assert tokenize("Built APIs in C++, C# and Node.js for the CI-CD team.") == ["built", "apis", "c++", "c#", "node.js", "ci-cd", "team"]
+
+
+def test_scores_rank_relevant_documents_first_and_scale_to_batch():
+    texts = [
+        "Frontend developer: React, CSS, HTML, Figma.",
+        "ML engineer: PyTorch, TensorFlow, deep learning, NLP, computer vision, Python, pandas.",
+        "Python developer with some scikit-learn.",
+        "",
+    ]
+    scores = score_documents(texts, JOB_DESCRIPTION)
+    assert list(scores["score"].argsort()[::-1][:2]) == [1, 2]
+    assert scores["score"][3] == 0 and scores["score"].max() <= 100
+
+
+def test_two_hundred_resumes_score_quickly():
+    words = tokenize(JOB_DESCRIPTION) + ["react", "java", "sales", "marketing", "excel", "kotlin", "design"] * 3
+    rng = random.Random(7)
+    texts = [" ".join(rng.choices(words, k=400)) for _ in range(200)]
+
+    started = time.perf_counter()
+    scores = score_documents(texts, JOB_DESCRIPTION)
+    elapsed = time.perf_counter() - started
+
+    print(f"Scored 200 resumes in {elapsed * 1000:.1f} ms")
+    assert len(scores["score"]) == 200 and elapsed < 1.0
+
+
+def test_rank_uploads_with_failures_reported_separately():
+    files = [(name, Path(DATA_DIR, name).read_bytes()) for name in sorted(os.listdir(DATA_DIR))]
+    files.append(("notes.txt", b"not a resume"))
+
+    result = rank_resumes(files, JOB_DESCRIPTION, job_role="ML Engineer")
+
+    assert [r["rank"] for r in result["ranked"]] == [1, 2]
+    assert result["ranked"][0]["filename"] == "Krishil Agrawal Resume - ML.pdf"
+    assert "python" in result["ranked"][0]["matched_terms"]
+    assert 0 <= result["ranked"][0]["ats_score"] <= 100
+    assert result["failed"][0]["filename"] == "notes.txt"
+
+
+def test_rank_endpoint_accepts_many_files():
+    async def post():
+        transport = httpx.ASGITransport(app=assessment_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            files = [("files", (name, Path(DATA_DIR, name).read_bytes(), "application/pdf")) for name in sorted(os.listdir(DATA_DIR))]
+            return await client.post("/api/assessment/rank_resumes/", data={"job_description": JOB_DESCRIPTION}, files=files)
+
+    response = asyncio.run(post())
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from resume_report import PART_FAILED, REPORT_PARTS, assemble_report, generate_report_parts
+from resume_sections import segment_resume
+
+SECTION_LATENCY = 0.2
+
+RESUME = """Jane Doe
+jane@example.com
+Education
+B.Tech Computer Science
+Skills
+Python, PyTorch
+Projects
+- Built a fraud detection model
+"""
+
+
+def slow_complete(prompt: str) -> str:
+    # Stands in for one model round trip; echoes which part was requested
+    time.sleep(SECTION_LATENCY)
+    if "Categorize skills" in prompt:
+        raise RuntimeError("rate limited")
+    instructions = prompt.split("nothing else (no report title, no section heading):")[1].strip()
+    return f"### Echoed heading\n{instructions.splitlines()[0]}"
+
+
+def test_parts_run_concurrently_and_assemble_in_report_order():
+    sections = segment_resume(RESUME)
+
+    started = time.perf_counter()
+    parts = generate_report_parts(slow_complete, sections, RESUME, "ML Engineer")
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(REPORT_PARTS)} parts x {SECTION_LATENCY}s took {elapsed:.2f}s")
+    assert elapsed < SECTION_LATENCY * len(REPORT_PARTS) / 3
+    assert parts["skills"] == PART_FAILED
+    assert parts["education"] == "**Education:**"
+
+    report = assemble_report(parts, RESUME, "ML Engineer")
+    headings = [line for line in report.splitlines() if line.startswith("#")]
+    assert headings == [
+        "## 📊 RESUME ANALYSIS REPORT",
+        "### 🔍 KEY COMPONENTS EXTRACTED",
+        "### ✅ STRENGTHS ANALYSIS",
+        "### ⚠️ AREAS FOR IMPROVEMENT",
+        "### 🚀 OPTIMIZATION RECOMMENDATIONS",
+        headings[5],
+        "### 🎯 NEXT STEPS",
+    ]
+    assert headings[5].startswith("### 📈 ATS OPTIMIZATION SCORE: ") and headings[5].endswith("/10")
+    assert "**PRIORITY 3 - STRATEGIC ADDITIONS:**" in report
+
+
+def test_part_prompts_carry_only_their_sections():
+    prompts = []
+    generate_report_parts(lambda prompt: prompts.append(prompt) or "ok", segment_resume(RESUME), RESUME, "ML Engineer")
+
+    education = next(p for p in prompts if "**Education:**" in p)
+    assert "## Education\nB.Tech Computer Science" in education
+    assert "PyTorch" not in education and "jane@example.com" not in education
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import domain_questions
+import resume_sections
+from resume_extraction import ExtractionCache
+from resume_sections import get_resume_sections, heading_section, segment_resume
+
+ML_RESUME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "Krishil Agrawal Resume - ML.pdf")
+
+SAMPLE = """Jane Doe
+jane@example.com
+PROFESSIONAL SUMMARY
+Backend engineer.
+Work Experience:
+Engineer at Acme
+• Technologies: Go, Postgres
+Skills & Interests
+Python, Kafka
+Certifications and Achievements
+AWS Certified Developer
+"""
+
+
+def test_headings_are_recognised_in_common_spellings():
+    assert heading_section("EDUCATION") == "Education"
+    assert heading_section("  Work Experience: ") == "Experience"
+    assert heading_section("Skills & Interests") == "Skills"
+    assert heading_section("• Languages: Python, C++") is None
+
+
+def test_segment_splits_sections_and_keeps_header():
+    sections = segment_resume(SAMPLE)
+
+    assert sections == {
+        "Header": "Jane Doe\njane@example.com",
+        "Summary": "Backend engineer.",
+        "Experience": "Engineer at Acme\n• Technologies: Go, Postgres",
+        "Skills": "Python, Kafka",
+        "Certifications": "AWS Certified Developer",
+    }
+
+
+def test_sections_are_cached_per_document(monkeypatch):
+    monkeypatch.setattr(resume_sections, "section_cache", ExtractionCache(max_entries=4))
+
+    first = get_resume_sections(ML_RESUME)
+    second = get_resume_sections(ML_RESUME)
+
+    assert first == second
+    assert set(first["sections"]) >= {"Education", "Skills", "Projects"}
+    assert resume_sections.section_cache.get_stats()["hits"] == 1
+
+
+class RecordingModel:
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return type("Message", (), {"content": "not parseable"})()
+
+
+def test_domain_questions_use_the_uploaded_resume(monkeypatch):
+    model = RecordingModel()
+    monkeypatch.setattr(domain_questions, "model", model)
+
+    with open(ML_RESUME, "rb") as f:
+        result = domain_questions.generate_domain_questions(f, "ML Engineer", 3, filename="resume.pdf")
+
+    assert result["status"] == "success" and result["resume_file"] == "resume.pdf"
+    assert "## Projects\nFraud Detection Model" in model.prompts[0]
+    # Only the sections the questions need are sent: no contact details or education
+    assert "@gmail.com" not in model.prompts[0] and "## Education" not in model.prompts[0]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import queue
+import logging
+from logging.handlers import QueueListener
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import structured_logging
+import tracing
+from structured_logging import ContextQueueHandler, JsonFormatter, bind, get_logger
+
+
+class Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(JsonFormatter())
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(json.loads(self.format(record)))
+
+
+def isolated_logger(name, records: queue.Queue):
+    logger = logging.getLogger(name)
+    logger.handlers[:] = [ContextQueueHandler(records)]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return get_logger(name)
+
+
+def test_json_lines_carry_request_context_fields_and_exceptions():
+    records, output = queue.Queue(), Collect()
+    log = isolated_logger("test.context", records)
+    listener = QueueListener(records, output)
+    listener.start()
+
+    with tracing.Tracer(exporter=tracing.TraceExporter("none")).trace("POST /api/x") as root:
+        with bind(route="/api/x", job_role="Data Scientist"):
+            log.info("Generator finished", status="success", duration_ms=12.5)
+            try:
+                raise ValueError("bad output")
+            except ValueError:
+                log.exception("Generator raised")
+    log.info("Outside the request")
+    listener.stop()
+
+    finished, raised, outside = output.lines
+    assert finished["message"] == "Generator finished" and finished["level"] == "info"
+    assert finished["route"] == "/api/x" and finished["job_role"] == "Data Scientist"
+    assert finished["status"] == "success" and finished["duration_ms"] == 12.5
+    assert finished["request_id"] == root.trace_id
+    assert raised["level"] == "error" and "ValueError: bad output" in raised["exception"]
+    assert "route" not in outside and "request_id" not in outside
+
+
+def test_sampling_and_full_queue_never_block(monkeypatch):
+    monkeypatch.setattr(structured_logging, "LOG_SAMPLE_RATE", 0.0)
+    monkeypatch.setitem(structured_logging.stats, "dropped", 0)
+    monkeypatch.setitem(structured_logging.stats, "sampled_out", 0)
+    records = queue.Queue(maxsize=2)
+    log = isolated_logger("test.sampling", records)
+
+    for _ in range(5):
+        log.info("Questions generated", sample=True)
+    for _ in range(5):
+        log.warning("Fallback used")
+
+    # Sampled success lines never reach the queue; with no writer, the queue fills and the rest are dropped
+    assert records.qsize() == 2
+    assert structured_logging.get_stats()["sampled_out"] == 5
+    assert structured_logging.get_stats()["dropped"] == 3
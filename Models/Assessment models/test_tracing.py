@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import time
+import asyncio
+
+import pytest
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import assessment_api
+import communication_test
+import llm_provider
+import tracing
+from mcq_parser import parse_mcqs
+from tracing import TraceExporter, Tracer
+
+INCOMING = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+class EchoModel:
+    model_name = "test-model"
+
+    def invoke(self, prompt):
+        return type("Message", (), {"content": "Q1. Pick one\nA) yes\nB) no\nC) maybe\nD) never\nCorrect Answer: A"})()
+
+
+def read_spans(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_request_trace_spans_generator_llm_and_parse(tmp_path, monkeypatch):
+    path = str(tmp_path / "traces.jsonl")
+    tracer = Tracer(sample_rate=1, exporter=TraceExporter("file", path))
+    monkeypatch.setattr(tracing, "tracer", tracer)
+
+    def generate(num_questions: int = 10, difficulty: str = "moderate") -> dict:
+        content = llm_provider.invoke_model(EchoModel(), "prompt", endpoint="communication_test_traced")
+        return {"questions": parse_mcqs(content), "source": "openrouter_ai", "status": "success"}
+
+    monkeypatch.setattr(communication_test, "generate_communication_test", generate)
+
+    async def post():
+        transport = httpx.ASGITransport(app=assessment_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/api/assessment/communication_test/", data={"num_questions": "1"}, headers={"traceparent": INCOMING})
+
+    response = asyncio.run(post())
+    tracer.exporter.flush()
+
+    trace_id = INCOMING.split("-")[1]
+    assert response.headers["X-Request-ID"] == trace_id
+    spans = {span["name"]: span for span in read_spans(path)}
+    assert {s["trace_id"] for s in spans.values()} == {trace_id}
+    root = spans["POST /api/assessment/communication_test/"]
+    assert root["parent_span_id"] == "00f067aa0ba902b7" and root["attributes"]["trace.export_reason"] == "sampled"
+    # generate -> llm and parse, all under the request
+    assert spans["generate"]["parent_span_id"] == root["span_id"]
+    assert spans["llm"]["parent_span_id"] == spans["parse"]["parent_span_id"] == spans["generate"]["span_id"]
+    assert spans["llm"]["kind"] == "CLIENT" and spans["llm"]["attributes"]["endpoint"] == "communication_test_traced"
+
+
+def test_streamed_response_is_traced_until_its_last_event(tmp_path, monkeypatch):
+    path = str(tmp_path / "traces.jsonl")
+    tracer = Tracer(sample_rate=0, slow_ms=50, exporter=TraceExporter("file", path))
+    monkeypatch.setattr(tracing, "tracer", tracer)
+
+    async def stream(num_questions: int = 10, difficulty: str = "moderate"):
+        yield {"type": "start"}
+        with tracing.span("stream.body"):
+            await asyncio.sleep(0.06)
+            yield {"type": "question", "index": 0}
+        yield {"type": "done"}
+
+    monkeypatch.setattr(communication_test, "stream_communication_test", stream)
+
+    async def post():
+        transport = httpx.ASGITransport(app=assessment_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/api/assessment/communication_test/stream/", data={"num_questions": "1"})
+
+    response = asyncio.run(post())
+    tracer.exporter.flush()
+
+    assert len(response.text.splitlines()) == 3
+    spans = {span["name"]: span for span in read_spans(path)}
+    root = spans["POST /api/assessment/communication_test/stream/"]
+    # The body's time counts towards the request, so the slow stream is exported with its spans
+    assert root["attributes"]["trace.export_reason"] == "slow" and root["duration_ms"] >= 60
+    assert spans["stream.body"]["trace_id"] == root["trace_id"]
+
+
+def test_unsampled_traces_export_only_when_slow_or_failed():
+    exported = []
+    exporter = TraceExporter("none")
+    exporter.export = exported.append
+    tracer = Tracer(sample_rate=0, slow_ms=50, exporter=exporter)
+
+    with tracer.trace("fast") as root:
+        with tracer.span("child") as child:
+            headers = tracing.inject({"Accept": "application/json"})
+    # Outgoing calls carry the innermost span as their parent
+    assert headers["traceparent"] == f"00-{root.trace_id}-{child.span_id}-00"
+
+    # A client's sampled flag is passed on, but does not make this service write the trace
+    with tracer.trace("forced", traceparent=INCOMING) as forced:
+        assert forced.traceparent().endswith("-01")
+    with tracer.trace("slow"):
+        time.sleep(0.06)
+    with pytest.raises(ValueError):
+        with tracer.trace("failed"):
+            with tracer.span("parse"):
+                raise ValueError("bad output")
+
+    assert [trace.spans[-1].name for trace in exported] == ["slow", "failed"]
+    assert [t.spans[-1].attributes["trace.export_reason"] for t in exported] == ["slow", "error"]
+    assert tracer.get_stats()["traces"] == 4 and tracer.get_stats()["exported"] == 2
+    assert tracing.current_span() is None
+
+
+def test_trace_file_is_rotated_at_its_size_cap(tmp_path):
+    path = str(tmp_path / "traces.jsonl")
+    exporter = TraceExporter("file", path, max_bytes=1000)
+    tracer = Tracer(sample_rate=1, exporter=exporter)
+    for i in range(20):
+        with tracer.trace(f"request {i}"):
+            pass
+    exporter.flush()
+
+    # Each write starts a new file once the cap is reached; only one rotated file is kept
+    assert os.path.getsize(path) < 2000 and os.path.exists(path + ".1")
+    assert len(os.listdir(tmp_path)) == 2
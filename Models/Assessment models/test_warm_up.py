@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import asyncio
+import threading
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import assessment_api
+from warm_up import WarmUp, WarmUpSkipped
+
+
+def probe(*paths):
+    async def get():
+        transport = httpx.ASGITransport(app=assessment_api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [await client.get(path) for path in paths]
+    return asyncio.run(get())
+
+
+def test_ready_only_after_warm_up(monkeypatch):
+    entered, release = threading.Event(), threading.Event()
+
+    def model_client():
+        entered.set()
+        release.wait(5)
+
+    startup = WarmUp({"model_client": model_client}, enabled=True, timeout=60)
+    monkeypatch.setattr(assessment_api, "startup", startup)
+
+    startup.start()
+    assert entered.wait(5)
+    live, ready = probe("/health/live", "/health/ready")
+    assert live.status_code == 200
+    assert ready.status_code == 503 and ready.json()["steps"]["model_client"]["state"] == "running"
+
+    release.set()
+    startup._thread.join(5)
+    ready, stats = probe("/health/ready", "/api/startup/stats/")
+    assert ready.status_code == 200 and ready.json()["status"] == "ready"
+    assert stats.json()["warm_up"]["seconds"] > 0
+
+
+def test_failed_and_skipped_steps_do_not_block_readiness():
+    def broken():
+        raise RuntimeError("cache file unreadable")
+
+    def no_key():
+        raise WarmUpSkipped("no API key")
+
+    startup = WarmUp({"llm_cache": broken, "llm_connection": no_key, "modules": lambda: 3}, enabled=True)
+    assert not startup.ready
+    startup.run()
+
+    stats = startup.get_stats()
+    assert startup.ready and stats["degraded"] == ["llm_cache"]
+    assert [stats["steps"][name]["state"] for name in ("llm_cache", "llm_connection", "modules")] == ["failed", "skipped", "done"]
+
+    assert WarmUp({"modules": broken}, enabled=False).ready
@@ -0,0 +1,331 @@
+import contextvars
+import json
+import os
+import queue
+import re
+import secrets
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from structured_logging import add_context_provider, get_logger
+
+log = get_logger(__name__)
+
+# Record spans for each request and export the traces that are sampled, slow or failed
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "1") != "0"
+# Fraction of traces exported regardless of latency (0-1), by trace id. An incoming sampled
+# traceparent flag is passed on downstream but does not force an export here.
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.05"))
+# Traces at least this slow (ms) are always exported; LLM-backed requests routinely take a few seconds
+TRACE_SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "15000"))
+# Where finished traces go: file (JSON lines), console, or none
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "file")
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(tempfile.gettempdir(), "talento_traces.jsonl"))
+# Size (MB) at which the trace file is rotated to TRACE_FILE.1, replacing the previous one
+TRACE_FILE_MAX_MB = float(os.getenv("TRACE_FILE_MAX_MB", "50"))
+# Spans kept per trace; beyond this they are counted but dropped
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "1000"))
+
+SERVICE_NAME = "talento-assessment-api"
+
+# W3C Trace Context: version-traceid-parentid-flags
+TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Trace:
+    """The spans of one request (or background job) collected until its root span ends"""
+
+    def __init__(self, trace_id: str, sampled: bool, keep: bool):
+        self.trace_id = trace_id
+        # Propagated in traceparent flags
+        self.sampled = sampled
+        # Exported by this service's own ratio sampler
+        self.keep = keep
+        self.spans: List["Span"] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def add(self, span: "Span") -> None:
+        with self._lock:
+            if len(self.spans) < TRACE_MAX_SPANS:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+
+class Span:
+    """A timed operation with OpenTelemetry-style ids, attributes and status"""
+
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str], kind: str, attributes: dict):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes)
+        self.status = "UNSET"
+        self.status_message = ""
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException) -> None:
+        self.status = "ERROR"
+        self.status_message = f"{type(error).__name__}: {error}"
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.trace.sampled else '00'}"
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.status_message},
+            "resource": {"service.name": SERVICE_NAME},
+        }
+
+
+class TraceExporter:
+    """Writes finished traces from a background thread so requests never wait on I/O"""
+
+    def __init__(self, kind: str = TRACE_EXPORTER, path: str = TRACE_FILE, max_bytes: int = int(TRACE_FILE_MAX_MB * 1024 * 1024)):
+        self.kind = kind
+        self.path = path
+        self.max_bytes = max_bytes
+        self._queue: "queue.Queue[Optional[Trace]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        if self.kind == "none":
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._drain, name="trace-exporter", daemon=True)
+                self._thread.start()
+        self._queue.put(trace)
+
+    def _drain(self) -> None:
+        while True:
+            trace = self._queue.get()
+            try:
+                if trace is not None:
+                    self._write(trace)
+            except Exception as e:
+                log.warning("Trace export failed", error=str(e))
+            finally:
+                self._queue.task_done()
+            if trace is None:
+                return
+
+    def _write(self, trace: Trace) -> None:
+        spans = sorted(trace.spans, key=lambda s: s.start_ns)
+        if self.kind == "console":
+            depth = {None: -1}
+            for span in spans:
+                depth[span.span_id] = depth.get(span.parent_id, -1) + 1
+                flag = " ❌" if span.status == "ERROR" else ""
+                print(f"🔍 {trace.trace_id[:8]} {'  ' * depth[span.span_id]}{span.name} {span.duration_ms:.1f}ms{flag}")
+            return
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+            os.replace(self.path, self.path + ".1")
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+    def flush(self) -> None:
+        """Wait until every queued trace is written"""
+        self._queue.join()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(5)
+
+
+class Tracer:
+    """
+    Starts traces for incoming requests and background jobs and nests spans
+    under them through a context variable, which run_blocking and the
+    section/deep-dive executors carry over to worker threads. Every trace is
+    recorded; when its root span ends it is exported if it was sampled by
+    trace id ratio, slower than TRACE_SLOW_MS, or failed. An upstream sampled
+    flag is only passed on, so clients cannot force exports.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = TRACING_ENABLED,
+        sample_rate: float = TRACE_SAMPLE_RATE,
+        slow_ms: float = TRACE_SLOW_MS,
+        exporter: Optional[TraceExporter] = None,
+    ):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.exporter = exporter or TraceExporter()
+        self._lock = threading.Lock()
+        self.stats = {"traces": 0, "exported": 0, "sampled": 0, "slow": 0, "errors": 0, "dropped_spans": 0}
+
+    def _sampled(self, trace_id: str) -> bool:
+        # Same rule as OpenTelemetry's TraceIdRatioBased: compare the id's low 64 bits to the rate
+        return int(trace_id[16:], 16) < self.sample_rate * 2 ** 64
+
+    @contextmanager
+    def trace(self, name: str, traceparent: Optional[str] = None, kind: str = "SERVER", **attributes) -> Iterator[Optional[Span]]:
+        """Root span of a request or job, continuing the caller's trace when a traceparent is given"""
+        if not self.enabled:
+            yield None
+            return
+        match = TRACEPARENT.match((traceparent or "").strip().lower())
+        if match and match.group(2) != "0" * 32:
+            keep = self._sampled(match.group(2))
+            trace = Trace(match.group(2), sampled=bool(int(match.group(4), 16) & 1) or keep, keep=keep)
+            parent_id = match.group(3)
+        else:
+            trace_id = secrets.token_hex(16)
+            keep = self._sampled(trace_id)
+            trace, parent_id = Trace(trace_id, sampled=keep, keep=keep), None
+        root = Span(trace, name, parent_id, kind, attributes)
+        token = _current.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.set_error(e)
+            raise
+        finally:
+            _current.reset(token)
+            root.end_ns = time.time_ns()
+            trace.add(root)
+            self._finish(trace, root)
+
+    def _finish(self, trace: Trace, root: Span) -> None:
+        slow = root.duration_ms >= self.slow_ms
+        failed = any(span.status == "ERROR" for span in trace.spans)
+        keep = trace.keep or slow or failed
+        if keep:
+            root.set_attribute("trace.export_reason", "error" if failed else "slow" if slow else "sampled")
+        with self._lock:
+            self.stats["traces"] += 1
+            self.stats["sampled"] += trace.keep
+            self.stats["slow"] += slow
+            self.stats["errors"] += failed
+            self.stats["dropped_spans"] += trace.dropped
+            self.stats["exported"] += keep
+        if keep:
+            self.exporter.export(trace)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "INTERNAL", **attributes) -> Iterator[Optional[Span]]:
+        """Child of the current span; does nothing outside a trace"""
+        parent = _current.get()
+        if parent is None:
+            yield None
+            return
+        span = Span(parent.trace, name, parent.span_id, kind, attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(e)
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            parent.trace.add(span)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "enabled": self.enabled,
+                "sample_rate": self.sample_rate,
+                "slow_ms": self.slow_ms,
+                "exporter": self.exporter.kind,
+                "path": self.exporter.path if self.exporter.kind == "file" else None,
+            }
+
+
+tracer = Tracer()
+
+
+def trace(name: str, traceparent: Optional[str] = None, kind: str = "SERVER", **attributes):
+    return tracer.trace(name, traceparent, kind, **attributes)
+
+
+def span(name: str, kind: str = "INTERNAL", **attributes):
+    return tracer.span(name, kind, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """Request id of the work in progress (its trace id), if any"""
+    active = _current.get()
+    return active.trace_id if active else None
+
+
+def _log_context() -> Dict[str, str]:
+    active = _current.get()
+    return {"request_id": active.trace_id, "span_id": active.span_id} if active else {}
+
+
+# Every log line written during a request carries its request (trace) id
+add_context_provider(_log_context)
+
+
+def inject(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Add the W3C traceparent of the current span to outgoing request headers"""
+    headers = dict(headers or {})
+    active = _current.get()
+    if active is not None:
+        headers["traceparent"] = active.traceparent()
+    return headers
+
+
+def inject_httpx(request) -> None:
+    """httpx request hook: propagate the trace to the model API"""
+    active = _current.get()
+    if active is not None:
+        request.headers["traceparent"] = active.traceparent()
+
+
+async def ainject_httpx(request) -> None:
+    inject_httpx(request)
+
+
+def http_request(method: str, url: str, **kwargs):
+    """requests.request inside a client span, with the traceparent header added"""
+    import requests
+
+    with span(f"HTTP {method}", kind="CLIENT", **{"http.method": method, "http.url": url}) as client:
+        response = requests.request(method, url, headers=inject(kwargs.pop("headers", None)), **kwargs)
+        if client is not None:
+            client.set_attribute("http.status_code", response.status_code)
+        return response
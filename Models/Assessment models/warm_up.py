@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from structured_logging import get_logger
+from tracing import span, trace
+
+log = get_logger(__name__)
+
+# Run the warm-up when the server starts (0: the instance is ready immediately, everything stays lazy)
+WARM_UP_ENABLED = os.getenv("WARM_UP_ENABLED", "1") != "0"
+# Warm-up steps to run, in order (comma-separated); see service_steps()
+WARM_UP_STEPS = os.getenv("WARM_UP_STEPS", "modules,model_client,llm_connection,extraction_workers,llm_cache,job_index")
+# Seconds after which the instance reports ready even if a step is still running
+WARM_UP_TIMEOUT = float(os.getenv("WARM_UP_TIMEOUT", "120"))
+
+
+class WarmUpSkipped(Exception):
+    """A step that does not apply to this instance (e.g. no API key)"""
+
+
+class WarmUp:
+    """
+    Runs the startup steps in order on a background thread and tracks their
+    progress for the readiness probe. The instance is ready once every step
+    has finished or the timeout has passed. A failed step is reported as
+    degraded but does not hold readiness back: the work it would have done
+    happens lazily on the first request instead.
+    """
+
+    def __init__(
+        self,
+        steps: Dict[str, Callable[[], object]],
+        enabled: bool = WARM_UP_ENABLED,
+        timeout: float = WARM_UP_TIMEOUT,
+    ):
+        self.steps = dict(steps)
+        self.enabled = enabled
+        self.timeout = timeout
+        self.seconds: Optional[float] = None
+        self._steps = {name: {"state": "pending", "seconds": None} for name in self.steps}
+        self._started: Optional[float] = None
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if not enabled:
+            self._done.set()
+
+    def run(self) -> None:
+        with trace("warm_up", kind="INTERNAL"):
+            self._run()
+
+    def _run(self) -> None:
+        self._started = time.monotonic()
+        for name, step in self.steps.items():
+            report = self._steps[name]
+            report["state"] = "running"
+            started = time.perf_counter()
+            try:
+                with span(f"warm_up.{name}"):
+                    detail = step()
+                report["state"] = "done"
+                if detail is not None:
+                    report["detail"] = detail
+            except WarmUpSkipped as e:
+                report.update(state="skipped", detail=str(e))
+            except Exception as e:
+                report.update(state="failed", error=f"{type(e).__name__}: {e}")
+                log.warning("Warm-up step failed", step=name, error=str(e))
+            report["seconds"] = round(time.perf_counter() - started, 3)
+        self.seconds = round(time.monotonic() - self._started, 3)
+        self._done.set()
+        log.info("Warm-up finished", seconds=self.seconds, degraded=self.degraded())
+
+    def start(self) -> None:
+        """Warm up on a background thread so liveness answers meanwhile"""
+        if self.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="warm-up", daemon=True)
+            self._thread.start()
+
+    @property
+    def timed_out(self) -> bool:
+        return not self._done.is_set() and self._started is not None and time.monotonic() - self._started > self.timeout
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set() or self.timed_out
+
+    def degraded(self) -> List[str]:
+        return [name for name, report in self._steps.items() if report["state"] == "failed"]
+
+    def get_stats(self) -> dict:
+        if not self.enabled:
+            state = "disabled"
+        elif self._done.is_set():
+            state = "done"
+        elif self.timed_out:
+            state = "timed_out"
+        else:
+            state = "running" if self._started is not None else "pending"
+        return {
+            "ready": self.ready,
+            "state": state,
+            "seconds": self.seconds,
+            "elapsed_seconds": round(time.monotonic() - self._started, 3) if self._started is not None else None,
+            "timeout_seconds": self.timeout,
+            "degraded": self.degraded(),
+            "steps": {name: dict(report) for name, report in self._steps.items()},
+        }
+
+
+def service_steps(generators, names: str = WARM_UP_STEPS) -> Dict[str, Callable[[], object]]:
+    """The API's warm-up steps, filtered and ordered by `names`"""
+
+    def modules():
+        errors = generators.load_all()
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return len(generators.modules)
+
+    def model_client():
+        from llm_provider import get_chat_model
+        if get_chat_model() is None:
+            raise WarmUpSkipped("no model client (OPENROUTER_API_KEY not set or LangChain unavailable)")
+
+    def llm_connection():
+        from llm_provider import warm_connection
+        status = warm_connection()
+        if status is None:
+            raise WarmUpSkipped("no model client")
+        return {"status_code": status}
+
+    def extraction_workers():
+        from extraction_sandbox import get_sandbox
+        return {"workers": get_sandbox().warm_up()}
+
+    def llm_cache():
+        from llm_provider import get_response_cache
+        return {"entries": get_response_cache().preload()}
+
+    def job_index():
+        from job_matching import saved_jobs_sync
+        if not saved_jobs_sync.path:
+            raise WarmUpSkipped("JOBS_DB_PATH not set")
+        return {"jobs": saved_jobs_sync.sync(force=True)}
+
+    available = {
+        "modules": modules,
+        "model_client": model_client,
+        "llm_connection": llm_connection,
+        "extraction_workers": extraction_workers,
+        "llm_cache": llm_cache,
+        "job_index": job_index,
+    }
+    selected = [name.strip() for name in names.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        log.warning("Unknown warm-up steps ignored", steps=unknown)
+    return {name: available[name] for name in selected if name in available}
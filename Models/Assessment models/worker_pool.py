@@ -0,0 +1,50 @@
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from metrics import workers_in_flight
+
+# Blocking work (LLM round trips, PDF/DOCX parsing) runs on this many threads.
+# Anything beyond that waits its turn instead of stalling the event loop.
+ASSESSMENT_WORKERS = int(os.getenv("ASSESSMENT_WORKERS", "8"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide worker pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=ASSESSMENT_WORKERS,
+                    thread_name_prefix="assessment-worker",
+                )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a synchronous generator/parser on the worker pool and await its result.
+    The caller's context variables are carried over to the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = partial(ctx.run, func, *args, **kwargs)
+    with workers_in_flight.track():
+        return await loop.run_in_executor(get_executor(), call)
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Stop the worker pool (used on application shutdown)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=True)
+            _executor = None
@@ -814,6 +814,8 @@ export default function OverviewTab({ user }) {
 			const formData = new FormData();
 			formData.append("file", uploadedFile.file);
 			formData.append("job_role", jobRole);
+			// Lets the backend reuse unchanged sections from this user's previous analysis
+			if (user?.id) formData.append("user_id", user.id);
 
 			const response = await fetch("/api/assessment/resume_optimize", {
 				method: "POST",
@@ -55,6 +55,7 @@ export default function DashboardPage() {
 		}
 
 		const userObj = {
+			id: authUser.id,
 			name:
 				authUser.user_metadata?.name ||
 				authUser.user_metadata?.firstName ||